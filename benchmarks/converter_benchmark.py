@@ -0,0 +1,67 @@
+"""
+Compares the hand-written converters with the generated `DataclassConverter`.
+
+Run with `python -m benchmarks.converter_benchmark`.
+"""
+from timeit import timeit
+import logging
+
+from src.converter import (
+    Converter,
+    DataclassConverter,
+    UserConverter,
+    ParcelConverter,
+    LockerConverter,
+    DeliversConverter,
+)
+from src.model import Users, Parcels, Lockers, Delivers
+
+RECORDS = 20_000
+REPEATS = 5
+
+SAMPLES: list[tuple[str, Converter, type, dict]] = [
+    ("Users", UserConverter(), Users, {
+        "email": "bob.jones@gmail.com", "name": "Bob", "surname": "Jones",
+        "city": "New York", "latitude": 37.774929, "longitude": -122.419418,
+    }),
+    ("Parcels", ParcelConverter(), Parcels, {
+        "parcel_id": "P12345", "height": 15, "length": 30, "weight": 2,
+    }),
+    ("Lockers", LockerConverter(), Lockers, {
+        "locker_id": "L001", "city": "Chicago", "latitude": 41.878113, "longitude": -87.629799,
+        "compartments": {"small": 20, "medium": 15, "large": 5},
+    }),
+    ("Delivers", DeliversConverter(), Delivers, {
+        "parcel_id": "P12345", "locker_id": "L001", "sender_email": "alice.smith@gmail.com",
+        "receiver_email": "john.doe@gmail.com", "sent_date": "2023-12-01", "expected_delivery_date": "2023-12-05",
+    }),
+]
+
+
+def best_of(converter: Converter, batch: list[dict]) -> float:
+    """
+    Returns the best time, in seconds, of converting the whole batch `REPEATS` times.
+    """
+    convert = converter.convert
+    return min(timeit(lambda: [convert(entry) for entry in batch], number=1) for _ in range(REPEATS))
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    print(f"{'model':<10}{'hand-written':>16}{'generated':>16}{'speedup':>10}")
+    for name, hand_written, model, sample in SAMPLES:
+        batch = [dict(sample) for _ in range(RECORDS)]
+        generated: Converter = DataclassConverter(model)
+        assert generated.convert(sample) == hand_written.convert(sample)
+
+        hand_written_time = best_of(hand_written, batch)
+        generated_time = best_of(generated, batch)
+        print(
+            f"{name:<10}{hand_written_time * 1e6 / RECORDS:>13.2f} us"
+            f"{generated_time * 1e6 / RECORDS:>13.2f} us"
+            f"{hand_written_time / generated_time:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
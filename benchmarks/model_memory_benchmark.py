@@ -0,0 +1,54 @@
+"""
+Reports the memory used by the model classes, in bytes per million instances.
+
+Run with `python -m benchmarks.model_memory_benchmark`.
+"""
+from datetime import date, timedelta
+from typing import Callable
+import tracemalloc
+
+from src.model import Users, Parcels, Lockers, Delivers, City, LockerComponentsSize
+
+INSTANCES = 100_000
+SCALE = 1_000_000 // INSTANCES
+
+EMAILS = [f"user{i}@example.com" for i in range(1_000)]
+LOCKER_IDS = [f"L{i:03}" for i in range(100)]
+PARCEL_IDS = [f"P{i:06}" for i in range(INSTANCES)]
+SENT = [date(2023, 1, 1) + timedelta(days=i) for i in range(365)]
+EXPECTED = [day + timedelta(days=4) for day in SENT]
+COMPARTMENTS = {LockerComponentsSize.SMALL: 20, LockerComponentsSize.MEDIUM: 15, LockerComponentsSize.LARGE: 5}
+
+FACTORIES: dict[str, Callable[[int], object]] = {
+    "Users": lambda i: Users(EMAILS[i % 1_000], "Bob", "Jones", City.NEW_YORK, 37.774929, -122.419418),
+    "Parcels": lambda i: Parcels(PARCEL_IDS[i], 15, 30, 2),
+    "Lockers": lambda i: Lockers(LOCKER_IDS[i % 100], City.CHICAGO, 41.878113, -87.629799, dict(COMPARTMENTS)),
+    "Delivers": lambda i: Delivers(
+        PARCEL_IDS[i], LOCKER_IDS[i % 100], EMAILS[i % 1_000], EMAILS[(i + 1) % 1_000], SENT[i % 365], EXPECTED[i % 365]
+    ),
+}
+
+
+def measure(factory: Callable[[int], object]) -> int:
+    """
+    Returns the bytes allocated while building `INSTANCES` objects, excluding the shared
+    field values, which are created up front.
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    objects = [factory(i) for i in range(INSTANCES)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return after - before
+
+
+def main() -> None:
+    print(f"{'model':<10}{'bytes per instance':>20}{'MB per million':>18}")
+    for name, factory in FACTORIES.items():
+        allocated = measure(factory)
+        print(f"{name:<10}{allocated / INSTANCES:>20.1f}{allocated * SCALE / 1e6:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,12 +14,13 @@ from src.file_service import (
 from decimal import Decimal
 from src.model import Lockers, Delivers, UserDataDict, ParcelsDataDict, Parcels, LockersDataDict, DeliversDataDict
 from src.report_generate import ReportGenerator
-from src.repository import UserDataRepository, ParcelDataRepository, LockerDataRepository, DeliverDataRepository
+from src.repository import UserDataRepository, ParcelDataRepository, LockerDataRepository, DeliverDataRepository, LoadMode
+from src.loader import RepositoryLoader
 from src.service import PurchaseSummaryService
 from src.speech_recognizer_service import SpeechRecognizerService
 
 from src.validator import AbstractValidator
-from src.model import LockerComponentsSize, City, Users
+from src.model import LockerComponentsSize, City, Users, OccupancyMatrix
 from datetime import date
 from src.validator import UserDataDictValidator, LockerDataDictValidator, ParcelDataDictValidator, DeliverDataDictValidator
 from datetime import date
@@ -126,30 +127,40 @@ def main() -> None:
         file_reader=user_reader,
         validator=user_validator,
         converter=user_converter,
-        filename="data/users.json"
+        filename="data/users.json",
+        load_mode=LoadMode.MANUAL
     )
 
     parcel_repo = ParcelDataRepository(
         file_reader=parcel_reader,
         validator=parcel_validator,
         converter=parcel_converter,
-        filename="data/parcels.json"
+        filename="data/parcels.json",
+        load_mode=LoadMode.MANUAL
     )
 
     locker_repo = LockerDataRepository(
         file_reader=locker_reader,
         validator=locker_validator,
         converter=locker_converter,
-        filename="data/lockers.json"
+        filename="data/lockers.json",
+        load_mode=LoadMode.MANUAL
     )
 
     deliver_repo = DeliverDataRepository(
         file_reader=deliver_reader,
         validator=deliver_validator,
         converter=deliver_converter,
-        filename="data/delivers.json"
+        filename="data/delivers.json",
+        load_mode=LoadMode.MANUAL
     )
 
+    RepositoryLoader().load({
+        "users": user_repo,
+        "parcels": parcel_repo,
+        "lockers": locker_repo,
+        "delivers": deliver_repo
+    })
 
     service = PurchaseSummaryService(
         locker_repo=locker_repo,
@@ -160,7 +171,7 @@ def main() -> None:
         parcels=parcels,
         delivers=delivers,
         users=users,
-        locker_usage = {locker_id: {LockerComponentsSize.SMALL: 0, LockerComponentsSize.MEDIUM: 0, LockerComponentsSize.LARGE: 0} for locker_id in lockers}
+        locker_usage = OccupancyMatrix(lockers).as_dict()
     )
 
 
@@ -183,9 +194,13 @@ def main() -> None:
     #em.send_email_about_free_locker('alice.smith@gmail.com', parcels['P12345'])
 
     #email_sender.send_email(recipient_mail, subject, body, attachment_path)
+    deliver_repo.start_auto_reload(interval=30)
     spr = SpeechRecognizerService(deliver_repo=deliver_repo)
     sp = SpeechRecognizer(spr)
 
-    sp.handle_conversation()
+    try:
+        sp.handle_conversation()
+    finally:
+        deliver_repo.stop_auto_reload()
 if __name__ == '__main__':
     main()
@@ -0,0 +1,199 @@
+from array import array
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Iterable, Iterator
+
+
+class ColumnKind(Enum):
+    """
+    Enum representing the storage kind of a column in a columnar table.
+
+    Values:
+        INT: Signed 64-bit integers stored in an ``array('q')``.
+        FLOAT: Double precision floats stored in an ``array('d')``.
+        DATE: Dates stored as proleptic Gregorian ordinals in an ``array('i')``.
+        STRING: Dictionary-encoded strings (see ``DictionaryColumn``).
+    """
+    INT = "q"
+    FLOAT = "d"
+    DATE = "i"
+    STRING = "str"
+
+
+Buffer = array | memoryview
+"""A numeric buffer: an ``array``, or a read-only ``memoryview`` cast to an array type code (e.g. over shared memory)."""
+
+
+def writable(buffer: Buffer) -> array:
+    """
+    Returns a buffer that can be appended to.
+
+    :param buffer: The buffer.
+    :return: The buffer, if it is an ``array``.
+    :raises TypeError: If the buffer is a read-only memoryview.
+    """
+    if isinstance(buffer, memoryview):
+        raise TypeError("Columns over a memoryview are read-only")
+    return buffer
+
+
+@dataclass
+class DictionaryColumn:
+    """
+    A dictionary-encoded string column.
+
+    Each distinct value is stored once in ``values`` and every row only keeps an integer
+    code pointing into it. Codes are assigned in order of first appearance.
+
+    Attributes:
+        values (list[str]): Distinct values, indexed by code.
+        codes (Buffer): Per-row codes.
+    """
+    values: list[str] = field(default_factory=list)
+    codes: Buffer = field(default_factory=lambda: array("i"))
+    _lookup: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """
+        Rebuilds the value-to-code lookup for columns created from existing values.
+        """
+        self._lookup = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, value: str) -> int:
+        """
+        Returns the code for the given value, registering the value if it is new.
+
+        :param value: The string value to encode.
+        :return: The integer code of the value.
+        """
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self._lookup[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value: str) -> None:
+        """
+        Appends a value to the column.
+
+        :param value: The string value to append.
+        :raises TypeError: If the codes are a read-only memoryview.
+        """
+        writable(self.codes).append(self.encode(value))
+
+    def code_of(self, value: str) -> int | None:
+        """
+        Returns the code of an already registered value without registering it.
+
+        :param value: The string value to look up.
+        :return: The code of the value, or None if the value never appeared in the column.
+        """
+        return self._lookup.get(value)
+
+    def decode(self) -> list[str]:
+        """
+        Decodes the whole column back into a list of strings.
+
+        :return: The column values in row order.
+        """
+        return list(map(self.values.__getitem__, self.codes))
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+Column = Buffer | DictionaryColumn
+
+
+@dataclass
+class ColumnarTable:
+    """
+    A table of records stored column by column instead of as a list of objects.
+
+    Numeric columns are kept in typed ``array`` buffers, dates as integer ordinals and
+    strings as ``DictionaryColumn`` instances, which keeps batches compact and lets
+    analytics run over whole columns.
+
+    Attributes:
+        kinds (dict[str, ColumnKind]): The kind of every column, in column order.
+        columns (dict[str, Column]): The column buffers, keyed by column name.
+    """
+    kinds: dict[str, ColumnKind]
+    columns: dict[str, Column] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        """
+        Creates an empty buffer for every declared column that was not provided.
+        """
+        for name, kind in self.kinds.items():
+            if name not in self.columns:
+                self.columns[name] = DictionaryColumn() if kind is ColumnKind.STRING else array(kind.value)
+
+    def append_row(self, row: Iterable[Any]) -> None:
+        """
+        Appends a single row. Values must already be coerced to the column kinds
+        (``int``, ``float``, date ordinal as ``int`` or ``str``) and follow the column order.
+
+        :param row: The row values in column order.
+        """
+        for column, value in zip(self.columns.values(), row):
+            if isinstance(column, DictionaryColumn):
+                column.append(value)
+            else:
+                writable(column).append(value)
+
+    def column(self, name: str) -> Column:
+        """
+        Returns the buffer of the given column.
+
+        :param name: The column name.
+        :return: The column buffer.
+        """
+        return self.columns[name]
+
+    def numeric(self, name: str) -> Buffer:
+        """
+        Returns the buffer of a numeric or date column.
+
+        :param name: The column name.
+        :return: The column buffer.
+        :raises TypeError: If the column is a string column.
+        """
+        column = self.columns[name]
+        if isinstance(column, DictionaryColumn):
+            raise TypeError(f"Column {name} is a string column")
+        return column
+
+    def strings(self, name: str) -> DictionaryColumn:
+        """
+        Returns the dictionary-encoded buffer of a string column.
+
+        :param name: The column name.
+        :return: The column buffer.
+        :raises TypeError: If the column is not a string column.
+        """
+        column = self.columns[name]
+        if not isinstance(column, DictionaryColumn):
+            raise TypeError(f"Column {name} is not a string column")
+        return column
+
+    def rows(self) -> Iterator[tuple[Any, ...]]:
+        """
+        Iterates over the table row by row, decoding string columns.
+
+        :return: An iterator of row tuples in column order.
+        """
+        decoded = [
+            column.decode() if isinstance(column, DictionaryColumn) else column
+            for column in self.columns.values()
+        ]
+        return zip(*decoded)
+
+    def __len__(self) -> int:
+        if not self.columns:
+            return 0
+        return len(next(iter(self.columns.values())))
@@ -1,12 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import override
+from array import array
+from dataclasses import MISSING, fields
+from enum import Enum
+from typing import Any, Callable, ClassVar, Iterable, Mapping, get_args, get_origin, get_type_hints, override
 from datetime import date, datetime
+from src.columnar import ColumnarTable, ColumnKind
 from src.model import (
     Users,
     Lockers,
     Parcels,
     Delivers,
     City,
+    CompartmentVector,
+    DEFAULT_PARCEL_SIZE_CLASSIFIER,
+    ParcelSizeClassifier,
     LockerComponentsSize,
     UserDataDict,
     ParcelsDataDict,
@@ -19,7 +26,65 @@ logging.basicConfig(level=logging.DEBUG)
 logging.basicConfig(level=logging.ERROR)
 
 
+def parse_date(date_value: Any) -> date:
+    """
+    Converts different date formats into a date object.
+
+    :param date_value: Date value which can be a date object, timestamp, or string.
+    :return: Parsed date object.
+    :raises TypeError: If the date format is unsupported.
+    """
+    if isinstance(date_value, date):
+        return date_value
+    if isinstance(date_value, int):
+        return datetime.utcfromtimestamp(date_value).date()
+    if isinstance(date_value, str):
+        if len(date_value) == 10 and date_value[4] == "-" and date_value[7] == "-":
+            return date.fromisoformat(date_value)
+        return datetime.strptime(date_value, "%Y-%m-%d").date()
+    raise TypeError(f"Unsupported type for date parsing: {type(date_value)}")
+
+
+def date_ordinal(date_value: Any) -> int:
+    """
+    Converts a date value accepted by `parse_date` into its proleptic Gregorian ordinal.
+
+    :param date_value: Date value which can be a date object, timestamp, or string.
+    :return: The ordinal of the parsed date.
+    """
+    return parse_date(date_value).toordinal()
+
+
+def safe_float(value: Any, field_name: str) -> float:
+    """
+    Safely converts a value to float, logging an error if conversion fails.
+
+    :param value: Value to be converted.
+    :param field_name: Name of the field being converted.
+    :return: Converted float value, or 0.0 if conversion fails.
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        logging.error(f"Invalid type for {field_name}: {value}. Using 0.0 as fallback.")
+        return 0.0
+
+
+COLUMN_COERCERS: dict[ColumnKind, Callable[[Any], Any]] = {
+    ColumnKind.INT: int,
+    ColumnKind.FLOAT: float,
+    ColumnKind.DATE: date_ordinal,
+    ColumnKind.STRING: str,
+}
+
+
 class Converter[T, U](ABC):
+    """
+    Base class for converters turning raw data of type T into model objects of type U.
+
+    Subclasses declare `columns` to support batch conversion into a `ColumnarTable`.
+    """
+    columns: ClassVar[dict[str, ColumnKind]] = {}
 
     @abstractmethod
     def convert(self, data: T) -> U:
@@ -28,8 +93,41 @@ class Converter[T, U](ABC):
         """
         pass
 
+    def convert_many(self, data: Iterable[T]) -> ColumnarTable:
+        """
+        Converts a batch of validated raw entries into a columnar table, without building
+        a model object per entry.
+
+        :param data: The validated raw entries.
+        :return: A ColumnarTable with one column per entry of `columns`.
+        """
+        table = ColumnarTable(dict(self.columns))
+        row = self.row
+        append_row = table.append_row
+        for entry in data:
+            append_row(row(entry))
+        return table
+
+    def row(self, data: T) -> tuple[Any, ...]:
+        """
+        Extracts the column values of a single raw entry, coerced to the column kinds.
+
+        :param data: The raw entry.
+        :return: A tuple of values in column order.
+        """
+        return tuple(COLUMN_COERCERS[kind](data[name]) for name, kind in self.columns.items())  # type: ignore[index]
+
 
 class UserConverter(Converter[UserDataDict, Users]):
+    columns = {
+        "email": ColumnKind.STRING,
+        "name": ColumnKind.STRING,
+        "surname": ColumnKind.STRING,
+        "city": ColumnKind.STRING,
+        "latitude": ColumnKind.FLOAT,
+        "longitude": ColumnKind.FLOAT,
+    }
+
     @override
     def convert(self, data: UserDataDict) -> Users:
         """
@@ -49,23 +147,67 @@ class UserConverter(Converter[UserDataDict, Users]):
 
 
 class ParcelConverter(Converter[ParcelsDataDict, Parcels]):
+    columns = {
+        "parcel_id": ColumnKind.STRING,
+        "height": ColumnKind.INT,
+        "length": ColumnKind.INT,
+        "weight": ColumnKind.INT,
+    }
+
+    def __init__(self, classifier: ParcelSizeClassifier = DEFAULT_PARCEL_SIZE_CLASSIFIER) -> None:
+        """
+        Initializes the converter.
+
+        :param classifier: The classifier computing the compartment size of converted parcels.
+        """
+        self.classifier = classifier
+
     @override
     def convert(self, data: ParcelsDataDict) -> Parcels:
         """
-        Converts a dictionary representing parcel data into a Parcels object.
+        Converts a dictionary representing parcel data into a Parcels object,
+        computing its compartment size once.
 
         :param data: Dictionary containing parcel data.
         :return: Parcels object populated with the given data.
         """
+        height = int(data['height'])
+        length = int(data['length'])
         return Parcels(
             parcel_id=str(data['parcel_id']),
-            height=int(data['height']),
-            length=int(data['length']),
-            weight=int(data['weight'])
+            height=height,
+            length=length,
+            weight=int(data['weight']),
+            classifier=self.classifier
         )
 
+    @override
+    def convert_many(self, data: Iterable[ParcelsDataDict]) -> ColumnarTable:
+        """
+        Converts a batch of parcel dictionaries into a columnar table with an additional
+        'size' column holding the compartment size ordinal of every parcel.
+
+        :param data: The validated parcel dictionaries.
+        :return: A ColumnarTable with the parcel columns and the 'size' column.
+        """
+        table = super().convert_many(data)
+        sizes = self.classifier.classify_many(table.numeric("height"), table.numeric("length"))
+        table.kinds["size"] = ColumnKind.INT
+        table.columns["size"] = array(ColumnKind.INT.value, [size.ordinal for size in sizes])
+        return table
+
 
 class LockerConverter(Converter[LockersDataDict, Lockers]):
+    columns = {
+        "locker_id": ColumnKind.STRING,
+        "city": ColumnKind.STRING,
+        "latitude": ColumnKind.FLOAT,
+        "longitude": ColumnKind.FLOAT,
+        "compartments_small": ColumnKind.INT,
+        "compartments_medium": ColumnKind.INT,
+        "compartments_large": ColumnKind.INT,
+    }
+
     @override
     def convert(self, data: LockersDataDict) -> Lockers:
         """
@@ -80,20 +222,6 @@ class LockerConverter(Converter[LockersDataDict, Lockers]):
             logging.error("'compartments' is not a dictionary. Using default empty dictionary.")
             compartments = {}
 
-        def safe_float(value, field_name):
-            """
-            Safely converts a value to float, logging an error if conversion fails.
-
-            :param value: Value to be converted.
-            :param field_name: Name of the field being converted.
-            :return: Converted float value, or 0.0 if conversion fails.
-            """
-            try:
-                return float(value)
-            except (TypeError, ValueError):
-                logging.error(f"Invalid type for {field_name}: {value}. Using 0.0 as fallback.")
-                return 0.0
-
         latitude = safe_float(data.get("latitude"), "latitude")
         longitude = safe_float(data.get("longitude"), "longitude")
 
@@ -102,15 +230,46 @@ class LockerConverter(Converter[LockersDataDict, Lockers]):
             city=City(data["city"]),
             latitude=latitude,
             longitude=longitude,
-            compartments={
-                LockerComponentsSize.SMALL: compartments.get("small", 0),
-                LockerComponentsSize.MEDIUM: compartments.get("medium", 0),
-                LockerComponentsSize.LARGE: compartments.get("large", 0),
-            }
+            compartments=CompartmentVector((
+                compartments.get("small", 0),
+                compartments.get("medium", 0),
+                compartments.get("large", 0),
+            ))
+        )
+
+    @override
+    def row(self, data: LockersDataDict) -> tuple[Any, ...]:
+        """
+        Extracts the column values of a single locker entry, flattening the compartments
+        dictionary into one integer column per compartment size.
+
+        :param data: Dictionary containing locker data.
+        :return: A tuple of values in column order.
+        """
+        compartments = data.get("compartments", {})
+        if not isinstance(compartments, dict):
+            compartments = {}
+        return (
+            str(data["locker_id"]),
+            str(data["city"]),
+            safe_float(data.get("latitude"), "latitude"),
+            safe_float(data.get("longitude"), "longitude"),
+            int(compartments.get("small", 0)),
+            int(compartments.get("medium", 0)),
+            int(compartments.get("large", 0)),
         )
 
 
 class DeliversConverter(Converter[DeliversDataDict, Delivers]):
+    columns = {
+        "parcel_id": ColumnKind.STRING,
+        "locker_id": ColumnKind.STRING,
+        "sender_email": ColumnKind.STRING,
+        "receiver_email": ColumnKind.STRING,
+        "sent_date": ColumnKind.DATE,
+        "expected_delivery_date": ColumnKind.DATE,
+    }
+
     @override
     def convert(self, data: DeliversDataDict) -> Delivers:
         """
@@ -120,23 +279,6 @@ class DeliversConverter(Converter[DeliversDataDict, Delivers]):
         :param data: Dictionary containing delivery data.
         :return: Delivers object populated with the given data.
         """
-
-        def parse_date(date_value):
-            """
-            Converts different date formats into a date object.
-
-            :param date_value: Date value which can be a date object, timestamp, or string.
-            :return: Parsed date object.
-            :raises TypeError: If the date format is unsupported.
-            """
-            if isinstance(date_value, date):
-                return date_value
-            if isinstance(date_value, int):
-                return datetime.utcfromtimestamp(date_value).date()
-            if isinstance(date_value, str):
-                return datetime.strptime(date_value, "%Y-%m-%d").date()
-            raise TypeError(f"Unsupported type for date parsing: {type(date_value)}")
-
         logging.debug(data)
         send_date = parse_date(data["sent_date"])
         expected_delivery_date = parse_date(data["expected_delivery_date"])
@@ -149,3 +291,163 @@ class DeliversConverter(Converter[DeliversDataDict, Delivers]):
             sent_date=send_date,
             expected_delivery_date=expected_delivery_date
         )
+
+
+GeneratedFunctions = tuple[Callable[[Any], Any], Callable[[Any], tuple[Any, ...]], dict[str, ColumnKind]]
+
+_GENERATED: dict[type, GeneratedFunctions] = {}
+
+
+def _field_code(
+        name: str,
+        field_type: Any,
+        namespace: dict[str, Any],
+        lenient: bool = False
+) -> tuple[list[str], str, list[tuple[str, ColumnKind, str]]]:
+    """
+    Produces the code fragments converting a single dataclass field.
+
+    :param name: The field name, also used as the key in the raw data.
+    :param field_type: The resolved type annotation of the field.
+    :param namespace: Namespace of the generated functions, extended with the constants the code refers to.
+    :param lenient: Whether an invalid or missing float falls back to 0.0 instead of raising.
+    :return: A tuple of (prelude statements, conversion expression, [(column name, column kind, column expression)]).
+    """
+    value = f"data[{name!r}]"
+    if field_type is str:
+        return [], f"str({value})", [(name, ColumnKind.STRING, f"str({value})")]
+    if field_type is int:
+        return [], f"int({value})", [(name, ColumnKind.INT, f"int({value})")]
+    if field_type is float:
+        coerced = f"safe_float(data.get({name!r}), {name!r})" if lenient else f"float({value})"
+        return [], coerced, [(name, ColumnKind.FLOAT, coerced)]
+    if field_type is date:
+        return [], f"parse_date({value})", [(name, ColumnKind.DATE, f"date_ordinal({value})")]
+    if isinstance(field_type, type) and issubclass(field_type, Enum):
+        members = f"_{name}_members"
+        namespace[members] = {member.value: member for member in field_type}
+        return [], f"{members}[{value}]", [(name, ColumnKind.STRING, f"str({value})")]
+
+    if field_type is CompartmentVector or CompartmentVector in get_args(field_type):
+        raw = f"_{name}_raw"
+        namespace["CompartmentVector"] = CompartmentVector
+        prelude = [
+            f"{raw} = data.get({name!r})",
+            f"if not isinstance({raw}, dict): {raw} = {{}}",
+        ]
+        counts = [f"int({raw}.get({size.value!r}, 0))" for size in LockerComponentsSize]
+        columns = [(f"{name}_{size.value}", ColumnKind.INT, count) for size, count in zip(LockerComponentsSize, counts)]
+        return prelude, f"CompartmentVector(({', '.join(counts)}))", columns
+
+    key_type, *_ = get_args(field_type) or (None,)
+    if get_origin(field_type) is dict and isinstance(key_type, type) and issubclass(key_type, Enum):
+        raw = f"_{name}_raw"
+        prelude = [
+            f"{raw} = data.get({name!r})",
+            f"if not isinstance({raw}, dict): {raw} = {{}}",
+        ]
+        items = []
+        columns = []
+        for member in key_type:
+            constant = f"_{name}_{member.name}"
+            namespace[constant] = member
+            items.append(f"{constant}: int({raw}.get({member.value!r}, 0))")
+            columns.append((f"{name}_{member.value}", ColumnKind.INT, f"int({raw}.get({member.value!r}, 0))"))
+        return prelude, "{" + ", ".join(items) + "}", columns
+
+    return [], value, []
+
+
+def generate_converter_functions(model: type) -> GeneratedFunctions:
+    """
+    Generates, once per dataclass, a specialized function converting a raw dictionary into
+    an instance of the dataclass and a function extracting its columnar row.
+
+    The fields of the dataclass are introspected a single time and the resulting code calls
+    the coercions directly, without per-call closures or per-field dispatch.
+
+    :param model: The dataclass to generate the functions for.
+    :return: A tuple of (convert function, row function, column kinds).
+    """
+    if model in _GENERATED:
+        return _GENERATED[model]
+
+    hints = get_type_hints(model)
+    namespace: dict[str, Any] = {
+        "_model": model, "parse_date": parse_date, "date_ordinal": date_ordinal, "safe_float": safe_float
+    }
+    prelude: list[str] = []
+    arguments: list[str] = []
+    row_expressions: list[str] = []
+    columns: dict[str, ColumnKind] = {}
+
+    for model_field in fields(model):
+        if not model_field.init or model_field.metadata.get("derived"):
+            continue
+        field_prelude, expression, field_columns = _field_code(
+            model_field.name, hints[model_field.name], namespace, bool(model_field.metadata.get("lenient"))
+        )
+        prelude.extend(field_prelude)
+        if model_field.default is not MISSING:
+            default = f"_{model_field.name}_default"
+            namespace[default] = model_field.default
+            expression = f"({expression} if {model_field.name!r} in data else {default})"
+        elif model_field.default_factory is not MISSING:
+            factory = f"_{model_field.name}_factory"
+            namespace[factory] = model_field.default_factory
+            expression = f"({expression} if {model_field.name!r} in data else {factory}())"
+        arguments.append(expression)
+        for column_name, kind, column_expression in field_columns:
+            columns[column_name] = kind
+            row_expressions.append(column_expression)
+
+    body = "".join(f"    {line}\n" for line in prelude)
+    source = (
+        f"def convert(data):\n{body}    return _model({', '.join(arguments)})\n"
+        f"def row(data):\n{body}    return ({', '.join(row_expressions)}{',' if row_expressions else ''})\n"
+    )
+    exec(compile(source, f"<converter {model.__name__}>", "exec"), namespace)
+    _GENERATED[model] = (namespace["convert"], namespace["row"], columns)
+    return _GENERATED[model]
+
+
+class DataclassConverter[U](Converter[Mapping[str, Any], U]):
+    """
+    A generic converter for any model dataclass.
+
+    The conversion code is generated from the dataclass fields on first use, so a new entity
+    type does not need a hand-written converter. Supported field types are `str`, `int`,
+    `float`, `date`, enums (looked up by value), `CompartmentVector` and enum-keyed
+    `dict[..., int]` mappings, any other field is passed through unchanged. Invalid floats raise,
+    except in fields marked as lenient in their metadata, which fall back to 0.0 like in
+    `LockerConverter`. Fields marked as derived in their metadata are left to the model to compute.
+    """
+
+    def __init__(self, model: type[U]) -> None:
+        """
+        Initializes the converter and generates its conversion functions.
+
+        :param model: The dataclass produced by the converter.
+        """
+        self.model = model
+        self._convert, self._row, self.columns = generate_converter_functions(model)  # type: ignore[misc]
+
+    @override
+    def convert(self, data: Mapping[str, Any]) -> U:
+        """
+        Converts a dictionary into an instance of the model dataclass.
+
+        :param data: Dictionary containing the model data.
+        :return: The model object populated with the given data.
+        """
+        return self._convert(data)
+
+    @override
+    def row(self, data: Mapping[str, Any]) -> tuple[Any, ...]:
+        """
+        Extracts the column values of a single raw entry, coerced to the column kinds.
+
+        :param data: Dictionary containing the model data.
+        :return: A tuple of values in column order.
+        """
+        return self._row(data)
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
+from typing import Mapping
 from src.email_sender import EmailSender
-from src.model import Parcels, Users, LockerComponentsSize
+from src.model import CompartmentVector, Parcels, Users, LockerComponentsSize
 from src.report_generate import ReportGenerator
+from src.repository import multi_index_of
 from src.service import PurchaseSummaryService
 from dataclasses import dataclass
 from geopy.distance import geodesic # type: ignore[import]
@@ -23,13 +25,13 @@ class EmailService:
     def __post_init__(self)->None:
         """
         Initializes the EmailService instance by extracting necessary information
-        from the PurchaseSummaryService instance, including users, lockers, and deliveries.
+        from the PurchaseSummaryService instance, including users, lockers, and deliveries by locker ID.
         Additionally, it retrieves SMTP configuration from environment variables.
         """
 
         self.users = self.service.users
         self.lockers = self.service.lockers
-        self.delivers = {deliver.locker_id : deliver for deliver in self.service.deliver_repo.get_data()}
+        self.delivers = multi_index_of(self.service.deliver_repo, "locker_id")
         self.smtp_server = os.getenv('SMTP_SERVER')
         self.port = os.getenv('PORT')
         self.sender_email = os.getenv('SENDER_EMAIL')
@@ -98,10 +100,10 @@ class EmailService:
 
     def send_email_to_receiver(self, locker: str, package_in_locker: bool):
         """
-        Sends an email to the receiver about the status of the package in the locker.
+        Sends an email to the receivers about the status of the packages in the locker.
 
-        This method sends a notification email to the receiver informing them that their package
-        has been sent to the locker and provides the expected delivery date.
+        This method sends a notification email to the receiver of every delivery to the locker, informing
+        them that their package has been sent to the locker and providing the expected delivery date.
 
         Args:
             locker (str): The locker ID where the package is placed.
@@ -109,9 +111,9 @@ class EmailService:
         """
         if not package_in_locker:
             logging.info("package is not in locker yet")
+            return
 
-        deliver = self.delivers.get(locker)
-        if deliver and package_in_locker:
+        for deliver in self.delivers.lookup(locker):
             email = deliver.receiver_email
 
             subject = "package"
@@ -148,7 +150,7 @@ class EmailService:
 
         min_distace = float('inf')
         closest_locker_id = None
-        available_compartments = {}
+        available_compartments: Mapping[LockerComponentsSize, int] | CompartmentVector = {}
 
         def has_available_compartment(locker, size):
             """
@@ -1,5 +1,9 @@
 from abc import ABC
+from datetime import date
+from enum import Enum
+from typing import Iterable, Iterator
 from src.model import UserDataDict, LockersDataDict, DeliversDataDict, ParcelsDataDict, Lockers, Delivers, Parcels
+from src.serializer import write_models
 import json
 
 
@@ -11,6 +15,7 @@ class AbstractFileReader[T](ABC):
 
     Methods:
         read(filename: str) -> list[T]: Reads data from the specified file and returns it as a list of objects.
+        iter_read(filename: str) -> Iterator[T]: Reads data from the specified file one object at a time.
     """
 
     def read(self, filename: str) -> list[T]:
@@ -23,6 +28,22 @@ class AbstractFileReader[T](ABC):
         with open(filename, 'r', encoding='utf8') as file:
             return json.load(file)
 
+    def iter_read(self, filename: str) -> Iterator[T]:
+        """
+        Reads a file object by object. JSON lines files (``.jsonl``) are streamed line by line,
+        other files are read with `read`.
+
+        :param filename: The path to the file to be read.
+        :return: An iterator of the objects in the file.
+        """
+        if not filename.endswith('.jsonl'):
+            yield from self.read(filename)
+            return
+        with open(filename, 'r', encoding='utf8') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
 
 class UserJsonFileReader(AbstractFileReader[UserDataDict]):
     """
@@ -60,6 +81,21 @@ class ParcelJsonFileReader(AbstractFileReader[ParcelsDataDict]):
     pass
 
 
+def _json_default(value: object) -> object:
+    """
+    Encodes the values of raw entries that JSON does not support natively.
+
+    :param value: The value to encode.
+    :return: The ISO string of a date or the value of an enum.
+    :raises TypeError: If the value is of any other type.
+    """
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 class AbstractFileWriter[T](ABC):
     """
     An abstract base class for writing objects to a JSON file.
@@ -67,18 +103,37 @@ class AbstractFileWriter[T](ABC):
     This class provides a generic method for serializing a list of objects and writing it to a JSON file.
 
     Methods:
-        write(filename: str, data: list[T]) -> None: Writes a list of objects to a JSON file.
+        write(filename: str, data: list[T], lines: bool) -> None: Writes a list of objects to a JSON file.
+        write_models(filename: str, models: Iterable, lines: bool) -> int: Writes model objects without intermediate dicts.
     """
 
-    def write(self, filename: str, data: list[T]) -> None:
+    def write(self, filename: str, data: list[T], lines: bool = False) -> None:
         """
-        Writes a list of objects to a JSON file.
+        Writes a list of objects to a JSON file. Dates and enums are written as their
+        ISO strings and values.
 
         :param filename: The path to the file where the data will be written.
         :param data: A list of objects to be written to the file.
+        :param lines: Writes one JSON object per line instead of a JSON array when True.
         """
         with open(filename, 'w', encoding='utf8') as file:
-            json.dump(data, file, ensure_ascii=False, indent=4)
+            if not lines:
+                json.dump(data, file, ensure_ascii=False, indent=4, default=_json_default)
+                return
+            for entry in data:
+                file.write(json.dumps(entry, ensure_ascii=False, default=_json_default) + "\n")
+
+    def write_models[M](self, filename: str, models: Iterable[M], lines: bool = False) -> int:
+        """
+        Writes model objects straight to a JSON (or JSON lines) file in a single pass,
+        without building a dictionary per object.
+
+        :param filename: The path to the file where the models will be written.
+        :param models: The model objects to be written to the file.
+        :param lines: Writes one JSON object per line instead of a JSON array when True.
+        :return: The number of models written.
+        """
+        return write_models(filename, models, lines=lines)
 
 
 class UserJsonFileWriter(AbstractFileWriter[UserDataDict]):
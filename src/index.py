@@ -0,0 +1,471 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, Mapping, Protocol, Self
+from src.persistent import OverlayDict, PersistentList
+
+
+class Index[K, V](ABC):
+    """
+    A secondary index over records, keyed by one of their attributes.
+
+    Indexes are built from a full list of records and can then be maintained record by record,
+    so repositories can keep them up to date on refresh without rebuilding them.
+
+    Attributes:
+        field (str): The name of the indexed attribute.
+    """
+
+    def __init__(self, field: str, records: Iterable[V] = ()) -> None:
+        """
+        Initializes the index and fills it with the given records.
+
+        :param field: The name of the indexed attribute.
+        :param records: The records to index.
+        """
+        self.field = field
+        self.key_of: Callable[[V], K] = attrgetter(field)
+        self.rebuild(records)
+
+    @abstractmethod
+    def rebuild(self, records: Iterable[V]) -> None:
+        """
+        Replaces the content of the index with the given records.
+
+        :param records: The records to index.
+        """
+        pass
+
+    @abstractmethod
+    def add(self, record: V) -> None:
+        """
+        Adds a record to the index.
+
+        :param record: The record to add.
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, record: V) -> None:
+        """
+        Removes a record from the index. Records that are not indexed are ignored.
+
+        :param record: The record to remove.
+        """
+        pass
+
+    def replace(self, old: V, new: V) -> None:
+        """
+        Replaces an indexed record with its new version.
+
+        :param old: The currently indexed record.
+        :param new: The record replacing it.
+        """
+        self.remove(old)
+        self.add(new)
+
+    @abstractmethod
+    def copy(self) -> Self:
+        """
+        Returns an independent copy of the index that can be modified without affecting this one.
+
+        :return: The copy of the index.
+        """
+        pass
+
+    def _empty_copy(self) -> Self:
+        """
+        Returns an instance of the same index class over the same field, without content.
+        """
+        clone = object.__new__(type(self))
+        clone.field = self.field
+        clone.key_of = self.key_of
+        return clone
+
+
+class UniqueIndex[K, V](Index[K, V], Mapping[K, V]):
+    """
+    An index mapping every key to a single record. When several records share a key, the last one wins,
+    like a dictionary comprehension would, and the number of shadowed records is kept in `duplicates`.
+
+    Copies share the entries of the original index and only hold the keys changed since.
+    """
+
+    def rebuild(self, records: Iterable[V]) -> None:
+        key_of = self.key_of
+        entries: dict[K, V] = {}
+        count = 0
+        for record in records:
+            entries[key_of(record)] = record
+            count += 1
+        self._entries: OverlayDict[K, V] = OverlayDict(entries)
+        self.duplicates = count - len(entries)
+
+    def add(self, record: V) -> None:
+        key = self.key_of(record)
+        if key in self._entries:
+            self.duplicates += 1
+        self._entries[key] = record
+
+    def remove(self, record: V) -> None:
+        key = self.key_of(record)
+        if self._entries.get(key) is record:
+            del self._entries[key]
+
+    def replace(self, old: V, new: V) -> None:
+        """
+        Replaces an indexed record, keeping its position when its key did not change.
+
+        :param old: The currently indexed record.
+        :param new: The record replacing it.
+        """
+        key = self.key_of(old)
+        if self.key_of(new) == key and self._entries.get(key) is old:
+            self._entries[key] = new
+        else:
+            super().replace(old, new)
+
+    def copy(self) -> Self:
+        clone = self._empty_copy()
+        clone._entries = self._entries.copy()
+        clone.duplicates = self.duplicates
+        return clone
+
+    def get(self, key: K, default: Any = None) -> Any:
+        return self._entries.get(key, default)
+
+    def __getitem__(self, key: K) -> V:
+        return self._entries[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"UniqueIndex({self.field!r}, {len(self._entries)} keys)"
+
+
+class MultiIndex[K, V](Index[K, V], Mapping[K, list[V]]):
+    """
+    An index mapping every key to the list of records sharing it, in load order.
+
+    Copies share the keys and the record lists with the original index, and only copy the list
+    of a key when it is first modified.
+    """
+
+    def rebuild(self, records: Iterable[V]) -> None:
+        key_of = self.key_of
+        entries: dict[K, list[V]] = {}
+        for record in records:
+            entries.setdefault(key_of(record), []).append(record)
+        self._entries: OverlayDict[K, list[V]] = OverlayDict(entries)
+        self._owned: set[K] = set(entries)
+
+    def _own(self, key: K) -> list[V] | None:
+        """
+        Returns the modifiable record list of a key, copying it first if it is shared with another index.
+        """
+        records = self._entries.get(key)
+        if records is not None and key not in self._owned:
+            records = self._entries[key] = list(records)
+            self._owned.add(key)
+        return records
+
+    def add(self, record: V) -> None:
+        key = self.key_of(record)
+        records = self._own(key)
+        if records is None:
+            self._entries[key] = [record]
+            self._owned.add(key)
+        else:
+            records.append(record)
+
+    def remove(self, record: V) -> None:
+        key = self.key_of(record)
+        records = self._own(key)
+        if records is None:
+            return
+        for position, candidate in enumerate(records):
+            if candidate is record:
+                del records[position]
+                break
+        if not records:
+            del self._entries[key]
+
+    def replace(self, old: V, new: V) -> None:
+        """
+        Replaces an indexed record, keeping its position when its key did not change.
+
+        :param old: The currently indexed record.
+        :param new: The record replacing it.
+        """
+        records = self._own(self.key_of(old))
+        if records is not None and self.key_of(new) == self.key_of(old):
+            for position, candidate in enumerate(records):
+                if candidate is old:
+                    records[position] = new
+                    return
+        super().replace(old, new)
+
+    def copy(self) -> Self:
+        clone = self._empty_copy()
+        clone._entries = self._entries.copy()
+        clone._owned = set()
+        self._owned = set()
+        return clone
+
+    def lookup(self, key: K) -> list[V]:
+        """
+        Returns the records with the given key.
+
+        :param key: The key to look up.
+        :return: The matching records, or an empty list if there are none.
+        """
+        return self._entries.get(key, [])
+
+    def get(self, key: K, default: Any = None) -> Any:
+        return self._entries.get(key, default)
+
+    def __getitem__(self, key: K) -> list[V]:
+        return self._entries[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"MultiIndex({self.field!r}, {len(self._entries)} keys)"
+
+
+class PartitionIndex[K, V](MultiIndex[tuple[K, date], V]):
+    """
+    An index partitioning records by an attribute (e.g. the locker) and by the period of a date
+    attribute (e.g. the month a delivery was sent in). Questions about one value of the attribute
+    only read its partitions, optionally only those of a range of periods, and whole periods can be
+    dropped at once.
+
+    Partitions are keyed by (value, first day of the period). Periods are `period_months` long
+    and aligned to January of year 0, so a period of 3 months is a quarter.
+    """
+
+    def __init__(self, field: str, records: Iterable[V] = (), date_field: str = "sent_date", period_months: int = 1) -> None:
+        """
+        Initializes the index and fills it with the given records.
+
+        :param field: The name of the partitioning attribute.
+        :param records: The records to index.
+        :param date_field: The name of the date attribute whose period partitions the records further.
+        :param period_months: The length of a period in months.
+        """
+        if period_months < 1:
+            raise ValueError("period_months must be positive")
+        self.field = field
+        self.date_field = date_field
+        self.period_months = period_months
+        value_of, date_of = attrgetter(field), attrgetter(date_field)
+        self.key_of = lambda record: (value_of(record), self.period_of(date_of(record)))
+        self.rebuild(records)
+
+    def period_of(self, day: date) -> date:
+        """
+        Returns the first day of the period containing the given date.
+
+        :param day: The date.
+        :return: The start of its period.
+        """
+        month = (day.year * 12 + day.month - 1) // self.period_months * self.period_months
+        return date(month // 12, month % 12 + 1, 1)
+
+    def rebuild(self, records: Iterable[V]) -> None:
+        super().rebuild(records)
+        periods: dict[K, list[date]] = {}
+        for value, period in self._entries:
+            periods.setdefault(value, []).append(period)
+        self._periods: OverlayDict[K, tuple[date, ...]] = OverlayDict(
+            {value: tuple(sorted(starts)) for value, starts in periods.items()}
+        )
+
+    def add(self, record: V) -> None:
+        key = self.key_of(record)
+        created = key not in self._entries
+        super().add(record)
+        if created:
+            value, period = key
+            starts = list(self._periods.get(value, ()))
+            insort(starts, period)
+            self._periods[value] = tuple(starts)
+
+    def remove(self, record: V) -> None:
+        key = self.key_of(record)
+        existed = key in self._entries
+        super().remove(record)
+        if existed and key not in self._entries:
+            value, period = key
+            starts = tuple(start for start in self._periods[value] if start != period)
+            if starts:
+                self._periods[value] = starts
+            else:
+                del self._periods[value]
+
+    def copy(self) -> Self:
+        clone = super().copy()
+        clone.date_field = self.date_field
+        clone.period_months = self.period_months
+        clone._periods = self._periods.copy()
+        return clone
+
+    def values_partitioned(self) -> Iterator[K]:
+        """
+        Returns the values of the partitioning attribute that have at least one partition.
+        """
+        return iter(self._periods)
+
+    def periods(self, value: K) -> tuple[date, ...]:
+        """
+        Returns the sorted starts of the periods with records for the given value.
+
+        :param value: The value of the partitioning attribute.
+        :return: The period starts, oldest first.
+        """
+        return self._periods.get(value, ())
+
+    def records_of(self, value: K, start: date | None = None, end: date | None = None) -> list[V]:
+        """
+        Returns the records of a value, optionally only those whose date lies within the given
+        inclusive bounds. Only the partitions of periods overlapping the bounds are read.
+
+        :param value: The value of the partitioning attribute.
+        :param start: The earliest date to include, or None for no lower bound.
+        :param end: The latest date to include, or None for no upper bound.
+        :return: The matching records, partition by partition, oldest period first.
+        """
+        periods = self.periods(value)
+        low = 0 if start is None else bisect_left(periods, self.period_of(start))
+        high = len(periods) if end is None else bisect_right(periods, self.period_of(end))
+        date_of = attrgetter(self.date_field)
+        records = []
+        for period in periods[low:high]:
+            partition = self._entries[(value, period)]
+            if (start is None or period >= start) and (end is None or self._period_end(period) <= end):
+                records.extend(partition)
+            else:
+                records.extend(
+                    record for record in partition
+                    if (start is None or start <= date_of(record)) and (end is None or date_of(record) <= end)
+                )
+        return records
+
+    def before(self, cutoff: date) -> list[V]:
+        """
+        Returns the records of all whole periods ending before the period of the given date.
+
+        :param cutoff: A date of the oldest period to keep.
+        :return: The records of the older periods.
+        """
+        first_kept = self.period_of(cutoff)
+        return [
+            record
+            for value, periods in self._periods.items()
+            for period in periods[:bisect_left(periods, first_kept)]
+            for record in self._entries[(value, period)]
+        ]
+
+    def _period_end(self, period: date) -> date:
+        """
+        Returns the last day of the period starting on the given date.
+        """
+        month = period.year * 12 + period.month - 1 + self.period_months
+        return date.fromordinal(date(month // 12, month % 12 + 1, 1).toordinal() - 1)
+
+    def __repr__(self) -> str:
+        return f"PartitionIndex({self.field!r}, {self.date_field!r}, {len(self._entries)} partitions)"
+
+
+class Orderable(Protocol):
+    """
+    A key that can be ordered, as required by `SortedIndex`.
+    """
+
+    def __lt__(self, other: Any, /) -> bool: ...
+
+
+class SortedIndex[K: Orderable, V](Index[K, V]):
+    """
+    An index keeping records ordered by an orderable attribute (e.g. a date), answering
+    range queries by bisection instead of scanning every record.
+
+    Records with equal keys keep their insertion order. Keys and records are held in persistent
+    lists, so copies share them with the original index.
+    """
+
+    def rebuild(self, records: Iterable[V]) -> None:
+        key_of = self.key_of
+        ordered = sorted(records, key=key_of)
+        self._keys: PersistentList[K] = PersistentList.of(map(key_of, ordered))
+        self._records: PersistentList[V] = PersistentList.of(ordered)
+
+    def add(self, record: V) -> None:
+        key = self.key_of(record)
+        position = bisect_right(self._keys, key)
+        self._keys = self._keys.insert(position, key)
+        self._records = self._records.insert(position, record)
+
+    def remove(self, record: V) -> None:
+        key = self.key_of(record)
+        start = bisect_left(self._keys, key)
+        end = bisect_right(self._keys, key, start)
+        for position in range(start, end):
+            if self._records[position] is record:
+                self._keys = self._keys.delete(position)
+                self._records = self._records.delete(position)
+                return
+
+    def copy(self) -> Self:
+        clone = self._empty_copy()
+        clone._keys = self._keys
+        clone._records = self._records
+        return clone
+
+    def range(self, start: K | None = None, end: K | None = None) -> list[V]:
+        """
+        Returns the records whose key lies within the given bounds. Both bounds are inclusive.
+
+        :param start: The lowest key to include, or None for no lower bound.
+        :param end: The highest key to include, or None for no upper bound.
+        :return: The matching records ordered by key.
+        """
+        low = 0 if start is None else bisect_left(self._keys, start)
+        high = len(self._keys) if end is None else bisect_right(self._keys, end)
+        return self._records[low:high]
+
+    def count(self, start: K | None = None, end: K | None = None) -> int:
+        """
+        Returns the number of records whose key lies within the given bounds, without copying them.
+
+        :param start: The lowest key to include, or None for no lower bound.
+        :param end: The highest key to include, or None for no upper bound.
+        :return: The number of matching records.
+        """
+        low = 0 if start is None else bisect_left(self._keys, start)
+        high = len(self._keys) if end is None else bisect_right(self._keys, end)
+        return max(high - low, 0)
+
+    def __iter__(self) -> Iterator[V]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __repr__(self) -> str:
+        return f"SortedIndex({self.field!r}, {len(self._records)} records)"
@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from itertools import product
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, Sequence
+from src.index import Index, MultiIndex, UniqueIndex
+
+Probe = Callable[[Any], Sequence[Any]]
+
+
+@dataclass(frozen=True)
+class JoinCondition:
+    """
+    An equality condition joining rows of the left side to the records of a repository.
+
+    Args:
+        left_field (str): The attribute of the left rows holding the key.
+        repository (Any): The repository on the right side of the join.
+        right_field (str): The attribute of the repository records matched against the key.
+        unique (bool): Whether `right_field` identifies a single record. When several records share
+            a value, only the last one matches, like a dictionary keyed by the attribute would.
+    """
+    left_field: str
+    repository: Any
+    right_field: str
+    unique: bool = False
+
+
+class JoinEngine:
+    """
+    A hash-join engine over repositories.
+
+    The right side of every join is probed through a hash index: the repository's own declared
+    index when there is one, otherwise an index built once per repository version and cached.
+    Repositories without versioned snapshots (anything that is not an `AbstractDataRepository`,
+    e.g. test doubles) are indexed from `get_data()` on every join.
+    Joined rows are streamed lazily, so analytics only pay for the rows they consume.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the engine with an empty index cache.
+        """
+        self._indexes: dict[tuple[int, str, bool], tuple[Any, int, Index[Any, Any]]] = {}
+
+    def probe(self, repository: Any, field_name: str, unique: bool = False) -> Probe:
+        """
+        Returns a function looking up the records of a repository by an attribute.
+
+        :param repository: The repository to look records up in.
+        :param field_name: The attribute to match.
+        :param unique: Whether only the last record with a given value matches.
+        :return: A function returning the records with the given attribute value.
+        """
+        if not isinstance(getattr(type(repository), "unique_indexes", None), tuple):
+            return self._lookup(self._build(field_name, repository.get_data(), unique))
+        if field_name in repository.unique_indexes:
+            return self._lookup(repository.unique_index(field_name))
+        if field_name in repository.multi_indexes:
+            lookup = repository.multi_index(field_name).lookup
+            return (lambda key: lookup(key)[-1:]) if unique else lookup
+
+        snapshot = repository.snapshot()
+        cache_key = (id(repository), field_name, unique)
+        cached = self._indexes.get(cache_key)
+        if cached is None or cached[0] is not repository or cached[1] != snapshot.version:
+            cached = (repository, snapshot.version, self._build(field_name, snapshot.data, unique))
+            self._indexes[cache_key] = cached
+        return self._lookup(cached[2])
+
+    @staticmethod
+    def _build(field_name: str, records: Iterable[Any], unique: bool) -> Index[Any, Any]:
+        """
+        Builds a unique (last record wins) or multi-valued index over the given records.
+        """
+        return UniqueIndex(field_name, records) if unique else MultiIndex(field_name, records)
+
+    @staticmethod
+    def _lookup(index: Index[Any, Any]) -> Probe:
+        """
+        Returns the probe of an index, matching at most one record for a unique index.
+        """
+        if isinstance(index, UniqueIndex):
+            return lambda key: (index[key],) if key in index else ()
+        assert isinstance(index, MultiIndex)
+        return index.lookup
+
+    def inner(
+            self,
+            left: Iterable[Any],
+            *conditions: JoinCondition,
+            on_miss: Callable[[Any], None] | None = None
+    ) -> Iterator[tuple[Any, ...]]:
+        """
+        Streams the inner join of the left rows with the repositories of the conditions.
+
+        :param left: The left rows.
+        :param conditions: The join conditions, one per joined repository.
+        :param on_miss: Called with every left row that has no match for at least one condition.
+        :return: An iterator of tuples of the left row followed by one matching record per condition.
+        """
+        probes = self._probes(conditions)
+        for row in left:
+            matches = [probe(key_of(row)) for key_of, probe in probes]
+            if all(matches):
+                for combination in product(*matches):
+                    yield row, *combination
+            elif on_miss is not None:
+                on_miss(row)
+
+    def anti(self, left: Iterable[Any], *conditions: JoinCondition) -> Iterator[Any]:
+        """
+        Streams the left rows that have no match for at least one condition, e.g. records
+        with dangling references.
+
+        :param left: The left rows.
+        :param conditions: The join conditions, one per referenced repository.
+        :return: An iterator of the unmatched left rows.
+        """
+        probes = self._probes(conditions)
+        for row in left:
+            if not all(probe(key_of(row)) for key_of, probe in probes):
+                yield row
+
+    def _probes(self, conditions: Sequence[JoinCondition]) -> list[tuple[Callable[[Any], Any], Probe]]:
+        """
+        Resolves the key extractor and the probe of every condition.
+        """
+        return [
+            (attrgetter(condition.left_field), self.probe(condition.repository, condition.right_field, condition.unique))
+            for condition in conditions
+        ]
@@ -0,0 +1,262 @@
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Hashable, Iterator, Mapping
+from src.converter import Converter
+from src.file_service import AbstractFileReader
+from src.repository import AbstractDataRepository, SourceState
+from src.validator import AbstractValidator
+import json
+import logging
+import mmap
+import os
+import threading
+
+logging.basicConfig(level=logging.INFO)
+
+
+class MappedJsonlLayer[T, U]:
+    """
+    An immutable JSON lines file mapped into memory and indexed by key. The file is scanned and
+    validated once; records are only converted when they are accessed, and the most recently
+    used converted records are cached.
+    """
+
+    def __init__(
+            self,
+            filename: str,
+            validator: AbstractValidator[T],
+            converter: Converter[T, U],
+            key_field: str,
+            cache_size: int = 4096
+    ) -> None:
+        """
+        Maps and indexes the file.
+
+        :param filename: The JSON lines file.
+        :param validator: The validator for the raw entries; invalid entries are left out of the index.
+        :param converter: The converter for the raw entries, applied on access.
+        :param key_field: The field identifying entries.
+        :param cache_size: The maximum number of converted records kept in memory.
+        """
+        if not filename.endswith('.jsonl'):
+            raise ValueError(f"The base must be a JSON lines file, got {filename}")
+        self.filename = filename
+        self.converter = converter
+        self.cache_size = cache_size
+        self.offsets = array("q")
+        self.keys: list[Hashable] = []
+        self.positions: dict[Hashable, int] = {}
+        self._cache: OrderedDict[int, U] = OrderedDict()
+        self._lock = threading.Lock()
+        self._file = open(filename, "rb")
+        self._map: mmap.mmap | None = None
+        if os.fstat(self._file.fileno()).st_size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._scan(validator, key_field)
+
+    def _scan(self, validator: AbstractValidator[T], key_field: str) -> None:
+        """
+        Indexes the offset and key of every valid line.
+        """
+        assert self._map is not None
+        offset = 0
+        for line in iter(self._map.readline, b""):
+            if line.strip():
+                entry = json.loads(line)
+                if validator.validate(entry):
+                    key = entry.get(key_field)
+                    if key in self.positions:
+                        logging.warning(f"Duplicate {key_field} {key!r} in {self.filename}, keeping the last one")
+                        self.offsets[self.positions[key]] = offset
+                    else:
+                        self.positions[key] = len(self.keys)
+                        self.keys.append(key)
+                        self.offsets.append(offset)
+                else:
+                    logging.error(f"Invalid entry: {entry}")
+            offset += len(line)
+
+    def record(self, position: int) -> U:
+        """
+        Returns the converted record of an indexed line, decoding it if it is not cached.
+
+        :param position: The position of the line in the index.
+        :return: The converted record.
+        """
+        with self._lock:
+            cached = self._cache.get(position)
+            if cached is not None:
+                self._cache.move_to_end(position)
+                return cached
+            assert self._map is not None
+            self._map.seek(self.offsets[position])
+            record = self.converter.convert(json.loads(self._map.readline()))
+            self._cache[position] = record
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return record
+
+    def get(self, key: Hashable) -> U | None:
+        """
+        Looks a record up by its key.
+
+        :param key: The value of the key field.
+        :return: The record, or None if there is none.
+        """
+        position = self.positions.get(key)
+        return None if position is None else self.record(position)
+
+    def close(self) -> None:
+        """
+        Unmaps and closes the file.
+        """
+        with self._lock:
+            self._cache.clear()
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+@dataclass
+class LayeredDataRepository[T, U]:
+    """
+    A repository overlaying small, frequently changing delta files on a large immutable base,
+    resolving records by key. Later deltas take priority over earlier ones, and all of them over
+    the base. A delta entry whose `deleted_field` is true hides the key in the lower layers.
+
+    The base is a JSON lines file that is memory-mapped and indexed once (`MappedJsonlLayer`);
+    its records are only converted when accessed. Refreshing only re-reads the deltas that
+    changed, so picking up a handful of changes does not reload the base.
+
+    Args:
+        file_reader (AbstractFileReader[T]): The file reader for reading the deltas.
+        validator (AbstractValidator[T]): The validator for validating the raw data of all layers.
+        converter (Converter[T, U]): The converter for converting raw data of all layers.
+        base_filename (str): The JSON lines file of the base.
+        delta_filenames (list[str]): The delta files, lowest priority first; missing files are empty.
+        key_field (str): The field identifying records across layers.
+        deleted_field (str): The field marking a delta entry as a deletion.
+        cache_size (int): The maximum number of converted base records kept in memory.
+    """
+    file_reader: AbstractFileReader[T]
+    validator: AbstractValidator[T]
+    converter: Converter[T, U]
+    base_filename: str
+    delta_filenames: list[str]
+    key_field: str
+    deleted_field: str = "deleted"
+    cache_size: int = 4096
+    _base: MappedJsonlLayer[T, U] = field(init=False, repr=False)
+    _deltas: list[dict[Hashable, U | None]] = field(default_factory=list, init=False, repr=False)
+    _states: list[SourceState | None] = field(default_factory=list, init=False, repr=False)
+    _overlay: dict[Hashable, U | None] = field(default_factory=dict, init=False, repr=False)
+    _length: int = field(default=0, init=False, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """
+        Maps the base and loads the deltas.
+        """
+        logging.info(f"Mapping base data from {self.base_filename}...")
+        self._base = MappedJsonlLayer(self.base_filename, self.validator, self.converter, self.key_field, self.cache_size)
+        self._deltas = [{} for _ in self.delta_filenames]
+        self._states = [None for _ in self.delta_filenames]
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Re-reads the deltas whose size or modification time changed and rebuilds the overlay.
+        The base is never read again.
+
+        :param force: Re-reads all deltas even if they look unchanged.
+        :return: True if any delta was re-read.
+        """
+        with self._lock:
+            changed = False
+            for layer, filename in enumerate(self.delta_filenames):
+                state = AbstractDataRepository.source_state(filename)
+                if not force and state == self._states[layer]:
+                    continue
+                self._deltas[layer] = self._read_delta(filename)
+                self._states[layer] = state
+                changed = True
+            if changed:
+                overlay: dict[Hashable, U | None] = {}
+                for delta in self._deltas:
+                    overlay.update(delta)
+                positions = self._base.positions
+                deleted = sum(1 for key, record in overlay.items() if record is None and key in positions)
+                added = sum(1 for key, record in overlay.items() if record is not None and key not in positions)
+                self._overlay = overlay
+                self._length = len(self._base) - deleted + added
+            return changed
+
+    def _read_delta(self, filename: str) -> dict[Hashable, U | None]:
+        """
+        Reads a delta file into converted records by key, with None marking deleted keys.
+
+        :param filename: The delta file.
+        :return: The records of the delta by key.
+        """
+        if not os.path.exists(filename):
+            return {}
+        logging.info(f"Reading delta data from {filename}...")
+        delta: dict[Hashable, U | None] = {}
+        for entry in self.file_reader.iter_read(filename):
+            if not isinstance(entry, Mapping) or (key := entry.get(self.key_field)) is None:
+                logging.error(f"Entry without {self.key_field}: {entry}")
+            elif entry.get(self.deleted_field) is True:
+                delta[key] = None
+            elif self.validator.validate(entry):
+                delta[key] = self.converter.convert(entry)
+            else:
+                logging.error(f"Invalid entry: {entry}")
+        return delta
+
+    def get(self, key: Hashable) -> U | None:
+        """
+        Looks a record up by its key in the layers, highest priority first.
+
+        :param key: The value of the key field.
+        :return: The record, or None if there is none or it was deleted.
+        """
+        overlay = self._overlay
+        if key in overlay:
+            return overlay[key]
+        return self._base.get(key)
+
+    def get_data(self) -> Iterator[U]:
+        """
+        Iterates over the resolved records: the base records in base order, replaced by their
+        overriding delta records, followed by the records only present in deltas.
+
+        :return: An iterator of the records.
+        """
+        overlay = self._overlay
+        for position, key in enumerate(self._base.keys):
+            if key in overlay:
+                record = overlay[key]
+                if record is not None:
+                    yield record
+            else:
+                yield self._base.record(position)
+        for key, record in overlay.items():
+            if record is not None and key not in self._base.positions:
+                yield record
+
+    def close(self) -> None:
+        """
+        Unmaps the base.
+        """
+        self._base.close()
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key) is not None  # type: ignore[arg-type]
+
+    def __len__(self) -> int:
+        return self._length
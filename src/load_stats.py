@@ -0,0 +1,94 @@
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator
+import json
+import tracemalloc
+
+
+@dataclass
+class LoadStats:
+    """
+    Timings and counters of a single repository load, to tell whether a slow load comes from
+    reading the file, from validation (e.g. DNS checks of email addresses) or from conversion.
+
+    Attributes:
+        filename (str): The loaded file.
+        records_in (int): The number of entries read from the file.
+        valid (int): The number of entries that passed validation, including reused ones.
+        rejected (int): The number of entries that failed validation.
+        reused (int): The number of unchanged entries that kept their previous record.
+        duplicates (int): The number of entries dropped or merged because an earlier entry had the same key.
+        bytes_read (int): The size of the loaded file, 0 if it is not a file on disk.
+        read_seconds (float): The time spent reading and parsing the file.
+        validate_seconds (float): The time spent in the validator.
+        convert_seconds (float): The time spent in the converter.
+        publish_seconds (float): The time spent building the indexes and publishing the snapshot.
+        total_seconds (float): The wall-clock time of the whole load.
+        peak_memory_bytes (int | None): The peak of memory allocated during the load, if it was traced.
+    """
+    filename: str = ""
+    records_in: int = 0
+    valid: int = 0
+    rejected: int = 0
+    reused: int = 0
+    duplicates: int = 0
+    bytes_read: int = 0
+    read_seconds: float = 0.0
+    validate_seconds: float = 0.0
+    convert_seconds: float = 0.0
+    publish_seconds: float = 0.0
+    total_seconds: float = 0.0
+    peak_memory_bytes: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Converts the statistics to a dictionary representation.
+
+        :return: A dictionary with one key per attribute.
+        """
+        return asdict(self)
+
+    def dump(self, path: str) -> None:
+        """
+        Writes the statistics to a JSON file.
+
+        :param path: The path of the JSON file.
+        """
+        with open(path, "w", encoding="utf8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def __str__(self) -> str:
+        memory = "" if self.peak_memory_bytes is None else f", peak memory {self.peak_memory_bytes} B"
+        return (
+            f"{self.filename}: {self.records_in} in, {self.valid} valid ({self.reused} reused), "
+            f"{self.rejected} rejected, {self.duplicates} duplicates, {self.bytes_read} B; "
+            f"read {self.read_seconds:.3f} s, validate {self.validate_seconds:.3f} s, convert {self.convert_seconds:.3f} s, "
+            f"publish {self.publish_seconds:.3f} s, total {self.total_seconds:.3f} s{memory}"
+        )
+
+
+@contextmanager
+def traced_memory(stats: LoadStats, enabled: bool = True) -> Iterator[None]:
+    """
+    Records the peak of memory allocated within the block in `stats.peak_memory_bytes`.
+    Tracing slows allocations down, so it is only started when enabled and stopped afterwards
+    unless it was already running.
+
+    :param stats: The statistics to update.
+    :param enabled: Whether to trace memory at all.
+    """
+    if not enabled:
+        yield
+        return
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        stats.peak_memory_bytes = max(peak - baseline, 0)
+        if started:
+            tracemalloc.stop()
@@ -0,0 +1,205 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Mapping
+from src.load_stats import LoadStats
+from src.repository import AbstractDataRepository, LoadMode, SourceState
+import logging
+import time
+
+logging.basicConfig(level=logging.INFO)
+
+
+@dataclass(frozen=True)
+class RepositoryLoadTiming:
+    """
+    The outcome of loading a single repository.
+
+    Args:
+        name (str): The name the repository was registered under.
+        seconds (float): The wall-clock time spent loading the repository.
+        records (int): The number of loaded records.
+    """
+    name: str
+    seconds: float
+    records: int
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    """
+    The timings of a concurrent load of several repositories.
+
+    Args:
+        timings (dict[str, RepositoryLoadTiming]): The timing of every repository, by name.
+        total_seconds (float): The wall-clock time of the whole load.
+    """
+    timings: dict[str, RepositoryLoadTiming] = field(default_factory=dict)
+    total_seconds: float = 0.0
+
+    @property
+    def sequential_seconds(self) -> float:
+        """
+        The time the repositories would have taken when loaded one after another.
+        """
+        return sum(timing.seconds for timing in self.timings.values())
+
+    def __str__(self) -> str:
+        lines = [
+            f"{timing.name}: {timing.records} records in {timing.seconds:.3f} s"
+            for timing in self.timings.values()
+        ]
+        lines.append(f"total: {self.total_seconds:.3f} s (sequential: {self.sequential_seconds:.3f} s)")
+        return "\n".join(lines)
+
+
+def _refresh_timed(repository: AbstractDataRepository) -> float:
+    """
+    Refreshes a repository and measures how long it took.
+
+    :param repository: The repository to refresh.
+    :return: The number of seconds spent in the refresh.
+    """
+    start = time.perf_counter()
+    repository.refresh()
+    return time.perf_counter() - start
+
+
+WorkerResult = tuple[list[Any], dict[Hashable, tuple[Any, Any]], LoadStats, SourceState | None, str | None]
+
+
+def _process_in_worker(
+        repository_type: type[AbstractDataRepository],
+        components: tuple[Any, Any, Any],
+        filename: str,
+        settings: Mapping[str, Any]
+) -> WorkerResult:
+    """
+    Hashes, reads, validates and converts a repository file in a worker process.
+
+    :param repository_type: The class of the repository being loaded.
+    :param components: The file reader, validator and converter of the repository.
+    :param filename: The file to load.
+    :param settings: The `worker_settings` of the repository being loaded, e.g. its duplicate policy.
+    :return: The processed data, the raw and converted records by key, the statistics of the load,
+        and the state and digest of the file before it was read.
+    """
+    start = time.perf_counter()
+    file_reader, validator, converter = components
+    repository = repository_type(
+        file_reader=file_reader,
+        validator=validator,
+        converter=converter,
+        filename=filename,
+        load_mode=LoadMode.MANUAL
+    )
+    for name, value in settings.items():
+        setattr(repository, name, value)
+    state = repository.source_state(filename)
+    digest = repository.source_digest(filename) if state is not None else None
+    stats = LoadStats(filename)
+    data, records = repository._process_data(filename, stats=stats)
+    stats.total_seconds = time.perf_counter() - start
+    return data, records, stats, state, digest
+
+
+@dataclass
+class _PendingLoad:
+    """
+    A scheduled repository load.
+
+    Args:
+        repository (AbstractDataRepository): The repository being loaded.
+        future (Future): The future of the refresh or of the worker process.
+        filename (str | None): The file processed in a worker process, None for a refresh on a thread.
+    """
+    repository: AbstractDataRepository
+    future: Future
+    filename: str | None = None
+
+
+class RepositoryLoader:
+    """
+    Loads several repositories concurrently, so startup takes as long as the slowest repository
+    instead of the sum of all of them.
+
+    By default every repository is refreshed on its own thread, which overlaps file I/O and the
+    network checks of the validators. With `use_processes` the reading, validation and conversion
+    run in worker processes instead, for CPU-bound conversion; this requires picklable readers,
+    validators and converters. The workers also hash the source files and receive the
+    `worker_settings` of the repositories (e.g. the eviction cutoff of deliveries). The processed
+    data is then published in the calling process.
+
+    Repositories should be created with `LoadMode.MANUAL` so they are not loaded twice.
+    """
+
+    def __init__(self, max_workers: int | None = None, use_processes: bool = False) -> None:
+        """
+        Initializes the loader.
+
+        :param max_workers: The maximum number of concurrent loads, one per repository by default.
+        :param use_processes: Processes the data in worker processes instead of threads.
+        """
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+
+    def load(self, repositories: Mapping[str, AbstractDataRepository]) -> LoadReport:
+        """
+        Loads all repositories concurrently and waits for all of them.
+
+        :param repositories: The repositories to load, by name.
+        :return: The timings of the load.
+        :raises Exception: The first error raised while loading a repository, after all loads finished.
+        """
+        workers = self.max_workers or max(len(repositories), 1)
+        executor: Executor = ProcessPoolExecutor(workers) if self.use_processes else ThreadPoolExecutor(workers)
+        start = time.perf_counter()
+        timings: dict[str, RepositoryLoadTiming] = {}
+        errors: list[Exception] = []
+        with executor:
+            pending = {name: self._submit(executor, repository) for name, repository in repositories.items()}
+            for name, load in pending.items():
+                try:
+                    seconds = self._complete(load)
+                except Exception as error:
+                    logging.error(f"Loading {name} failed: {error}")
+                    errors.append(error)
+                    continue
+                timings[name] = RepositoryLoadTiming(name, seconds, len(load.repository.data))
+
+        report = LoadReport(timings, time.perf_counter() - start)
+        if errors:
+            raise errors[0]
+        logging.info(f"Repositories loaded:\n{report}")
+        return report
+
+    def _submit(self, executor: Executor, repository: AbstractDataRepository) -> _PendingLoad:
+        """
+        Schedules the load of a single repository.
+
+        :param executor: The executor running the loads.
+        :param repository: The repository to load.
+        :return: The scheduled load.
+        """
+        if not self.use_processes:
+            return _PendingLoad(repository, executor.submit(_refresh_timed, repository))
+
+        filename = str(repository.filename)
+        components = (repository.file_reader, repository.validator, repository.converter)
+        future = executor.submit(
+            _process_in_worker, type(repository), components, filename, repository.worker_settings()
+        )
+        return _PendingLoad(repository, future, filename)
+
+    def _complete(self, load: _PendingLoad) -> float:
+        """
+        Waits for a scheduled load and publishes data processed in a worker process.
+
+        :param load: The scheduled load.
+        :return: The number of seconds the load took.
+        """
+        if load.filename is None:
+            return load.future.result()
+
+        data, records, stats, state, digest = load.future.result()
+        load.repository.publish_processed(load.filename, data, records, state, digest, stats)
+        return stats.total_seconds
@@ -1,11 +1,18 @@
+from array import array
+from collections import Counter
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import InitVar, dataclass, field
 from datetime import date
+from itertools import compress
+from operator import and_, gt, sub
+from typing import Iterable, Iterator, Mapping
+from src.columnar import Buffer, ColumnarTable, DictionaryColumn, writable
 
 # Type aliases for dictionary-like structures
 UserDataDict = dict[str, str | int | float]
 ParcelsDataDict = dict[str, str | int]
 LockersDataDict = dict[str, str | int | float | dict[str, int]]
+CompartmentsDataDict = Mapping["LockerComponentsSize", int] | Mapping[str, int]
 DeliversDataDict = dict[str, str | int | date]
 
 
@@ -17,11 +24,247 @@ class LockerComponentsSize(Enum):
         SMALL: Represents a small-sized locker compartment.
         MEDIUM: Represents a medium-sized locker compartment.
         LARGE: Represents a large-sized locker compartment.
+
+    Attributes:
+        ordinal (int): Stable position of the size (0, 1, 2), used as the slot in compartment vectors.
     """
     SMALL = "small"
     MEDIUM = "medium"
     LARGE = "large"
 
+    ordinal: int
+
+    def __new__(cls, value: str) -> "LockerComponentsSize":
+        member = object.__new__(cls)
+        member._value_ = value
+        member.ordinal = len(cls.__members__)
+        return member
+
+
+SIZES: tuple[LockerComponentsSize, ...] = tuple(LockerComponentsSize)
+SIZE_COUNT = len(SIZES)
+
+
+SizeThreshold = tuple[int, int, LockerComponentsSize]
+
+
+@dataclass(frozen=True, slots=True)
+class ParcelSizeClassifier:
+    """
+    Classifies parcels into locker compartment sizes using a threshold table.
+
+    Attributes:
+        thresholds (tuple[SizeThreshold, ...]): Rows of (max height, max length, size), checked in order;
+            the first row the parcel fits in gives its size.
+        fallback (LockerComponentsSize): The size of parcels fitting in no row.
+
+    Methods:
+        classify(height, length) -> LockerComponentsSize: Classifies a single parcel.
+        classify_many(heights, lengths) -> list[LockerComponentsSize]: Classifies a batch of parcels.
+    """
+    thresholds: tuple[SizeThreshold, ...] = (
+        (10, 20, LockerComponentsSize.SMALL),
+        (30, 50, LockerComponentsSize.MEDIUM),
+    )
+    fallback: LockerComponentsSize = LockerComponentsSize.LARGE
+
+    def classify(self, height: int, length: int) -> LockerComponentsSize:
+        """
+        Classifies a single parcel by its dimensions.
+
+        :param height: The height of the parcel in centimeters.
+        :param length: The length of the parcel in centimeters.
+        :return: The compartment size the parcel needs.
+        """
+        for max_height, max_length, size in self.thresholds:
+            if height <= max_height and length <= max_length:
+                return size
+        return self.fallback
+
+    def classify_many(self, heights: Iterable[int], lengths: Iterable[int]) -> list[LockerComponentsSize]:
+        """
+        Classifies a batch of parcels with one pass over the columns per threshold row.
+
+        :param heights: The parcel heights.
+        :param lengths: The parcel lengths, in the same order.
+        :return: The compartment sizes, in the same order.
+        """
+        heights = list(heights)
+        lengths = list(lengths)
+        rows = range(len(heights))
+        sizes = [self.fallback] * len(heights)
+        # later writes win, so apply the rows in reverse to give the first matching row priority
+        for max_height, max_length, size in reversed(self.thresholds):
+            for index in compress(rows, map(and_, map(max_height.__ge__, heights), map(max_length.__ge__, lengths))):
+                sizes[index] = size
+        return sizes
+
+
+DEFAULT_PARCEL_SIZE_CLASSIFIER = ParcelSizeClassifier()
+
+
+class CompartmentVector:
+    """
+    A fixed-size vector holding one integer per locker compartment size, indexed by
+    `LockerComponentsSize.ordinal`.
+
+    The vector is either backed by its own buffer or is a view into a row of a shared
+    buffer (see `OccupancyMatrix`). It can be indexed by size or by ordinal and offers the
+    read-only part of the mapping interface (`get`, `items`, `values`, `in`) keyed by size.
+    """
+    __slots__ = ("_buffer", "_offset")
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(self, counts: Iterable[int] = (0,) * SIZE_COUNT, buffer: array | None = None, offset: int = 0) -> None:
+        """
+        Initializes the vector.
+
+        :param counts: The values per size in ordinal order, used when no buffer is given.
+        :param buffer: A shared buffer to view instead of allocating a new one.
+        :param offset: The position of the first slot of the vector in the shared buffer.
+        """
+        if buffer is None:
+            buffer = array("q", counts)
+            if len(buffer) != SIZE_COUNT:
+                raise ValueError(f"Expected {SIZE_COUNT} compartment values, got {len(buffer)}")
+            offset = 0
+        self._buffer = buffer
+        self._offset = offset
+
+    @classmethod
+    def from_mapping(cls, mapping: CompartmentsDataDict) -> "CompartmentVector":
+        """
+        Creates a vector from a mapping keyed by `LockerComponentsSize` members or by their values.
+        Missing sizes default to 0.
+
+        :param mapping: The mapping to convert.
+        :return: A new CompartmentVector.
+        """
+        if isinstance(mapping, CompartmentVector):
+            return cls(mapping.values())
+        return cls(
+            int(mapping.get(size, mapping.get(size.value, 0)))  # type: ignore[call-overload]
+            for size in SIZES
+        )
+
+    def __getitem__(self, size: LockerComponentsSize | int) -> int:
+        index = size.ordinal if isinstance(size, LockerComponentsSize) else size
+        return self._buffer[self._offset + index]
+
+    def __setitem__(self, size: LockerComponentsSize | int, value: int) -> None:
+        index = size.ordinal if isinstance(size, LockerComponentsSize) else size
+        self._buffer[self._offset + index] = value
+
+    def get(self, size: LockerComponentsSize, default: int | None = None) -> int | None:
+        """
+        Returns the value for the given size, or `default` if `size` is not a compartment size.
+        """
+        return self[size] if isinstance(size, LockerComponentsSize) else default
+
+    def __contains__(self, size: object) -> bool:
+        return isinstance(size, LockerComponentsSize)
+
+    def __iter__(self) -> Iterator[LockerComponentsSize]:
+        return iter(SIZES)
+
+    def __len__(self) -> int:
+        return SIZE_COUNT
+
+    def keys(self) -> tuple[LockerComponentsSize, ...]:
+        """
+        Returns the compartment sizes in ordinal order.
+        """
+        return SIZES
+
+    def values(self) -> list[int]:
+        """
+        Returns the values in ordinal order.
+        """
+        return self._buffer[self._offset:self._offset + SIZE_COUNT].tolist()
+
+    def items(self) -> Iterator[tuple[LockerComponentsSize, int]]:
+        """
+        Returns (size, value) pairs in ordinal order.
+        """
+        return zip(SIZES, self.values())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompartmentVector):
+            return self.values() == other.values()
+        if isinstance(other, Mapping):
+            return self == CompartmentVector.from_mapping(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return "CompartmentVector(" + ", ".join(f"{size.value}={count}" for size, count in self.items()) + ")"
+
+
+class OccupancyMatrix:
+    """
+    Per-locker compartment counts for many lockers, stored in one contiguous buffer with
+    one row of `SIZE_COUNT` slots per locker.
+
+    Attributes:
+        locker_ids (list[str]): The locker identifiers in row order.
+        rows (dict[str, int]): The row of every locker.
+        buffer (array): The row-major counts.
+    """
+
+    def __init__(self, locker_ids: Iterable[str]) -> None:
+        """
+        Initializes an all-zero matrix with one row per locker.
+
+        :param locker_ids: The locker identifiers, in row order.
+        """
+        self.locker_ids = list(locker_ids)
+        self.rows = {locker_id: row for row, locker_id in enumerate(self.locker_ids)}
+        self.buffer = array("q", bytes(8 * SIZE_COUNT * len(self.locker_ids)))
+
+    @classmethod
+    def from_capacities(cls, lockers: Iterable["Lockers"]) -> "OccupancyMatrix":
+        """
+        Creates a matrix holding the compartment capacities of the given lockers.
+
+        :param lockers: The lockers, in row order.
+        :return: A new OccupancyMatrix.
+        """
+        lockers = list(lockers)
+        matrix = cls(locker.locker_id for locker in lockers)
+        for row, locker in enumerate(lockers):
+            start = row * SIZE_COUNT
+            matrix.buffer[start:start + SIZE_COUNT] = array("q", locker.compartments.values())
+        return matrix
+
+    def add(self, locker_id: str, size: LockerComponentsSize | int, count: int = 1) -> None:
+        """
+        Adds `count` to the slot of the given locker and size.
+        """
+        index = size.ordinal if isinstance(size, LockerComponentsSize) else size
+        self.buffer[self.rows[locker_id] * SIZE_COUNT + index] += count
+
+    def row(self, locker_id: str) -> CompartmentVector:
+        """
+        Returns a vector viewing the row of the given locker. Writes go to the matrix.
+        """
+        return CompartmentVector(buffer=self.buffer, offset=self.rows[locker_id] * SIZE_COUNT)
+
+    def as_dict(self) -> dict[str, CompartmentVector]:
+        """
+        Returns a view vector for every locker, keyed by locker identifier.
+        """
+        return {locker_id: self.row(locker_id) for locker_id in self.locker_ids}
+
+    def exceeding(self, capacities: "OccupancyMatrix") -> Iterator[tuple[str, LockerComponentsSize, int, int]]:
+        """
+        Compares the matrix with a capacity matrix over the same lockers in one pass.
+
+        :param capacities: The capacities, with the same rows as this matrix.
+        :return: (locker_id, size, count, capacity) for every slot where the count exceeds the capacity.
+        """
+        for index in compress(range(len(self.buffer)), map(gt, self.buffer, capacities.buffer)):
+            row, slot = divmod(index, SIZE_COUNT)
+            yield self.locker_ids[row], SIZES[slot], self.buffer[index], capacities.buffer[index]
+
 
 class City(Enum):
     """
@@ -39,7 +282,7 @@ class City(Enum):
     SAN_FRANCISCO = "San Francisco"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Users:
     """
     A class representing a user in the system.
@@ -78,7 +321,7 @@ class Users:
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Parcels:
     """
     A class representing a parcel in the system.
@@ -88,6 +331,9 @@ class Parcels:
         height (int): The height of the parcel in centimeters.
         length (int): The length of the parcel in centimeters.
         weight (int): The weight of the parcel in grams.
+        size (LockerComponentsSize): The compartment size the parcel needs. Always derived from the
+            dimensions on construction, and left out of comparisons and `to_dict`.
+        classifier (ParcelSizeClassifier): Init-only classifier computing the size, the default one if not given.
 
     Methods:
         to_dict() -> ParcelsDataDict: Converts the parcel object to a dictionary representation.
@@ -96,6 +342,11 @@ class Parcels:
     height: int
     length: int
     weight: int
+    size: LockerComponentsSize = field(init=False, compare=False, repr=False, metadata={"derived": True})
+    classifier: InitVar[ParcelSizeClassifier] = DEFAULT_PARCEL_SIZE_CLASSIFIER
+
+    def __post_init__(self, classifier: ParcelSizeClassifier) -> None:
+        object.__setattr__(self, "size", classifier.classify(self.height, self.length))
 
     def to_dict(self) -> ParcelsDataDict:
         """
@@ -111,7 +362,7 @@ class Parcels:
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Lockers:
     """
     A class representing a locker in the system.
@@ -119,18 +370,23 @@ class Lockers:
     Attributes:
         locker_id (str): The unique identifier of the locker.
         city (City): The city where the locker is located.
-        latitude (float): The latitude coordinate of the locker.
-        longitude (float): The longitude coordinate of the locker.
-        compartments (dict): A dictionary representing the number of available compartments of different sizes.
+        latitude (float): The latitude coordinate of the locker; converters use 0.0 for invalid values.
+        longitude (float): The longitude coordinate of the locker; converters use 0.0 for invalid values.
+        compartments (Mapping[LockerComponentsSize, int] | CompartmentVector): The number of available
+            compartments of each size. Mappings are converted to a `CompartmentVector` on construction.
 
     Methods:
         to_dict() -> LockersDataDict: Converts the locker object to a dictionary representation.
     """
     locker_id: str
     city: City
-    latitude: float
-    longitude: float
-    compartments: dict[LockerComponentsSize, int]
+    latitude: float = field(metadata={"lenient": True})
+    longitude: float = field(metadata={"lenient": True})
+    compartments: Mapping[LockerComponentsSize, int] | CompartmentVector
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.compartments, CompartmentVector):
+            object.__setattr__(self, "compartments", CompartmentVector.from_mapping(self.compartments))
 
     def to_dict(self) -> LockersDataDict:
         """
@@ -144,14 +400,14 @@ class Lockers:
             "latitude": float(self.latitude),
             "longitude": float(self.longitude),
             "compartments": {
-                LockerComponentsSize.SMALL.value: self.compartments.get(LockerComponentsSize.SMALL, 0),
-                LockerComponentsSize.MEDIUM.value: self.compartments.get(LockerComponentsSize.MEDIUM, 0),
-                LockerComponentsSize.LARGE.value: self.compartments.get(LockerComponentsSize.LARGE, 0)
+                LockerComponentsSize.SMALL.value: self.compartments[LockerComponentsSize.SMALL],
+                LockerComponentsSize.MEDIUM.value: self.compartments[LockerComponentsSize.MEDIUM],
+                LockerComponentsSize.LARGE.value: self.compartments[LockerComponentsSize.LARGE]
             }
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Delivers:
     """
     A class representing a delivery in the system.
@@ -188,3 +444,161 @@ class Delivers:
             "sent_date": self.sent_date,
             "expected_delivery_date": self.expected_delivery_date
         }
+
+
+@dataclass
+class DeliveryTable:
+    """
+    A column-wise store of deliveries.
+
+    Locker, parcel, sender and receiver are kept as dictionary-encoded integer codes and the
+    sent and expected delivery dates as integer ordinals in `array` buffers, so queries run
+    as single passes over the columns instead of Python loops over `Delivers` objects.
+
+    Attributes:
+        parcel (DictionaryColumn): Encoded parcel identifiers.
+        locker (DictionaryColumn): Encoded locker identifiers.
+        sender (DictionaryColumn): Encoded sender emails.
+        receiver (DictionaryColumn): Encoded receiver emails.
+        sent (Buffer): Sent dates as ordinals.
+        expected (Buffer): Expected delivery dates as ordinals.
+
+    Methods:
+        from_delivers(delivers) -> DeliveryTable: Builds a table from delivery objects.
+        from_columnar(table) -> DeliveryTable: Wraps the output of `DeliversConverter.convert_many`.
+        filter(...) -> list[int]: Returns the indices of the rows matching all given predicates.
+        count_by(column) -> Counter[str]: Counts rows per value of a dictionary-encoded column.
+        durations() -> array: Returns the delivery duration in days of every row.
+    """
+    parcel: DictionaryColumn = field(default_factory=DictionaryColumn)
+    locker: DictionaryColumn = field(default_factory=DictionaryColumn)
+    sender: DictionaryColumn = field(default_factory=DictionaryColumn)
+    receiver: DictionaryColumn = field(default_factory=DictionaryColumn)
+    sent: Buffer = field(default_factory=lambda: array("i"))
+    expected: Buffer = field(default_factory=lambda: array("i"))
+
+    @classmethod
+    def from_delivers(cls, delivers: Iterable[Delivers]) -> "DeliveryTable":
+        """
+        Builds a table from delivery objects.
+
+        :param delivers: The deliveries to store.
+        :return: A DeliveryTable holding the deliveries in their original order.
+        """
+        table = cls()
+        for deliver in delivers:
+            table.append(deliver)
+        return table
+
+    @classmethod
+    def from_columnar(cls, table: ColumnarTable) -> "DeliveryTable":
+        """
+        Wraps a columnar table produced by `DeliversConverter.convert_many` without copying it.
+
+        :param table: The columnar delivery table.
+        :return: A DeliveryTable sharing the buffers of the given table.
+        """
+        return cls(
+            parcel=table.strings("parcel_id"),
+            locker=table.strings("locker_id"),
+            sender=table.strings("sender_email"),
+            receiver=table.strings("receiver_email"),
+            sent=table.numeric("sent_date"),
+            expected=table.numeric("expected_delivery_date"),
+        )
+
+    def append(self, deliver: Delivers) -> None:
+        """
+        Appends a single delivery to the table.
+
+        :param deliver: The delivery to append.
+        """
+        self.parcel.append(deliver.parcel_id)
+        self.locker.append(deliver.locker_id)
+        self.sender.append(deliver.sender_email)
+        self.receiver.append(deliver.receiver_email)
+        writable(self.sent).append(deliver.sent_date.toordinal())
+        writable(self.expected).append(deliver.expected_delivery_date.toordinal())
+
+    def __len__(self) -> int:
+        return len(self.sent)
+
+    def row(self, index: int) -> Delivers:
+        """
+        Materializes a single row as a delivery object.
+
+        :param index: The row index.
+        :return: The delivery stored in the row.
+        """
+        return Delivers(
+            parcel_id=self.parcel[index],
+            locker_id=self.locker[index],
+            sender_email=self.sender[index],
+            receiver_email=self.receiver[index],
+            sent_date=date.fromordinal(self.sent[index]),
+            expected_delivery_date=date.fromordinal(self.expected[index]),
+        )
+
+    def filter(
+            self,
+            parcel_id: str | None = None,
+            locker_id: str | None = None,
+            sender_email: str | None = None,
+            receiver_email: str | None = None,
+            sent_from: date | None = None,
+            sent_to: date | None = None
+    ) -> list[int]:
+        """
+        Returns the indices of the rows matching all given predicates. Dates bounds are inclusive.
+
+        :param parcel_id: Keeps rows of this parcel.
+        :param locker_id: Keeps rows delivered to this locker.
+        :param sender_email: Keeps rows sent by this user.
+        :param receiver_email: Keeps rows received by this user.
+        :param sent_from: Keeps rows sent on or after this date.
+        :param sent_to: Keeps rows sent on or before this date.
+        :return: The matching row indices in ascending order.
+        """
+        masks: list[Iterable[bool]] = []
+        for column, value in (
+                (self.parcel, parcel_id),
+                (self.locker, locker_id),
+                (self.sender, sender_email),
+                (self.receiver, receiver_email)
+        ):
+            if value is not None:
+                code = column.code_of(value)
+                if code is None:
+                    return []
+                masks.append(map(code.__eq__, column.codes))
+        if sent_from is not None:
+            masks.append(map(sent_from.toordinal().__le__, self.sent))
+        if sent_to is not None:
+            masks.append(map(sent_to.toordinal().__ge__, self.sent))
+
+        if not masks:
+            return list(range(len(self)))
+        mask = masks[0]
+        for other in masks[1:]:
+            mask = map(and_, mask, other)
+        return list(compress(range(len(self)), mask))
+
+    def count_by(self, column: str) -> Counter[str]:
+        """
+        Counts rows per value of a dictionary-encoded column ('parcel', 'locker', 'sender' or 'receiver').
+        Values keep the order of their first appearance.
+
+        :param column: The name of the column to group by.
+        :return: A Counter mapping each value to its number of rows.
+        """
+        encoded: DictionaryColumn = getattr(self, column)
+        values = encoded.values
+        return Counter({values[code]: count for code, count in Counter(encoded.codes).items()})
+
+    def durations(self) -> array:
+        """
+        Computes the delivery duration, in days, of every row.
+
+        :return: An array of durations in row order.
+        """
+        return array("i", map(sub, self.expected, self.sent))
@@ -0,0 +1,362 @@
+from array import array
+from dataclasses import dataclass
+from enum import Enum
+from typing import IO, Iterable, Iterator
+from src.model import SIZE_COUNT, SIZES, CompartmentVector, LockerComponentsSize, Lockers, OccupancyMatrix
+import json
+import logging
+import os
+import threading
+
+logging.basicConfig(level=logging.INFO)
+
+
+class OccupancyEventType(Enum):
+    """
+    Enum representing the locker state changes recorded in the occupancy log.
+
+    Values:
+        DEPOSITED: A parcel was put into a compartment, which becomes occupied.
+        PICKED_UP: The receiver took the parcel out, which frees its compartment.
+        COMPARTMENT_FREED: A compartment was released without a pick up, e.g. an expired parcel was returned.
+    """
+    DEPOSITED = "deposited"
+    PICKED_UP = "picked_up"
+    COMPARTMENT_FREED = "compartment_freed"
+
+    @property
+    def delta(self) -> int:
+        """
+        The change of the number of occupied compartments caused by the event.
+        """
+        return 1 if self is OccupancyEventType.DEPOSITED else -1
+
+
+@dataclass(frozen=True, slots=True)
+class OccupancyEvent:
+    """
+    A single entry of the occupancy log.
+
+    Attributes:
+        sequence (int): The position of the event in the log, starting at 1.
+        event_type (OccupancyEventType): The kind of state change.
+        locker_id (str): The locker whose compartment changed.
+        size (LockerComponentsSize): The size of the compartment.
+        parcel_id (str | None): The parcel involved, if known.
+    """
+    sequence: int
+    event_type: OccupancyEventType
+    locker_id: str
+    size: LockerComponentsSize
+    parcel_id: str | None = None
+
+    def to_dict(self) -> dict[str, str | int | None]:
+        """
+        Converts the event to a dictionary representation.
+
+        :return: A dictionary with keys: 'sequence', 'event', 'locker_id', 'size', 'parcel_id'.
+        """
+        return {
+            "sequence": self.sequence,
+            "event": self.event_type.value,
+            "locker_id": self.locker_id,
+            "size": self.size.value,
+            "parcel_id": self.parcel_id
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "OccupancyEvent":
+        """
+        Creates an event from its dictionary representation.
+
+        :param data: The dictionary produced by `to_dict`.
+        :return: A new OccupancyEvent.
+        """
+        return cls(
+            int(data["sequence"]),
+            OccupancyEventType(data["event"]),
+            str(data["locker_id"]),
+            LockerComponentsSize(data["size"]),
+            data.get("parcel_id")
+        )
+
+
+@dataclass(frozen=True)
+class OccupancySnapshot:
+    """
+    The occupied compartments of every locker after a given event.
+
+    Attributes:
+        sequence (int): The sequence of the last event included in the snapshot.
+        counts (array): The occupied compartments, row-major in the row order of the log's lockers.
+        offset (int): The position in the log file right after the last included event.
+    """
+    sequence: int
+    counts: array
+    offset: int = 0
+
+
+class OccupancyLog:
+    """
+    An append-only log of locker state changes, with periodic snapshots of the occupancy.
+
+    Every appended event updates the live occupancy in O(1), so it never has to be recomputed
+    from the whole delivery history. Every `snapshot_interval` events a snapshot is taken and the
+    in-memory tail is cleared, so the occupancy can always be rebuilt from the latest snapshot and
+    a short tail of events.
+
+    With a `path`, events are appended to a buffered JSON lines file (see `flush`) and snapshots are written atomically
+    next to it (`<path>.snapshot`). `OccupancyLog.load` restores the log by reading the snapshot
+    and replaying only the events written after it.
+    """
+
+    def __init__(self, lockers: Iterable[Lockers], snapshot_interval: int = 1000, path: str | None = None) -> None:
+        """
+        Initializes an empty log over the given lockers.
+
+        :param lockers: The lockers whose occupancy is tracked, also providing the capacities.
+        :param snapshot_interval: The number of events between two snapshots.
+        :param path: The JSON lines file the events are appended to, if any.
+        """
+        if snapshot_interval < 1:
+            raise ValueError("snapshot_interval must be positive")
+        self.snapshot_interval = snapshot_interval
+        self.path = path
+        self.capacities = OccupancyMatrix.from_capacities(lockers)
+        self._occupied = OccupancyMatrix(self.capacities.locker_ids)
+        self._snapshot = OccupancySnapshot(0, array("q", self._occupied.buffer))
+        self._tail: list[OccupancyEvent] = []
+        self._sequence = 0
+        self._lock = threading.RLock()
+        self._file: IO[str] | None = None
+        if path is not None:
+            self._file = open(path, "a", encoding="utf8")
+            self._snapshot = OccupancySnapshot(0, self._snapshot.counts, self._file.tell())
+
+    @classmethod
+    def load(cls, path: str, lockers: Iterable[Lockers], snapshot_interval: int = 1000) -> "OccupancyLog":
+        """
+        Restores a persisted log from its latest snapshot and the events appended after it.
+
+        :param path: The JSON lines file of the log.
+        :param lockers: The tracked lockers; lockers missing from the snapshot start empty, and the
+            snapshot counts and events of lockers that are no longer tracked are skipped.
+        :param snapshot_interval: The number of events between two snapshots.
+        :return: The restored log, appending to the same file.
+        """
+        log = cls(lockers, snapshot_interval)
+        offset = 0
+        snapshot_path = cls.snapshot_path(path)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding="utf8") as file:
+                stored = json.load(file)
+            for locker_id, counts in stored["lockers"].items():
+                if locker_id in log._occupied.rows:
+                    row = log._occupied.row(locker_id)
+                    for size, count in zip(SIZES, counts):
+                        row[size] = count
+            log._sequence = stored["sequence"]
+            offset = stored["offset"]
+
+        log._snapshot = OccupancySnapshot(log._sequence, array("q", log._occupied.buffer), offset)
+        if os.path.exists(path):
+            with open(path, encoding="utf8") as file:
+                file.seek(offset)
+                for line in file:
+                    if not line.strip():
+                        continue
+                    event = OccupancyEvent.from_dict(json.loads(line))
+                    if event.locker_id in log._occupied.rows:
+                        log._apply(event)
+                    else:
+                        logging.warning(f"Skipping event {event.sequence} of untracked locker {event.locker_id}")
+                        log._sequence = event.sequence
+        log.path = path
+        log._file = open(path, "a", encoding="utf8")
+        return log
+
+    @staticmethod
+    def snapshot_path(path: str) -> str:
+        """
+        Returns the path of the snapshot file of a log file.
+        """
+        return f"{path}.snapshot"
+
+    @property
+    def sequence(self) -> int:
+        """
+        The sequence of the last appended event.
+        """
+        return self._sequence
+
+    @property
+    def tail(self) -> list[OccupancyEvent]:
+        """
+        The events appended since the latest snapshot.
+        """
+        return list(self._tail)
+
+    @property
+    def last_snapshot(self) -> OccupancySnapshot:
+        """
+        The latest snapshot.
+        """
+        return self._snapshot
+
+    def append(
+            self,
+            event_type: OccupancyEventType,
+            locker_id: str,
+            size: LockerComponentsSize,
+            parcel_id: str | None = None
+    ) -> OccupancyEvent:
+        """
+        Appends an event to the log and applies it to the occupancy. A snapshot is taken
+        once `snapshot_interval` events have been appended since the previous one.
+
+        :param event_type: The kind of state change.
+        :param locker_id: The locker whose compartment changed.
+        :param size: The size of the compartment.
+        :param parcel_id: The parcel involved, if known.
+        :return: The appended event.
+        :raises KeyError: If the locker is not tracked by the log.
+        """
+        with self._lock:
+            if locker_id not in self._occupied.rows:
+                raise KeyError(f"Unknown locker {locker_id}")
+            event = OccupancyEvent(self._sequence + 1, event_type, locker_id, size, parcel_id)
+            if self._file is not None:
+                self._file.write(json.dumps(event.to_dict()) + "\n")
+            self._apply(event)
+            if len(self._tail) >= self.snapshot_interval:
+                self.snapshot()
+            return event
+
+    def deposit(self, locker_id: str, size: LockerComponentsSize, parcel_id: str | None = None) -> OccupancyEvent:
+        """
+        Records a parcel put into a compartment.
+        """
+        return self.append(OccupancyEventType.DEPOSITED, locker_id, size, parcel_id)
+
+    def pick_up(self, locker_id: str, size: LockerComponentsSize, parcel_id: str | None = None) -> OccupancyEvent:
+        """
+        Records a parcel taken out of a compartment by its receiver.
+        """
+        return self.append(OccupancyEventType.PICKED_UP, locker_id, size, parcel_id)
+
+    def free(self, locker_id: str, size: LockerComponentsSize, parcel_id: str | None = None) -> OccupancyEvent:
+        """
+        Records a compartment released without a pick up.
+        """
+        return self.append(OccupancyEventType.COMPARTMENT_FREED, locker_id, size, parcel_id)
+
+    def snapshot(self) -> OccupancySnapshot:
+        """
+        Takes a snapshot of the current occupancy and clears the in-memory tail. With a log file,
+        pending events are flushed first and the snapshot is written atomically.
+
+        :return: The new snapshot.
+        """
+        with self._lock:
+            offset = 0
+            if self._file is not None and self.path is not None:
+                self._file.flush()
+                offset = self._file.tell()
+            snapshot = OccupancySnapshot(self._sequence, array("q", self._occupied.buffer), offset)
+            if self.path is not None:
+                self._write_snapshot(snapshot)
+            self._snapshot = snapshot
+            self._tail.clear()
+            return snapshot
+
+    def occupancy(self, locker_id: str) -> CompartmentVector:
+        """
+        Returns the number of occupied compartments of each size of a locker.
+
+        :param locker_id: The locker identifier.
+        :return: A copy of the occupied compartments per size.
+        """
+        with self._lock:
+            return CompartmentVector(self._occupied.row(locker_id).values())
+
+    def available(self, locker_id: str) -> CompartmentVector:
+        """
+        Returns the number of free compartments of each size of a locker.
+
+        :param locker_id: The locker identifier.
+        :return: The capacity minus the occupied compartments, per size.
+        """
+        with self._lock:
+            occupied = self._occupied.row(locker_id).values()
+            capacity = self.capacities.row(locker_id).values()
+        return CompartmentVector(total - used for total, used in zip(capacity, occupied))
+
+    def exceeding(self) -> Iterator[tuple[str, LockerComponentsSize, int, int]]:
+        """
+        Compares the occupancy with the capacities of the lockers.
+
+        :return: (locker_id, size, occupied, capacity) for every compartment size over capacity.
+        """
+        with self._lock:
+            occupied = OccupancyMatrix(self._occupied.locker_ids)
+            occupied.buffer = array("q", self._occupied.buffer)
+        return occupied.exceeding(self.capacities)
+
+    def rebuild(self) -> OccupancyMatrix:
+        """
+        Rebuilds the occupancy from the latest snapshot and the tail of events.
+
+        :return: A new matrix of the occupied compartments.
+        """
+        with self._lock:
+            matrix = OccupancyMatrix(self._occupied.locker_ids)
+            matrix.buffer = array("q", self._snapshot.counts)
+            for event in self._tail:
+                matrix.add(event.locker_id, event.size, event.event_type.delta)
+            return matrix
+
+    def flush(self) -> None:
+        """
+        Writes the buffered events to the log file.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self) -> None:
+        """
+        Takes a final snapshot and closes the log file.
+        """
+        with self._lock:
+            if self._file is not None:
+                self.snapshot()
+                self._file.close()
+                self._file = None
+
+    def _apply(self, event: OccupancyEvent) -> None:
+        """
+        Applies an event to the live occupancy and appends it to the tail, logging impossible states.
+        """
+        self._occupied.add(event.locker_id, event.size, event.event_type.delta)
+        self._tail.append(event)
+        self._sequence = event.sequence
+        occupied = self._occupied.row(event.locker_id)[event.size]
+        if occupied < 0 or occupied > self.capacities.row(event.locker_id)[event.size]:
+            logging.error(
+                f"Locker {event.locker_id} has {occupied} occupied {event.size.value} compartments "
+                f"after event {event.sequence} ({event.event_type.value})"
+            )
+
+    def _write_snapshot(self, snapshot: OccupancySnapshot) -> None:
+        """
+        Writes a snapshot next to the log file, replacing the previous one atomically.
+        """
+        lockers = {
+            locker_id: snapshot.counts[row * SIZE_COUNT:(row + 1) * SIZE_COUNT].tolist()
+            for row, locker_id in enumerate(self._occupied.locker_ids)
+        }
+        target = self.snapshot_path(str(self.path))
+        temporary = f"{target}.tmp"
+        with open(temporary, "w", encoding="utf8") as file:
+            json.dump({"sequence": snapshot.sequence, "offset": snapshot.offset, "lockers": lockers}, file)
+        os.replace(temporary, target)
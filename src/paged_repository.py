@@ -0,0 +1,265 @@
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Hashable, Iterator, Self, Sequence, overload
+from src.converter import Converter
+from src.file_service import AbstractFileReader
+from src.serializer import ModelSerializer
+from src.validator import AbstractValidator
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+
+logging.basicConfig(level=logging.INFO)
+
+
+def _key_text(key: Hashable) -> str:
+    """
+    Encodes a key for the on-disk key index.
+    """
+    return json.dumps(key, default=str)
+
+
+def _release(connection: sqlite3.Connection | None, paths: list[str]) -> None:
+    """
+    Closes the key index and deletes the given files. Runs on `close` or when the repository is
+    garbage collected, so it must not refer to the repository itself.
+    """
+    if connection is not None:
+        connection.close()
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@dataclass(eq=False)
+class PagedDataRepository[T, U](Sequence[U]):
+    """
+    A repository for datasets larger than memory, backing `LoadMode.PAGED` of the data repositories.
+    The validated and converted records are spilled to an on-disk JSON lines store split into pages
+    of `page_size` records, and only the `max_pages` most recently used pages are kept in memory.
+
+    The store is indexed by the byte offset of every page, so fetching a page is a single seek, and
+    the positions of the keys are kept in an SQLite index next to the store (`<store_path>.keys`),
+    so the keys are not held in memory either. Sources must be JSON lines files, which are streamed.
+
+    The repository is a read-only sequence of its records. The key index, and the store if it is a
+    temporary file, are deleted by `close`, when leaving a `with` block, or at the latest when the
+    repository is garbage collected.
+
+    Args:
+        file_reader (AbstractFileReader[T]): The file reader for reading raw data.
+        validator (AbstractValidator[T]): The validator for validating the raw data.
+        converter (Converter[T, U]): The converter for converting raw data, also used for pages read back.
+        filename (str | None): The JSON lines file to load data from (can be None).
+        page_size (int): The number of records per page.
+        max_pages (int): The maximum number of pages kept in memory.
+        store_path (str | None): The path of the page store; a temporary file is used if None.
+        key_field (str | None): The attribute to look records up by with `find`, if any.
+    """
+    file_reader: AbstractFileReader[T]
+    validator: AbstractValidator[T]
+    converter: Converter[T, U]
+    filename: str | None
+    page_size: int = 1024
+    max_pages: int = 8
+    store_path: str | None = None
+    key_field: str | None = None
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _count: int = field(default=0, init=False, repr=False)
+    _offsets: array = field(default_factory=lambda: array("q"), init=False, repr=False)
+    _keys: sqlite3.Connection | None = field(default=None, init=False, repr=False)
+    _pages: OrderedDict[int, list[U]] = field(default_factory=OrderedDict, init=False, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+    _finalizer: weakref.finalize | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """
+        Checks that a valid filename and page sizes are provided, then loads the data into the page store.
+        """
+        if self.filename is None:
+            raise ValueError("No filename set")
+        if self.page_size < 1 or self.max_pages < 1:
+            raise ValueError("page_size and max_pages must be positive")
+        files = []
+        if self.store_path is None:
+            descriptor, self.store_path = tempfile.mkstemp(prefix="pages-", suffix=".jsonl")
+            os.close(descriptor)
+            files.append(self.store_path)
+        if self.key_field is not None:
+            keys_path = f"{self.store_path}.keys"
+            if os.path.exists(keys_path):
+                os.remove(keys_path)
+            self._keys = sqlite3.connect(keys_path, check_same_thread=False)
+            files.append(keys_path)
+        self._finalizer = weakref.finalize(self, _release, self._keys, files)
+        try:
+            self.refresh_data()
+        except BaseException:
+            self.close()
+            raise
+
+    def refresh_data(self, filename: str | None = None) -> int:
+        """
+        Reads, validates and converts the data from the given file and rewrites the page store.
+        Records are streamed to the store, so at most one page of converted records and of keys
+        is held at a time.
+
+        :param filename: Optional custom filename for refreshing data.
+        :return: The number of stored records.
+        :raises ValueError: If the file is not a JSON lines file, which could not be streamed.
+        """
+        filename = str(filename if filename is not None else self.filename)
+        if not filename.endswith('.jsonl'):
+            raise ValueError(f"Paged data must be read from a JSON lines file, got {filename}")
+        logging.info(f"Paging data from {filename} into {self.store_path}...")
+
+        offsets = array("q")
+        keys: list[tuple[str, int]] = []
+        serializer: ModelSerializer[U] | None = None
+        position = 0
+        offset = 0
+        with self._lock, open(str(self.store_path), "wb") as store:
+            if self._keys is not None:
+                self._keys.execute("DROP TABLE IF EXISTS keys")
+                self._keys.execute("CREATE TABLE keys (key TEXT PRIMARY KEY, position INTEGER NOT NULL) WITHOUT ROWID")
+            for entry in self.file_reader.iter_read(filename):
+                if not self.validator.validate(entry):
+                    logging.error(f"Invalid entry: {entry}")
+                    continue
+                record = self.converter.convert(entry)
+                if serializer is None:
+                    serializer = ModelSerializer(type(record))
+                if position % self.page_size == 0:
+                    offsets.append(offset)
+                    self._store_keys(keys)
+                if self.key_field is not None:
+                    keys.append((_key_text(getattr(record, self.key_field)), position))
+                line = (serializer.encode(record) + "\n").encode("utf8")
+                store.write(line)
+                offset += len(line)
+                position += 1
+            self._store_keys(keys)
+            if self._keys is not None:
+                self._keys.commit()
+
+            self._offsets = offsets
+            self._count = position
+            self._pages.clear()
+        return position
+
+    def _store_keys(self, keys: list[tuple[str, int]]) -> None:
+        """
+        Writes a batch of (key, position) pairs to the key index, later positions replacing earlier
+        ones like a dictionary would, and empties the batch.
+
+        :param keys: The encoded keys and their positions.
+        """
+        if self._keys is not None and keys:
+            self._keys.executemany("INSERT OR REPLACE INTO keys VALUES (?, ?)", keys)
+        keys.clear()
+
+    def get_data(self) -> Iterator[U]:
+        """
+        Iterates over all records page by page.
+
+        :return: An iterator of the records in load order.
+        """
+        for number in range(len(self._offsets)):
+            yield from self.page(number)
+
+    def page(self, number: int) -> list[U]:
+        """
+        Returns a page of records, reading it from the store if it is not in memory.
+        The least recently used page is evicted when more than `max_pages` pages are loaded.
+
+        :param number: The page number.
+        :return: The records of the page.
+        """
+        with self._lock:
+            page = self._pages.get(number)
+            if page is not None:
+                self.hits += 1
+                self._pages.move_to_end(number)
+                return page
+
+            self.misses += 1
+            page = self._read_page(number)
+            self._pages[number] = page
+            if len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+            return page
+
+    def find(self, key: Hashable) -> U | None:
+        """
+        Looks a record up by its key field.
+
+        :param key: The value of the key field.
+        :return: The record, or None if there is none or no key field is set.
+        """
+        if self._keys is None:
+            return None
+        with self._lock:
+            row = self._keys.execute("SELECT position FROM keys WHERE key = ?", (_key_text(key),)).fetchone()
+        return None if row is None else self[row[0]]
+
+    def close(self) -> None:
+        """
+        Drops the loaded pages, closes the key index and deletes it, along with the page store if
+        it is a temporary file.
+        """
+        with self._lock:
+            self._pages.clear()
+            if self._finalizer is not None:
+                self._finalizer()
+
+    def _read_page(self, number: int) -> list[U]:
+        """
+        Reads and converts a page from the store.
+
+        :param number: The page number.
+        :return: The records of the page.
+        """
+        if not 0 <= number < len(self._offsets):
+            raise IndexError(f"Page {number} out of range")
+        size = min(self.page_size, self._count - number * self.page_size)
+        with open(str(self.store_path), "rb") as store:
+            store.seek(self._offsets[number])
+            return [self.converter.convert(json.loads(store.readline())) for _ in range(size)]
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_value: BaseException | None,
+            traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+    @overload
+    def __getitem__(self, position: int) -> U: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> list[U]: ...
+
+    def __getitem__(self, position: int | slice) -> U | list[U]:
+        if isinstance(position, slice):
+            return [self[index] for index in range(*position.indices(self._count))]
+        if not 0 <= position < self._count:
+            raise IndexError(f"Record {position} out of range")
+        page, slot = divmod(position, self.page_size)
+        return self.page(page)[slot]
+
+    def __iter__(self) -> Iterator[U]:
+        return self.get_data()
+
+    def __len__(self) -> int:
+        return self._count
@@ -0,0 +1,251 @@
+from bisect import bisect_right
+from itertools import accumulate, chain, compress, count, repeat
+from math import isqrt
+from operator import eq, is_
+from typing import Any, Iterable, Iterator, Mapping, MutableMapping, Sequence, overload
+
+CHUNK_SIZE = 64
+
+_REMOVED: Any = object()
+
+
+class PersistentList[V](Sequence[V]):
+    """
+    An immutable list stored as a sequence of small chunks. Modifications return a new list
+    that shares every untouched chunk with the original one, so publishing a new version of a
+    large list after changing a few items only copies the affected chunks and the chunk directory.
+    """
+    __slots__ = ("_chunks", "_starts", "_length")
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(self, chunks: tuple[tuple[V, ...], ...] = ()) -> None:
+        """
+        Initializes the list from its chunks.
+
+        :param chunks: The non-empty chunks of items, in order.
+        """
+        self._chunks = chunks
+        self._starts = [0, *accumulate(map(len, chunks))]
+        self._length = self._starts[-1]
+
+    @classmethod
+    def of(cls, items: Iterable[V]) -> "PersistentList[V]":
+        """
+        Returns the items as a persistent list, without copying them if they already are one.
+
+        :param items: The items of the list.
+        :return: A PersistentList of the items.
+        """
+        if isinstance(items, PersistentList):
+            return items
+        items = tuple(items)
+        return cls(tuple(items[start:start + CHUNK_SIZE] for start in range(0, len(items), CHUNK_SIZE)))
+
+    def _locate(self, position: int) -> tuple[int, int]:
+        """
+        Returns the chunk holding an item and the position of the item in the chunk.
+        """
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("PersistentList index out of range")
+        chunk = bisect_right(self._starts, position) - 1
+        return chunk, position - self._starts[chunk]
+
+    def _with_chunk(self, chunk: int, items: tuple[V, ...]) -> "PersistentList[V]":
+        """
+        Returns a new list with one chunk replaced, or removed when `items` is empty.
+        """
+        replacement = (items,) if items else ()
+        return PersistentList(self._chunks[:chunk] + replacement + self._chunks[chunk + 1:])
+
+    def set(self, position: int, value: V) -> "PersistentList[V]":
+        """
+        Returns a new list with the item at the given position replaced.
+
+        :param position: The position of the item.
+        :param value: The new item.
+        :return: The new list.
+        """
+        chunk, offset = self._locate(position)
+        items = self._chunks[chunk]
+        return self._with_chunk(chunk, items[:offset] + (value,) + items[offset + 1:])
+
+    def insert(self, position: int, value: V) -> "PersistentList[V]":
+        """
+        Returns a new list with an item inserted before the given position. Full chunks are split.
+
+        :param position: The position of the new item; the length of the list appends it.
+        :param value: The new item.
+        :return: The new list.
+        """
+        if position >= self._length or not self._chunks:
+            if self._chunks and len(self._chunks[-1]) < CHUNK_SIZE:
+                return self._with_chunk(len(self._chunks) - 1, self._chunks[-1] + (value,))
+            return PersistentList(self._chunks + ((value,),))
+
+        chunk, offset = self._locate(position)
+        items = self._chunks[chunk]
+        items = items[:offset] + (value,) + items[offset:]
+        if len(items) <= CHUNK_SIZE:
+            return self._with_chunk(chunk, items)
+        half = len(items) // 2
+        return PersistentList(self._chunks[:chunk] + (items[:half], items[half:]) + self._chunks[chunk + 1:])
+
+    def append(self, value: V) -> "PersistentList[V]":
+        """
+        Returns a new list with an item added at the end.
+
+        :param value: The new item.
+        :return: The new list.
+        """
+        return self.insert(self._length, value)
+
+    def delete(self, position: int) -> "PersistentList[V]":
+        """
+        Returns a new list without the item at the given position.
+
+        :param position: The position of the item.
+        :return: The new list.
+        """
+        chunk, offset = self._locate(position)
+        items = self._chunks[chunk]
+        return self._with_chunk(chunk, items[:offset] + items[offset + 1:])
+
+    def find(self, value: V) -> int:
+        """
+        Returns the position of the given object, compared by identity.
+
+        :param value: The object to look for.
+        :return: Its position in the list.
+        :raises ValueError: If the object is not in the list.
+        """
+        for start, items in zip(self._starts, self._chunks):
+            found = next(compress(count(start), map(is_, items, repeat(value))), None)
+            if found is not None:
+                return found
+        raise ValueError("Object not in PersistentList")
+
+    @overload
+    def __getitem__(self, position: int) -> V: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> list[V]: ...
+
+    def __getitem__(self, position: int | slice) -> V | list[V]:
+        if isinstance(position, slice):
+            start, stop, step = position.indices(self._length)
+            if step != 1:
+                return list(self)[position]
+            if start >= stop:
+                return []
+            first, offset = self._locate(start)
+            last, end = self._locate(stop - 1)
+            if first == last:
+                return list(self._chunks[first][offset:end + 1])
+            return [
+                *self._chunks[first][offset:],
+                *chain.from_iterable(self._chunks[first + 1:last]),
+                *self._chunks[last][:end + 1]
+            ]
+        chunk, offset = self._locate(position)
+        return self._chunks[chunk][offset]
+
+    def __iter__(self) -> Iterator[V]:
+        return chain.from_iterable(self._chunks)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(map(eq, self, other))
+
+    def __repr__(self) -> str:
+        return f"PersistentList({list(self)!r})"
+
+
+class OverlayDict[K, V](MutableMapping[K, V]):
+    """
+    A dictionary made of a shared base dictionary that is never modified and a small delta of the
+    changes made on top of it. Copies share the base and only copy the delta, which is merged into
+    a new base once it grows past the square root of the base size, so the cost of copying stays
+    bounded while lookups cost at most two dictionary lookups.
+
+    Iteration follows the order of the base, with changed keys in place and new keys at the end.
+    """
+    __slots__ = ("_base", "_delta", "_length")
+
+    def __init__(self, base: Mapping[K, V] | None = None) -> None:
+        """
+        Initializes the dictionary over a base dictionary, without copying it.
+        The base must not be modified afterwards.
+
+        :param base: The initial content.
+        """
+        self._base: dict[K, V] = base if isinstance(base, dict) else dict(base.items() if base else ())
+        self._delta: dict[K, V] = {}
+        self._length = len(self._base)
+
+    def copy(self) -> "OverlayDict[K, V]":
+        """
+        Returns an independent copy sharing the base dictionary.
+        """
+        clone = object.__new__(OverlayDict)
+        clone._base = self._base
+        clone._delta = dict(self._delta)
+        clone._length = self._length
+        return clone
+
+    def _compact(self) -> None:
+        """
+        Merges the delta into a new base dictionary.
+        """
+        merged = {key: self._delta.get(key, value) for key, value in self._base.items()}
+        merged.update(self._delta)
+        self._base = {key: value for key, value in merged.items() if value is not _REMOVED}
+        self._delta = {}
+
+    def __getitem__(self, key: K) -> V:
+        if key not in self._delta:
+            return self._base[key]
+        value = self._delta[key]
+        if value is _REMOVED:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._delta:
+            return self._delta[key] is not _REMOVED  # type: ignore[index]
+        return key in self._base
+
+    def __setitem__(self, key: K, value: V) -> None:
+        if key not in self:
+            self._length += 1
+        self._delta[key] = value
+        if len(self._delta) > max(CHUNK_SIZE, isqrt(len(self._base))):
+            self._compact()
+
+    def __delitem__(self, key: K) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._length -= 1
+        if key in self._base:
+            self._delta[key] = _REMOVED
+        else:
+            del self._delta[key]
+
+    def __iter__(self) -> Iterator[K]:
+        if not self._delta:
+            return iter(self._base)
+        return chain(
+            (key for key in self._base if self._delta.get(key) is not _REMOVED),
+            (key for key, value in self._delta.items() if value is not _REMOVED and key not in self._base)
+        )
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"OverlayDict({dict(self.items())!r})"
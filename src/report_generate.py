@@ -1,5 +1,5 @@
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from src.service import PurchaseSummaryService
 
 logging.basicConfig(level=logging.DEBUG)
@@ -19,17 +19,19 @@ class ReportGenerator:
         Generates the entire report and saves it to a specified file path.
 
         This method calls various internal methods to generate sections of the report
-        and writes them to a file.
+        and writes them to a file. All sections read the same pinned repository versions,
+        so a refresh during the report does not make sections disagree.
 
         Args:
             path (str): The file path where the report will be saved.
         """
+        report = replace(self, service=self.service.pinned())
         with open(path, "w") as file:
-            file.write(self._generate_parcel_sizes_section())
-            file.write(self._generate_locker_usage_section())
-            file.write(self._generate_popular_sizes_section())
-            file.write(self._generate_farthest_users_section())
-            file.write(self._generate_longest_delivery_section())
+            file.write(report._generate_parcel_sizes_section())
+            file.write(report._generate_locker_usage_section())
+            file.write(report._generate_popular_sizes_section())
+            file.write(report._generate_farthest_users_section())
+            file.write(report._generate_longest_delivery_section())
 
         print(f"Report has been saved to file: {path}")
 
@@ -1,9 +1,24 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from collections import Counter, deque
+from datetime import date
+from enum import Enum
+from typing import Any, Callable, ClassVar, Hashable, Iterator, Mapping, Sequence, override
+import hashlib
 import logging
+import os
+import sys
+import threading
+import time
+import weakref
 
 from src.file_service import AbstractFileReader, AbstractFileWriter
+from src.index import Index, MultiIndex, PartitionIndex, SortedIndex, UniqueIndex
+from src.join import JoinCondition, JoinEngine
+from src.paged_repository import PagedDataRepository
+from src.load_stats import LoadStats, traced_memory
+from src.persistent import OverlayDict, PersistentList
+from src.serializer import write_models
 from src.validator import AbstractValidator
 from src.converter import Converter
 from src.model import (
@@ -21,7 +36,92 @@ from src.model import (
 
 logging.basicConfig(level=logging.INFO)
 
-UsersWithPurchaseDelivers = dict[Users, dict[Delivers, int]]
+UsersWithPurchaseDelivers = Mapping[Users, dict[Delivers, int]]
+SourceState = tuple[int, int]
+
+
+class LoadMode(Enum):
+    """
+    Enum representing when a repository loads its data.
+
+    Values:
+        EAGER: The data is loaded when the repository is created.
+        LAZY: The data is loaded on first access to the data or an index.
+        MANUAL: The data is loaded by an explicit `refresh` or published by a loader.
+        PAGED: The data is loaded on creation into an on-disk `PagedDataRepository`, for sources
+            larger than memory; it is read-only and no indexes are built.
+    """
+    EAGER = "eager"
+    LAZY = "lazy"
+    MANUAL = "manual"
+    PAGED = "paged"
+
+
+class DuplicatePolicy(Enum):
+    """
+    Enum representing how a load resolves entries sharing a key.
+
+    Values:
+        FIRST_WINS: The first entry is kept and later ones are dropped.
+        LAST_WINS: The last valid entry is kept, in the position of the first one, like a dictionary would.
+        ERROR: The load fails.
+        MERGE: The entries are combined with `merge_entries`, in the position of the first one.
+    """
+    FIRST_WINS = "first_wins"
+    LAST_WINS = "last_wins"
+    ERROR = "error"
+    MERGE = "merge"
+
+
+@dataclass(frozen=True)
+class ChangeSet[U]:
+    """
+    The difference between two consecutive loads of a repository, keyed by the repository key field.
+
+    Args:
+        added (list[U]): Records that were not present before.
+        changed (list[tuple[U, U]]): Pairs of (old, new) records whose source entry changed.
+        removed (list[U]): Records that are no longer present.
+    """
+    added: list[U] = field(default_factory=list)
+    changed: list[tuple[U, U]] = field(default_factory=list)
+    removed: list[U] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+@dataclass(frozen=True)
+class RepositorySnapshot[T, U]:
+    """
+    An immutable state of a repository: the loaded data together with its indexes.
+
+    A refresh builds a new snapshot next to the current one and publishes it with a single
+    reference swap, so readers holding a snapshot never block and never see a partial load.
+    Snapshots published by `add`, `update` and `remove` share their unchanged data, records
+    and index entries with the previous snapshot instead of copying them.
+
+    Args:
+        data (Sequence[U]): The processed data, a list after a load and a persistent list after a change,
+            or a `PagedDataRepository` in `LoadMode.PAGED`.
+        records (Mapping[Hashable, tuple[T, U]]): The raw and converted records by key.
+        unique (dict[str, UniqueIndex[Any, U]]): The unique indexes by attribute.
+        multi (dict[str, MultiIndex[Any, U]]): The multi-valued indexes by attribute.
+        sorted (dict[str, SortedIndex[Any, U]]): The sorted range indexes by attribute.
+        partitions (dict[str, PartitionIndex[Any, U]]): The partition indexes by partitioning attribute.
+        version (int): Incremented every time a refresh changes the data.
+        change_set (ChangeSet[U]): The changes from the previous snapshot.
+        source (tuple[str, SourceState, str] | None): The file, its size and mtime, and its digest.
+    """
+    data: Sequence[U] = field(default_factory=list)
+    records: Mapping[Hashable, tuple[T, U]] = field(default_factory=dict)
+    unique: dict[str, UniqueIndex[Any, U]] = field(default_factory=dict)
+    multi: dict[str, MultiIndex[Any, U]] = field(default_factory=dict)
+    sorted: dict[str, SortedIndex[Any, U]] = field(default_factory=dict)
+    partitions: dict[str, PartitionIndex[Any, U]] = field(default_factory=dict)
+    version: int = 0
+    change_set: ChangeSet[U] = field(default_factory=lambda: ChangeSet[U]())
+    source: tuple[str, SourceState, str] | None = None
 
 
 @dataclass
@@ -30,40 +130,273 @@ class AbstractDataRepository[T, U](ABC):
     Abstract repository class for managing data from files. This class handles reading data,
     validating, converting, and caching the processed data.
 
+    Refreshes are incremental: a source whose size, modification time and content hash are
+    unchanged is not read again, and entries whose raw data did not change keep their already
+    validated and converted record. Subclasses declare `key_field` to identify records between loads,
+    and the attributes to keep unique (`unique_indexes`), multi-valued (`multi_indexes`), sorted
+    range (`sorted_indexes`) and partition (`partition_indexes`, by period of `partition_date_field`)
+    indexes on.
+    Indexes are maintained on refresh and shared by all consumers of the repository.
+
+    The data and indexes are published together as an immutable `RepositorySnapshot`. Refreshes are
+    serialized by a writer lock, while readers only dereference the current snapshot. Readers pin a
+    version by holding its snapshot, which can also be looked up by version while pinned. An optional
+    background thread (`start_auto_reload`) refreshes the repository when its source file changes.
+
+    Records can be added, updated and removed in memory. With a file writer, changes are written
+    back to the source file in batches, once `flush_size` changes are pending or the oldest pending
+    change is `flush_interval` seconds old; a timer enforces the interval even when no other change
+    or refresh follows. Only the changed keys are written through: every other
+    entry of the file, including entries rejected by the validator, is kept as it is.
+
     Args:
         file_reader (AbstractFileReader[T]): The file reader for reading raw data.
         validator (AbstractValidator[T]): The validator for validating the raw data.
         converter (Converter[T, U]): The converter for converting the raw data into a usable form.
         filename (str | None): The filename to load data from (can be None).
         _data (list[U]): Cached list of processed data (initialized as empty).
+        load_mode (LoadMode): When the data is loaded, eagerly on creation by default.
+        file_writer (AbstractFileWriter[T] | None): The writer flushing changes to the source file, if any.
+        flush_size (int): The number of pending changes that triggers a flush.
+        flush_interval (float | None): The age in seconds of the oldest pending change that triggers a flush.
+        trace_memory (bool): Whether loads record their peak memory in `load_stats`, which slows them down.
+        duplicate_policy (DuplicatePolicy): How entries sharing a key are resolved on load.
+        page_size (int): The number of records per page in `LoadMode.PAGED`.
+        max_pages (int): The maximum number of pages kept in memory in `LoadMode.PAGED`.
     """
+    key_field: ClassVar[str | None] = None
+    history_size: ClassVar[int] = 32
+    unique_indexes: ClassVar[tuple[str, ...]] = ()
+    multi_indexes: ClassVar[tuple[str, ...]] = ()
+    sorted_indexes: ClassVar[tuple[str, ...]] = ()
+    partition_indexes: ClassVar[tuple[str, ...]] = ()
+    partition_date_field: ClassVar[str | None] = None
+    partition_months: ClassVar[int] = 1
+
     file_reader: AbstractFileReader[T]
     validator: AbstractValidator[T]
     converter: Converter[T, U]
     filename: str | None
     _data: list[U] = field(default_factory=list)
+    load_mode: LoadMode = LoadMode.EAGER
+    file_writer: AbstractFileWriter[T] | None = None
+    flush_size: int = 100
+    flush_interval: float | None = None
+    trace_memory: bool = False
+    duplicate_policy: DuplicatePolicy = DuplicatePolicy.LAST_WINS
+    page_size: int = 1024
+    max_pages: int = 8
+    _snapshot: RepositorySnapshot[T, U] = field(
+        default_factory=lambda: RepositorySnapshot[T, U](), init=False, repr=False
+    )
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False, compare=False)
+    _reload_thread: threading.Thread | None = field(default=None, init=False, repr=False, compare=False)
+    _reload_stop: threading.Event = field(default_factory=threading.Event, init=False, repr=False, compare=False)
+    _load_pending: bool = field(default=False, init=False, repr=False, compare=False)
+    _history: deque[tuple[int, ChangeSet[U]]] = field(default_factory=deque, init=False, repr=False, compare=False)
+    _pinned: weakref.WeakValueDictionary[int, RepositorySnapshot[T, U]] = field(
+        default_factory=weakref.WeakValueDictionary, init=False, repr=False, compare=False
+    )
+    _pending_writes: int = field(default=0, init=False, repr=False, compare=False)
+    _pending_keys: set[Hashable] = field(default_factory=set, init=False, repr=False, compare=False)
+    _load_stats: LoadStats | None = field(default=None, init=False, repr=False, compare=False)
+    _first_pending: float = field(default=0.0, init=False, repr=False, compare=False)
+    _flush_timer: threading.Timer | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """
         Initializes the repository and checks that a valid filename is provided.
-        If no filename is given, raises an error. Then, it refreshes data from the file.
+        If no filename is given, raises an error. Then, for eager repositories, it refreshes data
+        from the file; lazy repositories defer it to the first access.
         """
         if self.filename is None:
             raise ValueError("No filename set")
-        self.refresh_data(str(self.filename))
+        if self.load_mode in (LoadMode.EAGER, LoadMode.PAGED):
+            self.refresh_data(str(self.filename))
+        elif self.load_mode is LoadMode.LAZY:
+            self._load_pending = True
+
+    def _current(self) -> RepositorySnapshot[T, U]:
+        """
+        Returns the current snapshot, loading a lazy repository first. Concurrent first callers
+        wait for a single load instead of each triggering their own.
+
+        Returns:
+            RepositorySnapshot[T, U]: The current snapshot.
+        """
+        if self._load_pending:
+            with self._lock:
+                if self._load_pending:
+                    logging.info(f"Loading {self.filename} on first access...")
+                    self.refresh()
+        return self._snapshot
+
+    @property
+    def data(self) -> Sequence[U]:
+        """
+        The data of the current snapshot.
+        """
+        return self._current().data
+
+    @data.setter
+    def data(self, data: Sequence[U]) -> None:
+        """
+        Publishes the given data as a new snapshot, rebuilding the indexes.
+        """
+        with self._lock:
+            current = self._snapshot
+            records = {key: (None, record) for record in data if (key := self._record_key(record)) is not None}
+            self._publish(self._next_snapshot(current, list(data), records, current.source))  # type: ignore[arg-type]
+
+    @property
+    def load_stats(self) -> LoadStats | None:
+        """
+        The timings and counters of the latest load, or None if nothing was loaded yet.
+        """
+        return self._load_stats
+
+    @property
+    def version(self) -> int:
+        """
+        The version of the current snapshot, incremented every time a refresh changes the data.
+        """
+        return self._current().version
+
+    @property
+    def last_change_set(self) -> ChangeSet[U]:
+        """
+        The changes applied by the latest refresh.
+        """
+        return self._current().change_set
+
+    def changes_since(self, version: int) -> list[ChangeSet[U]] | None:
+        """
+        Returns the change sets published after the given version, oldest first, so that derived
+        data can be updated instead of rebuilt. Only the latest `history_size` change sets are kept.
+
+        Args:
+            version (int): The version the caller is up to date with.
+
+        Returns:
+            list[ChangeSet[U]] | None: The change sets, or None if they are no longer all available.
+        """
+        current = self._current().version
+        if version == current:
+            return []
+        changes = [(number, change_set) for number, change_set in list(self._history) if number > version]
+        if not changes or changes[0][0] != version + 1 or changes[-1][0] != current:
+            return None
+        return [change_set for _, change_set in changes]
 
-    def get_data(self) -> list[U]:
+    def snapshot(self, version: int | None = None) -> RepositorySnapshot[T, U]:
+        """
+        Returns the current snapshot, or the snapshot of an older version that is still pinned,
+        i.e. still referenced by some reader. A snapshot stays consistent while the repository
+        keeps refreshing.
+
+        Args:
+            version (int | None): The version to return, the current one if None.
+
+        Returns:
+            RepositorySnapshot[T, U]: The data and indexes of the version.
+
+        Raises:
+            KeyError: If the version is no longer pinned by any reader.
+        """
+        current = self._current()
+        if version is None or version == current.version:
+            return current
+        return self._pinned[version]
+
+    def get_data(self) -> Sequence[U]:
         """
         Retrieves the cached data. Logs a warning if no data is available.
 
+        The data belongs to the current snapshot and must not be modified: it is a list after a
+        load and a `PersistentList` after `add`, `update` or `remove`. Use those methods to change it.
+
         Returns:
-            list[U]: The processed data list.
+            Sequence[U]: The processed data, read-only.
         """
         if not self.data:
             logging.warning("No data available in cache")
         return self.data
 
-    def refresh_data(self, filename: str | None = None) -> list[U]:
+    def unique_index(self, field_name: str) -> UniqueIndex[Any, U]:
+        """
+        Returns the unique index declared on the given attribute.
+
+        Args:
+            field_name (str): The indexed attribute.
+
+        Returns:
+            UniqueIndex[Any, U]: The index mapping every key to its record.
+
+        Raises:
+            KeyError: If no unique index is declared on the attribute.
+        """
+        return self._current().unique[field_name]
+
+    def multi_index(self, field_name: str) -> MultiIndex[Any, U]:
+        """
+        Returns the multi-valued index declared on the given attribute.
+
+        Args:
+            field_name (str): The indexed attribute.
+
+        Returns:
+            MultiIndex[Any, U]: The index mapping every key to its records.
+
+        Raises:
+            KeyError: If no multi-valued index is declared on the attribute.
+        """
+        return self._current().multi[field_name]
+
+    def sorted_index(self, field_name: str) -> SortedIndex[Any, U]:
+        """
+        Returns the sorted range index declared on the given attribute.
+
+        Args:
+            field_name (str): The indexed attribute.
+
+        Returns:
+            SortedIndex[Any, U]: The index ordering the records by the attribute.
+
+        Raises:
+            KeyError: If no sorted index is declared on the attribute.
+        """
+        return self._current().sorted[field_name]
+
+    def partition_index(self, field_name: str) -> PartitionIndex[Any, U]:
+        """
+        Returns the partition index declared on the given attribute.
+
+        Args:
+            field_name (str): The partitioning attribute.
+
+        Returns:
+            PartitionIndex[Any, U]: The index partitioning the records by the attribute and period.
+
+        Raises:
+            KeyError: If no partition index is declared on the attribute.
+        """
+        return self._current().partitions[field_name]
+
+    def export(self, filename: str, lines: bool = False) -> int:
+        """
+        Writes a snapshot of the cached data to a file in a single pass.
+
+        Args:
+            filename (str): The path of the file to write.
+            lines (bool): Writes JSON lines instead of a JSON array when True.
+
+        Returns:
+            int: The number of exported records.
+        """
+        logging.info(f"Exporting data to {filename}...")
+        return write_models(filename, self.data, lines=lines)
+
+    def refresh_data(self, filename: str | None = None) -> Sequence[U]:
         """
         Refreshes the cached data by reprocessing the data from the given filename.
         If no filename is provided, uses the default filename.
@@ -72,40 +405,728 @@ class AbstractDataRepository[T, U](ABC):
             filename (str | None): Optional custom filename for refreshing data.
 
         Returns:
-            list[U]: The newly processed data.
+            Sequence[U]: The newly processed data, read-only (see `get_data`).
         """
         if filename is None:
             logging.warning("No filename provided, using default filename")
             filename = self.filename
 
-        logging.info(f"Refreshing data from {self.filename}...")
-        self.data = self._process_data(str(self.filename))
+        self.refresh(str(filename))
         logging.debug(self.data)
         return self.data
 
-    def _process_data(self, filename: str) -> list[U]:
+    def refresh(self, filename: str | None = None, force: bool = False) -> ChangeSet[U]:
+        """
+        Reloads the data if the source changed and returns the applied changes.
+
+        The source is skipped when its size and modification time are unchanged, or when its
+        content hash is unchanged. Sources that cannot be inspected on disk are always reloaded.
+        The new data and indexes are built aside and published as a new snapshot.
+
+        Args:
+            filename (str | None): The file to load, defaults to the repository filename.
+            force (bool): If True, reloads even if the source looks unchanged.
+
+        Returns:
+            ChangeSet[U]: The added, changed and removed records; empty if nothing changed.
+        """
+        filename = str(filename if filename is not None else self.filename)
+        with self._lock:
+            if self._pending_writes and self.file_writer is not None:
+                self.flush()
+            current = self._snapshot
+            source = current.source
+            state = self.source_state(filename)
+            digest = None
+            if state is not None and not force and source is not None and source[0] == filename:
+                if source[1] == state:
+                    logging.debug(f"Data in {filename} is unchanged, skipping refresh")
+                    return ChangeSet()
+                digest = self.source_digest(filename)
+                if source[2] == digest:
+                    logging.info(f"Content of {filename} is unchanged, skipping refresh")
+                    self._publish(replace(current, source=(filename, state, digest)))
+                    return ChangeSet()
+
+            if state is not None and digest is None:
+                digest = self.source_digest(filename)
+            if self.load_mode is LoadMode.PAGED:
+                return self._refresh_paged(filename, state, digest)
+            logging.info(f"Refreshing data from {filename}...")
+            stats = LoadStats(filename)
+            start = time.perf_counter()
+            with traced_memory(stats, self.trace_memory):
+                data, records = self._process_data(filename, current.records, stats)
+                change_set = self.publish_processed(filename, data, records, state, digest, stats)
+            stats.total_seconds = time.perf_counter() - start
+            logging.info(f"Loaded {stats}")
+            return change_set
+
+    def _refresh_paged(self, filename: str, state: SourceState | None, digest: str | None) -> ChangeSet[U]:
+        """
+        Pages the source into a new on-disk store and publishes it as the data of the next snapshot,
+        without records or indexes. The change history is cleared, so consumers rebuild instead of
+        applying changes. The previous store is deleted once no snapshot refers to it anymore.
+
+        Args:
+            filename (str): The JSON lines file to load.
+            state (SourceState | None): The size and mtime of the file before it was read, if known.
+            digest (str | None): The digest of the file content before it was read, if known.
+
+        Returns:
+            ChangeSet[U]: An empty change set, as changes are not tracked in paged mode.
+        """
+        logging.info(f"Paging data from {filename}...")
+        stats = LoadStats(filename)
+        start = time.perf_counter()
+        data = PagedDataRepository(
+            self.file_reader, self.validator, self.converter, filename,
+            page_size=self.page_size, max_pages=self.max_pages, key_field=self.key_field
+        )
+        stats.valid = len(data)
+        source = None if state is None else (filename, state, digest or self.source_digest(filename))
+        self._publish(RepositorySnapshot(data=data, version=self._snapshot.version + 1, source=source))
+        self._history.clear()
+        stats.total_seconds = time.perf_counter() - start
+        self._load_stats = stats
+        logging.info(f"Loaded {stats}")
+        return ChangeSet()
+
+    def publish_processed(
+            self,
+            filename: str,
+            data: list[U],
+            records: dict[Hashable, tuple[T, U]],
+            state: SourceState | None = None,
+            digest: str | None = None,
+            stats: LoadStats | None = None
+    ) -> ChangeSet[U]:
+        """
+        Publishes data that was read, validated and converted elsewhere (e.g. by a loader in
+        another process) as the next snapshot.
+
+        Args:
+            filename (str): The file the data was loaded from.
+            data (list[U]): The processed data.
+            records (dict[Hashable, tuple[T, U]]): The raw and converted records by key.
+            state (SourceState | None): The size and mtime of the file before it was read, if known.
+            digest (str | None): The digest of the file content before it was read, if known.
+            stats (LoadStats | None): The statistics of the load, completed with the publishing time.
+
+        Returns:
+            ChangeSet[U]: The changes from the previous snapshot.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            if state is None:
+                state = self.source_state(filename)
+            source = None
+            if state is not None:
+                source = (filename, state, digest or self.source_digest(filename))
+            snapshot = self._next_snapshot(self._snapshot, data, records, source)
+            self._publish(snapshot)
+            if stats is not None:
+                stats.publish_seconds = time.perf_counter() - start
+                self._load_stats = stats
+            return snapshot.change_set
+
+    def _publish(self, snapshot: RepositorySnapshot[T, U]) -> None:
+        """
+        Makes the given snapshot the current one with a single reference assignment.
+
+        Args:
+            snapshot (RepositorySnapshot[T, U]): The snapshot to publish.
+        """
+        if snapshot.version != self._snapshot.version:
+            self._history.append((snapshot.version, snapshot.change_set))
+            if len(self._history) > self.history_size:
+                self._history.popleft()
+        self._pinned[snapshot.version] = snapshot
+        self._snapshot = snapshot
+        self._load_pending = False
+
+    def _next_snapshot(
+            self,
+            current: RepositorySnapshot[T, U],
+            data: Sequence[U],
+            records: Mapping[Hashable, tuple[T, U]],
+            source: tuple[str, SourceState, str] | None,
+            change_set: ChangeSet[U] | None = None
+    ) -> RepositorySnapshot[T, U]:
+        """
+        Builds the snapshot following the current one, without modifying the current one.
+
+        Args:
+            current (RepositorySnapshot[T, U]): The current snapshot.
+            data (Sequence[U]): The newly processed data.
+            records (Mapping[Hashable, tuple[T, U]]): The new raw and converted records by key.
+            source (tuple[str, SourceState, str] | None): The state of the loaded file.
+            change_set (ChangeSet[U] | None): The changes from the current snapshot, computed if None.
+
+        Returns:
+            RepositorySnapshot[T, U]: The new snapshot.
+        """
+        if change_set is None:
+            change_set = self._change_set(current, data, records)
+        unique, multi, sorted_, partitions = self._update_indexes(current, data, records, change_set)
+        return RepositorySnapshot(
+            data=data,
+            records=records,
+            unique=unique,
+            multi=multi,
+            sorted=sorted_,
+            partitions=partitions,
+            version=current.version + 1 if change_set else current.version,
+            change_set=change_set,
+            source=source
+        )
+
+    def _change_set(
+            self,
+            current: RepositorySnapshot[T, U],
+            data: Sequence[U],
+            records: Mapping[Hashable, tuple[T, U]]
+    ) -> ChangeSet[U]:
+        """
+        Compares a newly processed load with the current snapshot.
+
+        Args:
+            current (RepositorySnapshot[T, U]): The current snapshot.
+            data (Sequence[U]): The newly processed data.
+            records (Mapping[Hashable, tuple[T, U]]): The new raw and converted records by key.
+
+        Returns:
+            ChangeSet[U]: The differences between the current and the new load.
+        """
+        if self.key_field is None:
+            old_data = current.data
+            if len(old_data) == len(data) and all(old is new for old, new in zip(old_data, data)):
+                return ChangeSet()
+            return ChangeSet(added=list(data), removed=list(old_data))
+
+        added, changed = [], []
+        for key, (_, record) in records.items():
+            previous = current.records.get(key)
+            if previous is None:
+                added.append(record)
+            elif previous[1] is not record:
+                changed.append((previous[1], record))
+        removed = [record for key, (_, record) in current.records.items() if key not in records]
+        return ChangeSet(added, changed, removed)
+
+    def _update_indexes(
+            self,
+            current: RepositorySnapshot[T, U],
+            data: Sequence[U],
+            records: Mapping[Hashable, tuple[T, U]],
+            change_set: ChangeSet[U]
+    ) -> tuple[
+        dict[str, UniqueIndex[Any, U]],
+        dict[str, MultiIndex[Any, U]],
+        dict[str, SortedIndex[Any, U]],
+        dict[str, PartitionIndex[Any, U]]
+    ]:
+        """
+        Builds the indexes of the next snapshot by applying a change set to copies of the current
+        indexes. The indexes are rebuilt instead when there is no previous load or when either load
+        contains records sharing a key.
+
+        Args:
+            current (RepositorySnapshot[T, U]): The current snapshot.
+            data (Sequence[U]): The newly processed data.
+            records (Mapping[Hashable, tuple[T, U]]): The new raw and converted records by key.
+            change_set (ChangeSet[U]): The changes between the current and the new load.
+
+        Returns:
+            tuple: The unique, multi-valued, sorted and partition indexes of the next snapshot.
+        """
+        declared = (
+            len(self.unique_indexes) + len(self.multi_indexes) + len(self.sorted_indexes) + len(self.partition_indexes)
+        )
+        incremental = (
+            self.key_field is not None
+            and len(current.unique) + len(current.multi) + len(current.sorted) + len(current.partitions) == declared
+            and len(records) == len(data)
+            and len(current.records) == len(current.data)
+        )
+        if not incremental:
+            return (
+                {name: UniqueIndex(name, data) for name in self.unique_indexes},
+                {name: MultiIndex(name, data) for name in self.multi_indexes},
+                {name: SortedIndex(name, data) for name in self.sorted_indexes},
+                {
+                    name: PartitionIndex(name, data, str(self.partition_date_field), self.partition_months)
+                    for name in self.partition_indexes
+                }
+            )
+        if not change_set:
+            return current.unique, current.multi, current.sorted, current.partitions
+
+        unique = {name: index.copy() for name, index in current.unique.items()}
+        multi = {name: index.copy() for name, index in current.multi.items()}
+        sorted_ = {name: index.copy() for name, index in current.sorted.items()}
+        partitions = {name: index.copy() for name, index in current.partitions.items()}
+        indexes: list[Index[Any, U]] = [*unique.values(), *multi.values(), *sorted_.values(), *partitions.values()]
+        for index in indexes:
+            for record in change_set.removed:
+                index.remove(record)
+            for old, new in change_set.changed:
+                index.replace(old, new)
+            for record in change_set.added:
+                index.add(record)
+        return unique, multi, sorted_, partitions
+
+    def add(self, entry: T) -> U:
+        """
+        Validates, converts and adds a new record.
+
+        Args:
+            entry (T): The raw data of the record.
+
+        Returns:
+            U: The added record.
+
+        Raises:
+            ValueError: If the entry is invalid, a record with the same key already exists or the
+                repository is paged.
+        """
+        self._check_editable()
+        record = self._validated(entry)
+        key = self._record_key(record)
+        with self._lock:
+            current = self._current()
+            if key is not None and key in current.records:
+                raise ValueError(f"Record {key} already exists")
+            records = self._editable_records(current)
+            if key is not None:
+                records[key] = (entry, record)
+            data = PersistentList.of(current.data).append(record)
+            self._apply(current, data, records, ChangeSet(added=[record]))
+        return record
+
+    def update(self, entry: T) -> U:
+        """
+        Validates, converts and replaces the record with the same key.
+
+        Args:
+            entry (T): The new raw data of the record.
+
+        Returns:
+            U: The updated record.
+
+        Raises:
+            ValueError: If the entry is invalid, the repository has no key field or is paged.
+            KeyError: If no record has the key of the entry.
+        """
+        self._check_editable()
+        if self.key_field is None:
+            raise ValueError(f"{type(self).__name__} has no key field")
+        record = self._validated(entry)
+        key = self._record_key(record)
+        with self._lock:
+            current = self._current()
+            _, old = current.records[key]
+            records = self._editable_records(current)
+            records[key] = (entry, record)
+            data = PersistentList.of(current.data)
+            data = data.set(data.find(old), record)
+            self._apply(current, data, records, ChangeSet(changed=[(old, record)]))
+        return record
+
+    def remove(self, key: Hashable) -> U:
+        """
+        Removes the record with the given key.
+
+        Args:
+            key (Hashable): The value of the key field of the record.
+
+        Returns:
+            U: The removed record.
+
+        Raises:
+            ValueError: If the repository is paged.
+            KeyError: If no record has the given key.
+        """
+        self._check_editable()
+        with self._lock:
+            current = self._current()
+            _, old = current.records[key]
+            records = self._editable_records(current)
+            del records[key]
+            data = PersistentList.of(current.data)
+            data = data.delete(data.find(old))
+            self._apply(current, data, records, ChangeSet(removed=[old]))
+        return old
+
+    def _check_editable(self) -> None:
+        """
+        Checks that the records are held in memory and can be changed.
+
+        Raises:
+            ValueError: If the repository is paged.
+        """
+        if self.load_mode is LoadMode.PAGED:
+            raise ValueError(f"{type(self).__name__} is paged and read-only")
+
+    def flush(self) -> int:
+        """
+        Writes the pending changes back to the source file and marks them as written.
+
+        The file is read again and only the entries of the changed keys are replaced, removed or
+        appended; all other entries are written back unchanged, so entries that were rejected on
+        load (e.g. because of a transient validation failure) are not lost. Without a key field
+        changes cannot be located in the file, and the whole data is written instead.
+
+        Returns:
+            int: The number of written entries.
+
+        Raises:
+            ValueError: If the repository has no file writer, or has no key field and the latest
+                load rejected entries that writing the whole data would delete.
+        """
+        if self.file_writer is None:
+            raise ValueError("No file writer set")
+        with self._lock:
+            filename = str(self.filename)
+            lines = filename.endswith('.jsonl')
+            logging.info(f"Flushing {self._pending_writes} pending changes to {filename}...")
+            if self.key_field is None:
+                if self._load_stats is not None and self._load_stats.rejected:
+                    raise ValueError(
+                        f"Refusing to overwrite {filename}: {self._load_stats.rejected} entries were rejected on load"
+                    )
+                count = self.file_writer.write_models(filename, self._snapshot.data, lines=lines)
+            else:
+                entries = self._merged_entries(filename)
+                self.file_writer.write(filename, entries, lines=lines)
+                count = len(entries)
+            state = self.source_state(filename)
+            source = None if state is None else (filename, state, self.source_digest(filename))
+            self._publish(replace(self._snapshot, source=source))
+            self._pending_writes = 0
+            self._pending_keys.clear()
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            return count
+
+    def _merged_entries(self, filename: str) -> list[T]:
+        """
+        Returns the raw entries of the source file with the pending changes applied: the first entry
+        of a changed key is replaced by its current raw data, later entries of that key and removed
+        keys are dropped, and added keys are appended in data order.
+
+        Args:
+            filename (str): The source file.
+
+        Returns:
+            list[T]: The raw entries to write.
+        """
+        records = self._snapshot.records
+        pending = self._pending_keys
+        written: set[Hashable] = set()
+        entries: list[T] = []
+        stored = self.file_reader.read(filename) if os.path.exists(filename) else []
+        for entry in stored:
+            key = self._key_of(entry)
+            if key is None or key not in pending:
+                entries.append(entry)
+            elif key in records and key not in written:
+                entries.append(records[key][0])
+                written.add(key)
+        for record in self._snapshot.data:
+            key = self._record_key(record)
+            if key in pending and key not in written and key in records:
+                entries.append(records[key][0])
+                written.add(key)
+        return entries
+
+    def flush_if_due(self) -> bool:
+        """
+        Flushes the pending changes if the size or time threshold is reached.
+
+        Returns:
+            bool: True if the changes were flushed.
+        """
+        if self.file_writer is None or not self._pending_writes:
+            return False
+        due = self._pending_writes >= self.flush_size or (
+            self.flush_interval is not None and time.monotonic() - self._first_pending >= self.flush_interval
+        )
+        if due:
+            self.flush()
+        return due
+
+    def _validated(self, entry: T) -> U:
+        """
+        Validates and converts a raw entry.
+
+        Raises:
+            ValueError: If the entry is invalid.
+        """
+        if not self.validator.validate(entry):
+            logging.error(f"Invalid entry: {entry}")
+            raise ValueError(f"Invalid entry: {entry}")
+        return self.converter.convert(entry)
+
+    @staticmethod
+    def _editable_records(current: RepositorySnapshot[T, U]) -> OverlayDict[Hashable, tuple[T, U]]:
+        """
+        Returns a modifiable view of the records of a snapshot that shares them instead of copying them.
+        """
+        if isinstance(current.records, OverlayDict):
+            return current.records.copy()
+        return OverlayDict(current.records)
+
+    def _apply(
+            self,
+            current: RepositorySnapshot[T, U],
+            data: Sequence[U],
+            records: Mapping[Hashable, tuple[T, U]],
+            change_set: ChangeSet[U]
+    ) -> None:
+        """
+        Publishes an in-memory change as a new snapshot and flushes it if a threshold is reached.
+        """
+        self._publish(self._next_snapshot(current, data, records, current.source, change_set))
+        if self._pending_writes == 0:
+            self._first_pending = time.monotonic()
+            if self.flush_interval is not None:
+                self._arm_flush_timer(self.flush_interval)
+        self._pending_writes += 1
+        changed = [*change_set.added, *(new for _, new in change_set.changed), *change_set.removed]
+        self._pending_keys.update(key for record in changed if (key := self._record_key(record)) is not None)
+        self.flush_if_due()
+
+    def _arm_flush_timer(self, delay: float) -> None:
+        """
+        Starts a daemon timer flushing the pending changes after the given delay.
+
+        Args:
+            delay (float): The number of seconds to wait.
+        """
+        if self.file_writer is None:
+            return
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(delay, self._flush_on_timer)
+        self._flush_timer.name = f"{type(self).__name__}-flush"
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_on_timer(self) -> None:
+        """
+        Body of the flush timer. Flushes the pending changes if they are due, and waits for the rest
+        of the interval otherwise. Failed flushes are logged and retried after another interval.
+        """
+        with self._lock:
+            self._flush_timer = None
+            if not self._pending_writes or self.flush_interval is None:
+                return
+            try:
+                if not self.flush_if_due():
+                    self._arm_flush_timer(self._first_pending + self.flush_interval - time.monotonic())
+            except Exception:
+                logging.exception(f"Flushing {self.filename} failed")
+                self._arm_flush_timer(self.flush_interval)
+
+    def start_auto_reload(self, interval: float = 5.0) -> None:
+        """
+        Starts a daemon thread refreshing the repository every `interval` seconds. Unchanged sources
+        are detected without reading them, and readers keep using the current snapshot until the
+        new one is published.
+
+        Args:
+            interval (float): The number of seconds between two checks of the source.
+        """
+        if self._reload_thread is not None and self._reload_thread.is_alive():
+            return
+        self._reload_stop = threading.Event()
+        self._reload_thread = threading.Thread(
+            target=self._auto_reload,
+            args=(interval, self._reload_stop),
+            name=f"{type(self).__name__}-auto-reload",
+            daemon=True
+        )
+        self._reload_thread.start()
+        logging.info(f"Auto reload of {self.filename} started every {interval} s")
+
+    def stop_auto_reload(self, timeout: float | None = None) -> None:
+        """
+        Stops the auto reload thread and waits for it to finish.
+
+        Args:
+            timeout (float | None): The maximum number of seconds to wait for the thread.
+        """
+        self._reload_stop.set()
+        if self._reload_thread is not None:
+            self._reload_thread.join(timeout)
+            self._reload_thread = None
+
+    def _auto_reload(self, interval: float, stop: threading.Event) -> None:
+        """
+        Body of the auto reload thread. Failed refreshes are logged and retried at the next interval.
+
+        Args:
+            interval (float): The number of seconds between two checks of the source.
+            stop (threading.Event): Set to stop the thread.
+        """
+        while not stop.wait(interval):
+            try:
+                self.flush_if_due()
+                change_set = self.refresh()
+            except Exception:
+                logging.exception(f"Auto reload of {self.filename} failed")
+                continue
+            if change_set:
+                logging.info(
+                    f"Reloaded {self.filename}: {len(change_set.added)} added, "
+                    f"{len(change_set.changed)} changed, {len(change_set.removed)} removed"
+                )
+
+    def worker_settings(self) -> dict[str, Any]:
+        """
+        Returns the settings a copy of the repository needs to process its source like this one,
+        e.g. in a worker process of a loader. They are set as attributes on the copy.
+
+        Returns:
+            dict[str, Any]: The attribute values by name.
+        """
+        return {"duplicate_policy": self.duplicate_policy}
+
+    @staticmethod
+    def source_state(filename: str) -> SourceState | None:
+        """
+        Returns the size and modification time of the file, or None if it cannot be inspected.
+        """
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def source_digest(filename: str) -> str:
+        """
+        Returns the SHA-256 digest of the file content.
+        """
+        with open(filename, 'rb') as file:
+            return hashlib.file_digest(file, "sha256").hexdigest()
+
+    def _record_key(self, record: U) -> Hashable | None:
+        """
+        Returns the value of the key field of a converted record, or None if the repository has no key.
+        """
+        if self.key_field is None:
+            return None
+        return getattr(record, self.key_field, None)
+
+    def _key_of(self, entry: Any) -> Hashable | None:
+        """
+        Returns the value of the key field of a raw entry, or None if the entry has no key.
+        """
+        if self.key_field is None or not isinstance(entry, dict):
+            return None
+        return entry.get(self.key_field)
+
+    def merge_entries(self, first: T, second: T) -> T:
+        """
+        Combines two raw entries sharing a key under `DuplicatePolicy.MERGE`. The values of the
+        later entry override those of the earlier one, except null ones.
+
+        Args:
+            first (T): The entry loaded so far.
+            second (T): The later entry with the same key.
+
+        Returns:
+            T: The combined entry, validated and converted in place of both.
+        """
+        if not isinstance(first, dict) or not isinstance(second, dict):
+            return second
+        return {**first, **{name: value for name, value in second.items() if value is not None}}  # type: ignore[return-value]
+
+    def _process_data(
+            self,
+            filename: str,
+            previous: Mapping[Hashable, tuple[T, U]] | None = None,
+            stats: LoadStats | None = None
+    ) -> tuple[list[U], dict[Hashable, tuple[T, U]]]:
         """
         Reads, validates, and converts the raw data from the given filename.
-        Returns a list of successfully processed data.
+        Entries equal to their previous raw version reuse the previous record instead of being
+        validated and converted again. Entries sharing a key are resolved in a single pass
+        according to `duplicate_policy`.
 
         Args:
             filename (str): The filename to process.
+            previous (Mapping[Hashable, tuple[T, U]] | None): The raw and converted records of the previous load.
+            stats (LoadStats | None): The statistics to record the timings and counters of the load in.
 
         Returns:
-            list[U]: A list of validated and converted data.
+            tuple[list[U], dict[Hashable, tuple[T, U]]]: The validated and converted data, and
+            the raw and converted records by key.
+
+        Raises:
+            ValueError: If the data contains a duplicate key and the policy is `DuplicatePolicy.ERROR`.
         """
         logging.info(f"Reading data from {filename}...")
+        stats = stats if stats is not None else LoadStats(filename)
+        clock = time.perf_counter
+        start = clock()
         raw_data = self.file_reader.read(filename)
+        stats.read_seconds = clock() - start
+        stats.bytes_read = os.path.getsize(filename) if os.path.isfile(filename) else 0
+        previous = previous or {}
         valid_data = []
+        records: dict[Hashable, tuple[T, U]] = {}
+        positions: dict[Hashable, int] = {}
+        policy = self.duplicate_policy
+        validate_seconds = convert_seconds = 0.0
 
         for entry in raw_data:
-            if self.validator.validate(entry):
+            stats.records_in += 1
+            key = self._key_of(entry)
+            position = positions.get(key) if key is not None else None
+            if position is not None:
+                if policy is DuplicatePolicy.FIRST_WINS:
+                    stats.duplicates += 1
+                    continue
+                if policy is DuplicatePolicy.ERROR:
+                    raise ValueError(f"Duplicate {self.key_field} {key!r} in {filename}")
+                if policy is DuplicatePolicy.MERGE:
+                    entry = self.merge_entries(records[key][0], entry)
+            cached = previous.get(key) if key is not None else None
+            if cached is not None and cached[0] == entry:
+                converted_entry = cached[1]
+                stats.reused += 1
+            else:
+                start = clock()
+                valid = self.validator.validate(entry)
+                converted = clock()
+                validate_seconds += converted - start
+                if not valid:
+                    logging.error(f"Invalid entry: {entry}")
+                    stats.rejected += 1
+                    continue
                 converted_entry = self.converter.convert(entry)
+                convert_seconds += clock() - converted
+            if key is None:
+                valid_data.append(converted_entry)
+                continue
+            if position is None:
+                positions[key] = len(valid_data)
                 valid_data.append(converted_entry)
             else:
-                logging.error(f"Invalid entry: {entry}")
+                stats.duplicates += 1
+                valid_data[position] = converted_entry
+            records[key] = (entry, converted_entry)
 
-        return valid_data
+        if stats.duplicates:
+            logging.warning(f"Resolved {stats.duplicates} duplicate entries in {filename} ({policy.value})")
+        stats.valid = len(valid_data)
+        stats.validate_seconds = validate_seconds
+        stats.convert_seconds = convert_seconds
+        return valid_data, records
 
 
 class UserDataRepository(AbstractDataRepository[UserDataDict, Users]):
@@ -113,7 +1134,8 @@ class UserDataRepository(AbstractDataRepository[UserDataDict, Users]):
     Repository class for managing user data. Inherits from AbstractDataRepository and handles
     data specific to users.
     """
-    pass
+    key_field = "email"
+    unique_indexes = ("email",)
 
 
 class LockerDataRepository(AbstractDataRepository[LockersDataDict, Lockers]):
@@ -121,7 +1143,8 @@ class LockerDataRepository(AbstractDataRepository[LockersDataDict, Lockers]):
     Repository class for managing locker data. Inherits from AbstractDataRepository and handles
     data specific to lockers.
     """
-    pass
+    key_field = "locker_id"
+    unique_indexes = ("locker_id",)
 
 
 class ParcelDataRepository(AbstractDataRepository[ParcelsDataDict, Parcels]):
@@ -129,15 +1152,382 @@ class ParcelDataRepository(AbstractDataRepository[ParcelsDataDict, Parcels]):
     Repository class for managing parcel data. Inherits from AbstractDataRepository and handles
     data specific to parcels.
     """
-    pass
+    key_field = "parcel_id"
+    unique_indexes = ("parcel_id",)
 
 
 class DeliverDataRepository(AbstractDataRepository[DeliversDataDict, Delivers]):
     """
     Repository class for managing delivery data. Inherits from AbstractDataRepository and handles
     data specific to deliveries.
+
+    Deliveries are partitioned by locker and by the month they were sent in, so per-locker
+    questions only read that locker's partitions, and old months can be evicted with `evict_before`.
+    """
+    key_field = "parcel_id"
+    unique_indexes = ("parcel_id",)
+    multi_indexes = ("locker_id", "sender_email", "receiver_email")
+    sorted_indexes = ("sent_date", "expected_delivery_date")
+    partition_indexes = ("locker_id",)
+    partition_date_field = "sent_date"
+
+    evicted_before: date | None = None
+
+    @override
+    def worker_settings(self) -> dict[str, Any]:
+        """
+        Adds the eviction cutoff, so deliveries evicted here are not loaded again by a worker.
+        """
+        return super().worker_settings() | {"evicted_before": self.evicted_before}
+
+    def evict_before(self, cutoff: date) -> list[Delivers]:
+        """
+        Drops the deliveries of all whole periods before the period of the given date from memory,
+        partition by partition. The deliveries stay in the source file but are no longer loaded on
+        refresh. Repositories with a file writer cannot evict, since flushing would write the
+        remaining deliveries back without the evicted ones.
+
+        Args:
+            cutoff (date): A date of the oldest period to keep.
+
+        Returns:
+            list[Delivers]: The evicted deliveries.
+
+        Raises:
+            ValueError: If the repository has a file writer.
+        """
+        if self.file_writer is not None:
+            raise ValueError("Cannot evict from a repository with a file writer")
+        with self._lock:
+            current = self._current()
+            partitions = current.partitions["locker_id"]
+            self.evicted_before = partitions.period_of(cutoff)
+            evicted = partitions.before(cutoff)
+            if not evicted:
+                return []
+            gone = set(map(id, evicted))
+            records = self._editable_records(current)
+            for deliver in evicted:
+                if records.get(deliver.parcel_id, (None, None))[1] is deliver:
+                    del records[deliver.parcel_id]
+            data = [deliver for deliver in current.data if id(deliver) not in gone]
+            self._publish(self._next_snapshot(current, data, records, current.source, ChangeSet(removed=evicted)))
+            logging.info(f"Evicted {len(evicted)} deliveries sent before {self.evicted_before}")
+            return evicted
+
+    @override
+    def _process_data(
+            self,
+            filename: str,
+            previous: Mapping[Hashable, tuple[DeliversDataDict, Delivers]] | None = None,
+            stats: LoadStats | None = None
+    ) -> tuple[list[Delivers], dict[Hashable, tuple[DeliversDataDict, Delivers]]]:
+        """
+        Processes the data like the base repository, leaving out the deliveries of evicted periods.
+        """
+        data, records = super()._process_data(filename, previous, stats)
+        if self.evicted_before is None:
+            return data, records
+        cutoff = self.evicted_before
+        kept = [deliver for deliver in data if deliver.sent_date >= cutoff]
+        return kept, {key: record for key, record in records.items() if record[1].sent_date >= cutoff}
+
+    def query(
+            self,
+            locker_id: str | None = None,
+            sender_email: str | None = None,
+            receiver_email: str | None = None,
+            sent_from: date | None = None,
+            sent_to: date | None = None,
+            expected_from: date | None = None,
+            expected_to: date | None = None
+    ) -> list[Delivers]:
+        """
+        Returns the deliveries matching all given predicates. Date bounds are inclusive.
+
+        Candidates are taken from the most selective index: the multi-valued index of an equality
+        predicate or a bisected slice of a sorted date index. Only the candidates are checked
+        against the remaining predicates. All indexes are read from a single snapshot, so a
+        concurrent refresh cannot mix two versions in one result.
+
+        Args:
+            locker_id (str | None): Keeps deliveries to this locker.
+            sender_email (str | None): Keeps deliveries sent by this user.
+            receiver_email (str | None): Keeps deliveries received by this user.
+            sent_from (date | None): Keeps deliveries sent on or after this date.
+            sent_to (date | None): Keeps deliveries sent on or before this date.
+            expected_from (date | None): Keeps deliveries expected on or after this date.
+            expected_to (date | None): Keeps deliveries expected on or before this date.
+
+        Returns:
+            list[Delivers]: The matching deliveries ordered by sent date.
+        """
+        equalities = {
+            name: value
+            for name, value in (("locker_id", locker_id), ("sender_email", sender_email), ("receiver_email", receiver_email))
+            if value is not None
+        }
+        ranges = {
+            name: bounds
+            for name, bounds in (("sent_date", (sent_from, sent_to)), ("expected_delivery_date", (expected_from, expected_to)))
+            if bounds != (None, None)
+        }
+
+        snapshot = self._current()
+        candidates: list[tuple[int, str]] = [
+            (len(snapshot.multi[name].lookup(value)), name) for name, value in equalities.items()
+        ]
+        candidates += [(snapshot.sorted[name].count(*bounds), name) for name, bounds in ranges.items()]
+        if not candidates:
+            return list(snapshot.sorted["sent_date"])
+
+        _, source = min(candidates)
+        if source in equalities:
+            deliveries = snapshot.multi[source].lookup(equalities.pop(source))
+        else:
+            deliveries = snapshot.sorted[source].range(*ranges.pop(source))
+
+        result = [
+            deliver for deliver in deliveries
+            if all(getattr(deliver, name) == value for name, value in equalities.items())
+            and all(
+                (start is None or start <= getattr(deliver, name)) and (end is None or getattr(deliver, name) <= end)
+                for name, (start, end) in ranges.items()
+            )
+        ]
+        if source != "sent_date":
+            result.sort(key=lambda deliver: deliver.sent_date)
+        return result
+
+
+
+def snapshot_of(repository: Any) -> RepositorySnapshot[Any, Any]:
+    """
+    Returns the current snapshot of a repository, so its data and indexes are read from one version.
+    Repositories without snapshots (e.g. test doubles) get a one-off snapshot of `get_data()`
+    without indexes.
+
+    Args:
+        repository (Any): The repository to take the snapshot of.
+
+    Returns:
+        RepositorySnapshot[Any, Any]: The data and indexes of the current version.
+    """
+    if isinstance(repository, AbstractDataRepository):
+        return repository.snapshot()
+    return RepositorySnapshot(data=repository.get_data())
+
+
+def unique_index_of(repository: Any, field_name: str) -> Mapping[Any, Any]:
+    """
+    Returns the unique index a repository maintains on an attribute. Repositories without
+    such an index (e.g. test doubles) get a one-off index built from `get_data()`.
+
+    Args:
+        repository (Any): The repository to look up records in.
+        field_name (str): The indexed attribute.
+
+    Returns:
+        Mapping[Any, Any]: The records by attribute value.
     """
-    pass
+    if isinstance(repository, AbstractDataRepository) and field_name in repository.unique_indexes:
+        return repository.unique_index(field_name)
+    return UniqueIndex(field_name, repository.get_data())
+
+
+def partition_index_of(repository: Any, field_name: str, date_field: str = "sent_date") -> PartitionIndex[Any, Any]:
+    """
+    Returns the partition index a repository, or a snapshot of one, maintains on an attribute.
+    Repositories and snapshots without such an index (e.g. test doubles) get a one-off index built
+    from their data.
+
+    Args:
+        repository (Any): The repository or snapshot to look up records in.
+        field_name (str): The partitioning attribute.
+        date_field (str): The date attribute of the one-off index.
+
+    Returns:
+        PartitionIndex[Any, Any]: The records by attribute value and period.
+    """
+    if isinstance(repository, RepositorySnapshot):
+        if field_name in repository.partitions:
+            return repository.partitions[field_name]
+        return PartitionIndex(field_name, repository.data, date_field)
+    if isinstance(repository, AbstractDataRepository) and field_name in repository.partition_indexes:
+        return repository.partition_index(field_name)
+    return PartitionIndex(field_name, repository.get_data(), date_field)
+
+
+def multi_index_of(repository: Any, field_name: str) -> MultiIndex[Any, Any]:
+    """
+    Returns the multi-valued index a repository maintains on an attribute. Repositories without
+    such an index (e.g. test doubles) get a one-off index built from `get_data()`.
+
+    Args:
+        repository (Any): The repository to look up records in.
+        field_name (str): The indexed attribute.
+
+    Returns:
+        MultiIndex[Any, Any]: The lists of records by attribute value.
+    """
+    if isinstance(repository, AbstractDataRepository) and field_name in repository.multi_indexes:
+        return repository.multi_index(field_name)
+    return MultiIndex(field_name, repository.get_data())
+
+
+@dataclass
+class PurchaseSummary:
+    """
+    A compact purchase summary keyed by interned user IDs instead of `Users` objects.
+
+    Every sender gets an integer ID on first insert. Deliveries are stored once in insertion
+    order and each user keeps the list of indexes of its deliveries, so building the summary
+    only hashes email strings. Discarded deliveries leave a None slot behind, so the indexes
+    of the other deliveries stay valid; once more than half of the slots are empty, the
+    deliveries are compacted and the indexes remapped.
+
+    Args:
+        user_ids (dict[str, int]): The ID of every user, keyed by email.
+        users (list[Users | None]): The users, indexed by ID.
+        deliveries (list[Delivers | None]): The deliveries, indexed by delivery index.
+        user_deliveries (list[list[int]]): The delivery indexes of every user, indexed by user ID.
+        parcel_slots (dict[str, list[int]]): The delivery indexes of every parcel ID.
+        free_slots (int): The number of None slots left in `deliveries` by discarded deliveries.
+    """
+    user_ids: dict[str, int] = field(default_factory=dict)
+    users: list[Users | None] = field(default_factory=list)
+    deliveries: list[Delivers | None] = field(default_factory=list)
+    user_deliveries: list[list[int]] = field(default_factory=list)
+    parcel_slots: dict[str, list[int]] = field(default_factory=dict)
+    free_slots: int = 0
+
+    def add(self, user: Users, deliver: Delivers) -> int:
+        """
+        Records a delivery sent by the given user.
+
+        Args:
+            user (Users): The sender of the delivery.
+            deliver (Delivers): The delivery.
+
+        Returns:
+            int: The index of the stored delivery.
+        """
+        user_id = self.user_ids.get(user.email)
+        if user_id is None:
+            user_id = self.user_ids[sys.intern(user.email)] = len(self.users)
+            self.users.append(user)
+            self.user_deliveries.append([])
+        elif self.users[user_id] is not user:
+            self.users[user_id] = user
+        index = len(self.deliveries)
+        self.deliveries.append(deliver)
+        self.user_deliveries[user_id].append(index)
+        self.parcel_slots.setdefault(deliver.parcel_id, []).append(index)
+        return index
+
+    def discard(self, deliver: Delivers) -> bool:
+        """
+        Removes the given delivery object from the summary, if present.
+
+        Args:
+            deliver (Delivers): The delivery to remove.
+
+        Returns:
+            bool: True if the delivery was part of the summary.
+        """
+        slots = self.parcel_slots.get(deliver.parcel_id, [])
+        for index in slots:
+            if self.deliveries[index] is deliver:
+                break
+        else:
+            return False
+
+        slots.remove(index)
+        if not slots:
+            del self.parcel_slots[deliver.parcel_id]
+        self.deliveries[index] = None
+        self.user_deliveries[self.user_ids[deliver.sender_email]].remove(index)
+        self.free_slots += 1
+        if self.free_slots * 2 > len(self.deliveries):
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """
+        Drops the None slots left by discarded deliveries and remaps the delivery indexes of
+        the users and parcels. Deliveries keep their relative order.
+        """
+        remap = [-1] * len(self.deliveries)
+        deliveries: list[Delivers | None] = []
+        for index, deliver in enumerate(self.deliveries):
+            if deliver is not None:
+                remap[index] = len(deliveries)
+                deliveries.append(deliver)
+        self.deliveries = deliveries
+        self.user_deliveries = [[remap[index] for index in indexes] for indexes in self.user_deliveries]
+        self.parcel_slots = {
+            parcel_id: [remap[index] for index in slots] for parcel_id, slots in self.parcel_slots.items()
+        }
+        self.free_slots = 0
+
+    def deliveries_of(self, email: str) -> list[Delivers]:
+        """
+        Returns the deliveries sent by the user with the given email.
+
+        Args:
+            email (str): The email of the sender.
+
+        Returns:
+            list[Delivers]: The deliveries of the user, in insertion order.
+        """
+        user_id = self.user_ids.get(email)
+        if user_id is None:
+            return []
+        return [self.deliveries[index] for index in self.user_deliveries[user_id]]  # type: ignore[misc]
+
+    def view(self) -> "PurchaseSummaryView":
+        """
+        Returns a lazy mapping view of the summary keyed by `Users`.
+        """
+        return PurchaseSummaryView(self)
+
+
+class PurchaseSummaryView(Mapping[Users, dict[Delivers, int]]):
+    """
+    A read-only view of a `PurchaseSummary` shaped like `UsersWithPurchaseDelivers`.
+
+    The per-user delivery counts are only built when a user is looked up, so existing callers
+    keep working while building the summary stays cheap.
+    """
+
+    def __init__(self, summary: PurchaseSummary) -> None:
+        self._summary = summary
+
+    def _user_id(self, user: object) -> int | None:
+        if not isinstance(user, Users):
+            return None
+        user_id = self._summary.user_ids.get(user.email)
+        if user_id is None or not self._summary.user_deliveries[user_id] or self._summary.users[user_id] != user:
+            return None
+        return user_id
+
+    def __getitem__(self, user: Users) -> dict[Delivers, int]:
+        user_id = self._user_id(user)
+        if user_id is None:
+            raise KeyError(user)
+        deliveries = self._summary.deliveries
+        return dict(Counter(deliveries[index] for index in self._summary.user_deliveries[user_id]))  # type: ignore[misc]
+
+    def __contains__(self, user: object) -> bool:
+        return self._user_id(user) is not None
+
+    def __iter__(self) -> Iterator[Users]:
+        for user, indexes in zip(self._summary.users, self._summary.user_deliveries):
+            if user is not None and indexes:
+                yield user
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
 
 
 @dataclass
@@ -151,13 +1541,19 @@ class PurchaseSummaryRepository[U, P, L, D]:
         parcel_repo (AbstractDataRepository[P, Parcels]): The repository containing parcel data.
         locker_repo (AbstractDataRepository[L, Lockers]): The repository containing locker data.
         deliver_repo (AbstractDataRepository[D, Delivers]): The repository containing delivery data.
-        _purchase_summary (UsersWithPurchaseDelivers): Cached purchase summary (initialized as empty).
+        _purchase_summary (UsersWithPurchaseDelivers): Cached purchase summary view (initialized as empty).
+        _summary (PurchaseSummary): Cached compact purchase summary.
+        _versions (tuple[int, ...] | None): The repository versions the cached summary reflects.
+        _joins (JoinEngine): The join engine resolving deliveries against the other repositories.
     """
     user_repo: AbstractDataRepository[U, Users]
     parcel_repo: AbstractDataRepository[P, Parcels]
     locker_repo: AbstractDataRepository[L, Lockers]
     deliver_repo: AbstractDataRepository[D, Delivers]
     _purchase_summary: UsersWithPurchaseDelivers = field(default_factory=dict, init=False)
+    _summary: PurchaseSummary = field(default_factory=PurchaseSummary, init=False)
+    _versions: tuple[int, ...] | None = field(default=None, init=False)
+    _joins: JoinEngine = field(default_factory=JoinEngine, init=False, repr=False, compare=False)
 
     def purchase_summary(self, force_refresh: bool = False) -> UsersWithPurchaseDelivers:
         """
@@ -167,33 +1563,150 @@ class PurchaseSummaryRepository[U, P, L, D]:
             force_refresh (bool): If True, forces a refresh of the summary.
 
         Returns:
-            UsersWithPurchaseDelivers: The aggregated purchase summary data.
+            UsersWithPurchaseDelivers: A view of the aggregated purchase summary data.
         """
-        if force_refresh or not self._purchase_summary:
-            logging.info('Building or refreshing purchase summary from repositories ...')
-            self._purchase_summary = self._build_purchase_summary()
+        self.summary(force_refresh)
         return self._purchase_summary
 
-    def _build_purchase_summary(self) -> UsersWithPurchaseDelivers:
+    def summary(self, force_refresh: bool = False) -> PurchaseSummary:
         """
-        Builds the purchase summary by aggregating data from users, parcels, lockers, and deliveries.
+        Retrieves the compact, email-keyed purchase summary. If forced or not already cached,
+        refreshes the data.
+
+        A refresh applies the change sets the repositories published since the last one:
+        added and removed deliveries are applied directly, and only deliveries referring to
+        changed users, lockers or parcels are resolved again. The summary is rebuilt instead
+        when the repositories do not provide their changes.
+
+        Args:
+            force_refresh (bool): If True, forces a refresh of the summary.
 
         Returns:
-            UsersWithPurchaseDelivers: The aggregated purchase summary.
+            PurchaseSummary: The aggregated purchase summary.
         """
-        purchase_summary: UsersWithPurchaseDelivers = defaultdict(lambda: defaultdict(int))
-        users = {user.email: user for user in self.user_repo.get_data()}
-        lockers = {locker.locker_id: locker for locker in self.locker_repo.get_data()}
-        parcels = {parcel.parcel_id: parcel for parcel in self.parcel_repo.get_data()}
-        delivers = self.deliver_repo.get_data()
-
-        for deliver in delivers:
-            user = users.get(deliver.sender_email)
-            locker = lockers.get(deliver.locker_id)
-            parcel = parcels.get(deliver.parcel_id)
-            if user and locker and parcel:
-                purchase_summary[user][deliver] += 1
+        if force_refresh or not self._purchase_summary:
+            versions = self._repository_versions()
+            if self._versions is not None and versions is not None and self._apply_changes(self._versions):
+                logging.info('Updated purchase summary from repository changes')
             else:
-                logging.warning(f'deliver {deliver.sender_email} has invalid user or locker or parcel reference')
+                logging.info('Building or refreshing purchase summary from repositories ...')
+                self._summary = self._build_purchase_summary()
+            self._purchase_summary = self._summary.view()
+            self._versions = versions
+        return self._summary
+
+    def _repositories(self) -> tuple[Any, ...]:
+        return self.user_repo, self.parcel_repo, self.locker_repo, self.deliver_repo
+
+    def _repository_versions(self) -> tuple[int, ...] | None:
+        """
+        Returns the versions of the source repositories, or None if any of them is not versioned.
+        """
+        repositories = self._repositories()
+        if not all(isinstance(repository, AbstractDataRepository) for repository in repositories):
+            return None
+        return tuple(repository.version for repository in repositories)
+
+    def _apply_changes(self, versions: tuple[int, ...]) -> bool:
+        """
+        Updates the cached summary with the changes published since the given repository versions.
+
+        Args:
+            versions (tuple[int, ...]): The versions of the user, parcel, locker and delivery repositories
+                the cached summary reflects.
+
+        Returns:
+            bool: False if the changes are no longer available and the summary must be rebuilt.
+        """
+        changes = [repository.changes_since(version) for repository, version in zip(self._repositories(), versions)]
+        if any(change_sets is None for change_sets in changes):
+            return False
+        user_changes, parcel_changes, locker_changes, deliver_changes = changes
+
+        summary = self._summary
+        pending: dict[int, Delivers] = {}
+        for change_set in deliver_changes:
+            for deliver in change_set.removed:
+                summary.discard(deliver)
+                pending.pop(id(deliver), None)
+            for old, new in change_set.changed:
+                summary.discard(old)
+                pending.pop(id(old), None)
+                pending[id(new)] = new
+            for deliver in change_set.added:
+                pending[id(deliver)] = deliver
+
+        by_parcel = unique_index_of(self.deliver_repo, "parcel_id")
+        lookups: tuple[tuple[list[ChangeSet[Any]], str, Callable[[Any], list[Delivers]]], ...] = (
+            (user_changes, "email", multi_index_of(self.deliver_repo, "sender_email").lookup),
+            (locker_changes, "locker_id", multi_index_of(self.deliver_repo, "locker_id").lookup),
+            (parcel_changes, "parcel_id", lambda parcel_id: [by_parcel[parcel_id]] if parcel_id in by_parcel else [])
+        )
+        for change_sets, key, lookup in lookups:
+            for key_value in self._changed_keys(change_sets, key):
+                for deliver in lookup(key_value):
+                    pending[id(deliver)] = deliver
+
+        for deliver in pending.values():
+            summary.discard(deliver)
+        for deliver, user, _, _ in self._joins.inner(
+                pending.values(),
+                *self._references(),
+                on_miss=self._log_invalid_reference
+        ):
+            summary.add(user, deliver)
+        return True
+
+    def dangling_deliveries(self) -> list[Delivers]:
+        """
+        Returns the deliveries referring to a user, locker or parcel that does not exist.
+
+        Returns:
+            list[Delivers]: The deliveries with at least one dangling reference.
+        """
+        return list(self._joins.anti(self.deliver_repo.get_data(), *self._references()))
+
+    def _references(self) -> tuple[JoinCondition, ...]:
+        """
+        Returns the join conditions of the sender, locker and parcel references of deliveries.
+        """
+        return (
+            JoinCondition("sender_email", self.user_repo, "email", unique=True),
+            JoinCondition("locker_id", self.locker_repo, "locker_id", unique=True),
+            JoinCondition("parcel_id", self.parcel_repo, "parcel_id", unique=True)
+        )
+
+    @staticmethod
+    def _log_invalid_reference(deliver: Delivers) -> None:
+        logging.warning(f'deliver {deliver.sender_email} has invalid user or locker or parcel reference')
+
+    @staticmethod
+    def _changed_keys(change_sets: list[ChangeSet[Any]], key: str) -> set[Any]:
+        """
+        Returns the keys of all records added, changed or removed in the given change sets.
+        """
+        keys: set[Any] = set()
+        for change_set in change_sets:
+            keys.update(getattr(record, key) for record in change_set.added)
+            keys.update(getattr(record, key) for record in change_set.removed)
+            for old, new in change_set.changed:
+                keys.add(getattr(old, key))
+                keys.add(getattr(new, key))
+        return keys
+
+    def _build_purchase_summary(self) -> PurchaseSummary:
+        """
+        Builds the purchase summary by aggregating data from users, parcels, lockers, and deliveries.
+
+        Returns:
+            PurchaseSummary: The aggregated purchase summary.
+        """
+        purchase_summary = PurchaseSummary()
+        for deliver, user, _, _ in self._joins.inner(
+                self.deliver_repo.get_data(),
+                *self._references(),
+                on_miss=self._log_invalid_reference
+        ):
+            purchase_summary.add(user, deliver)
 
-        return dict(purchase_summary)
+        return purchase_summary
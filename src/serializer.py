@@ -0,0 +1,164 @@
+from dataclasses import fields
+from datetime import date
+from enum import Enum
+from json.encoder import encode_basestring
+from typing import Any, Callable, Iterable, Iterator, TextIO, get_args, get_origin, get_type_hints
+from src.model import CompartmentVector, LockerComponentsSize
+import json
+
+
+def _field_code(name: str, field_type: Any, namespace: dict[str, Any]) -> str:
+    """
+    Produces the expression encoding a single dataclass field of `obj` as JSON text.
+
+    :param name: The field name, also used as the JSON key.
+    :param field_type: The resolved type annotation of the field.
+    :param namespace: Namespace of the generated function, extended with the constants the code refers to.
+    :return: A Python expression evaluating to the JSON text of the field value.
+    """
+    value = f"obj.{name}"
+    if field_type is str:
+        return f"_string({value})"
+    if field_type is int:
+        return f"_int({value})"
+    if field_type is float:
+        return f"_float(float({value}))"
+    if field_type is date:
+        return f"'\"' + {value}.isoformat() + '\"'"
+    if isinstance(field_type, type) and issubclass(field_type, Enum):
+        return f"_string({value}._value_)"
+    if field_type is CompartmentVector or CompartmentVector in get_args(field_type):
+        items = [
+            f"{encode_basestring(size.value)}: ' + _int({value}[{size.ordinal}]) + '"
+            for size in LockerComponentsSize
+        ]
+        return "'{" + ", ".join(items) + "}'"
+
+    key_type, *_ = get_args(field_type) or (None,)
+    if get_origin(field_type) is dict and isinstance(key_type, type) and issubclass(key_type, Enum):
+        items = []
+        for member in key_type:
+            constant = f"_{name}_{member.name}"
+            namespace[constant] = member
+            items.append(f"{encode_basestring(member.value)}: ' + _int({value}.get({constant}, 0)) + '")
+        return "'{" + ", ".join(items) + "}'"
+
+    return f"_dumps({value}, ensure_ascii=False)"
+
+
+def generate_encoder(model: type) -> Callable[[Any], str]:
+    """
+    Generates a function encoding an instance of the given dataclass directly as a JSON object,
+    without building an intermediate dictionary. The keys match the model's `to_dict` output,
+    derived fields are left out and dates are written as ISO strings.
+
+    :param model: The dataclass to generate the encoder for.
+    :return: A function taking a model instance and returning its JSON text.
+    """
+    hints = get_type_hints(model)
+    namespace: dict[str, Any] = {
+        "_string": encode_basestring,
+        "_int": int.__repr__,
+        "_float": float.__repr__,
+        "_dumps": json.dumps,
+    }
+    parts = [
+        f"'{encode_basestring(model_field.name)}: ' + {_field_code(model_field.name, hints[model_field.name], namespace)}"
+        for model_field in fields(model)
+        if not model_field.metadata.get("derived")
+    ]
+    source = f"def encode(obj):\n    return '{{' + {' + \', \' + '.join(parts) or repr('')} + '}}'\n"
+    exec(compile(source, f"<encoder {model.__name__}>", "exec"), namespace)
+    return namespace["encode"]
+
+
+class ModelSerializer[M]:
+    """
+    A bulk serializer writing sequences of model objects straight to a text stream as
+    a JSON array or as JSON lines.
+
+    Encoders are generated once per model class and shared between serializers.
+    """
+    _encoders: dict[type, Callable[[Any], str]] = {}
+
+    def __init__(self, model: type[M]) -> None:
+        """
+        Initializes the serializer for the given model class.
+
+        :param model: The dataclass of the serialized objects.
+        """
+        self.model = model
+        encoder = self._encoders.get(model)
+        if encoder is None:
+            encoder = self._encoders[model] = generate_encoder(model)
+        self.encode: Callable[[M], str] = encoder
+
+    def write_json(self, stream: TextIO, models: Iterable[M]) -> int:
+        """
+        Writes the models to the stream as a JSON array, one object per line.
+
+        :param stream: The text stream to write to.
+        :param models: The models to write.
+        :return: The number of models written.
+        """
+        count = 0
+
+        def chunks() -> Iterator[str]:
+            nonlocal count
+            separator = "[\n"
+            for obj in models:
+                yield separator + self.encode(obj)
+                separator = ",\n"
+                count += 1
+            yield "[]\n" if count == 0 else "\n]\n"
+
+        stream.writelines(chunks())
+        return count
+
+    def write_jsonl(self, stream: TextIO, models: Iterable[M]) -> int:
+        """
+        Writes the models to the stream as JSON lines, one object per line.
+
+        :param stream: The text stream to write to.
+        :param models: The models to write.
+        :return: The number of models written.
+        """
+        count = 0
+        encode = self.encode
+        for obj in models:
+            stream.write(encode(obj) + "\n")
+            count += 1
+        return count
+
+
+def write_models[M](filename: str, models: Iterable[M], model: type[M] | None = None, lines: bool = False) -> int:
+    """
+    Writes a sequence of models to a file in a single pass.
+
+    :param filename: The path to the file where the models will be written.
+    :param models: The models to write.
+    :param model: The model class; inferred from the first model when omitted.
+    :param lines: Writes JSON lines when True, a JSON array otherwise.
+    :return: The number of models written.
+    """
+    iterator = iter(models)
+    if model is None:
+        first = next(iterator, None)
+        if first is None:
+            with open(filename, "w", encoding="utf8") as file:
+                file.write("" if lines else "[]\n")
+            return 0
+        model = type(first)
+        iterator = _prepend(first, iterator)
+
+    serializer = ModelSerializer(model)
+    with open(filename, "w", encoding="utf8") as file:
+        return serializer.write_jsonl(file, iterator) if lines else serializer.write_json(file, iterator)
+
+
+def _prepend[M](first: M, rest: Iterator[M]) -> Iterator[M]:
+    """
+    Yields `first` followed by the remaining items of `rest`.
+    """
+    yield first
+    yield from rest
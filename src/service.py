@@ -1,7 +1,13 @@
 from collections import Counter
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from datetime import date
+from itertools import compress
+from typing import Mapping, Sequence
 from src.model import (
+    CompartmentVector,
     Delivers,
+    DeliveryTable,
+    OccupancyMatrix,
     Users,
     Parcels,
     Lockers,
@@ -13,7 +19,14 @@ from src.model import (
     LockersDataDict,
     DeliversDataDict
 )
-from src.repository import PurchaseSummaryRepository, UsersWithPurchaseDelivers, AbstractDataRepository
+from src.repository import (
+    PurchaseSummaryRepository,
+    UsersWithPurchaseDelivers,
+    AbstractDataRepository,
+    partition_index_of,
+    snapshot_of,
+    unique_index_of
+)
 from geopy.distance import geodesic # type: ignore[import]
 
 from tests.model.conftest import parcels, delivers
@@ -31,76 +44,131 @@ class PurchaseSummaryService:
     parcel_repo: AbstractDataRepository
     deliver_repo: AbstractDataRepository
 
-    lockers: dict[str, Lockers]
-    parcels: dict[str, Parcels]
-    delivers: list[Delivers]
-    users: dict[str, Users]
-    locker_usage: dict[str, dict]
+    lockers: Mapping[str, Lockers]
+    parcels: Mapping[str, Parcels]
+    delivers: Sequence[Delivers]
+    users: Mapping[str, Users]
+    locker_usage: dict[str, CompartmentVector]
 
     def __post_init__(self)->None:
-        self.lockers = {locker.locker_id: locker for locker in self.locker_repo.get_data()}
-        self.parcels = {parcel.parcel_id: parcel for parcel in self.parcel_repo.get_data()}
-        self.delivers = self.deliver_repo.get_data()
-        self.users = {user.email: user for user in self.user_repo.get_data()}
-        self.locker_usage = {locker_id: {LockerComponentsSize.SMALL: 0, LockerComponentsSize.MEDIUM: 0, LockerComponentsSize.LARGE: 0} for locker_id in self.lockers}
+        self.lockers = unique_index_of(self.locker_repo, "locker_id")
+        self.parcels = unique_index_of(self.parcel_repo, "parcel_id")
+        deliveries = snapshot_of(self.deliver_repo)
+        self.delivers = deliveries.data
+        self.users = unique_index_of(self.user_repo, "email")
+        self.partitions = partition_index_of(deliveries, "locker_id")
+        self.occupancy = OccupancyMatrix(self.lockers)
+        self.locker_usage = self.occupancy.as_dict()
+        self._delivery_table = DeliveryTable()
+        self._delivery_table_source: tuple[object, Sequence[Delivers]] | None = None
+
+    def pinned(self) -> "PurchaseSummaryService":
+        """
+        Returns a copy of the service over the current snapshots of the repositories. The copy keeps
+        seeing the same versions while the repositories refresh, so queries over it are consistent.
+        """
+        return replace(self)
 
     def get_parcel_size(self, parcel: Parcels)->LockerComponentsSize:
-        if parcel.height <= 10 and parcel.length <= 20:
-            return LockerComponentsSize.SMALL
-        elif parcel.height <= 30 and parcel.length <= 50:
-            return LockerComponentsSize.MEDIUM
-        else:
-            return LockerComponentsSize.LARGE
+        return parcel.size
+
+    def delivery_table(self) -> DeliveryTable:
+        """
+        Returns the deliveries as a column-wise table. The table is rebuilt only when the snapshot
+        version of the delivery repository changes or `delivers` is replaced; like the snapshot
+        data, `delivers` is not modified in place.
+        """
+        version = self.deliver_repo.version
+        source = self._delivery_table_source
+        if source is None or source[0] != version or source[1] is not self.delivers:
+            self._delivery_table = DeliveryTable.from_delivers(self.delivers)
+            self._delivery_table_source = (version, self.delivers)
+        return self._delivery_table
+
+    def _count_locker_usage(self) -> None:
+        """
+        Recomputes the occupancy matrix with a single pass over the delivery table columns.
+        `locker_usage` holds one view vector per locker into the matrix.
+        """
+        table = self.delivery_table()
+        parcels = [self.parcels.get(parcel_id) for parcel_id in table.parcel.values]
+        size_by_parcel_code = [None if parcel is None else self.get_parcel_size(parcel).ordinal for parcel in parcels]
+        usage = Counter(zip(table.locker.codes, map(size_by_parcel_code.__getitem__, table.parcel.codes)))
+
+        self.occupancy = OccupancyMatrix(self.lockers)
+        for (locker_code, size), count in usage.items():
+            locker_id = table.locker.values[locker_code]
+            if size is None:
+                continue
+            if locker_id not in self.occupancy.rows:
+                logging.warning(f"Delivery to unknown locker {locker_id}. Skipping...")
+                continue
+            self.occupancy.add(locker_id, size, count)
+        self.locker_usage = self.occupancy.as_dict()
 
     def check_locker_capacity(self)->None:
-
-        for deliver in self.delivers:
+        self._count_locker_usage()
+        capacities = OccupancyMatrix.from_capacities(self.lockers[locker_id] for locker_id in self.occupancy.locker_ids)
+
+        for locker_id, size, num, max_capacity in self.occupancy.exceeding(capacities):
+            logging.error(
+            f"Locker {locker_id} exceeded capacity for {size} parcels. "
+            f"Used: {num}, Capacity: {max_capacity}"
+            )
+
+
+    def locker_usage_of(self, locker_id: str, sent_from: date | None = None, sent_to: date | None = None) -> CompartmentVector:
+        """
+        Counts the deliveries to a single locker per parcel size, optionally only those sent
+        within the given inclusive dates. Only the partitions of the locker are read.
+        """
+        usage = CompartmentVector()
+        for deliver in self.partitions.records_of(locker_id, sent_from, sent_to):
             parcel = self.parcels.get(deliver.parcel_id)
-            locker_id = deliver.locker_id
-
-            if parcel:
-                size = self.get_parcel_size(parcel)
-                self.locker_usage[locker_id][size] += 1
-
-            for locker_id, usage in self.locker_usage.items():
-                locker = self.lockers[locker_id]
-
-                for size, num in usage.items():
-                    max_capacity = locker.compartments[size]
-                    if num > max_capacity:
-                        logging.error(
-                        f"Locker {locker_id} exceeded capacity for {size} parcels. "
-                        f"Used: {num}, Capacity: {max_capacity}"
-                        )
-
-
-    def most_often_used_size_of_parcel(self)->dict[str, list[int]]:
-        most_popular_sizes = {}
-        for deliver in self.delivers:
-            locker_id = deliver.locker_id
-            parcel = self.parcels.get(deliver.parcel_id)
-
-
             if parcel is not None:
-                size = self.get_parcel_size(parcel)
-                self.locker_usage[locker_id][size] += 1
-
+                usage[self.get_parcel_size(parcel)] += 1
+        return usage
+
+    def check_capacity_of(self, locker_id: str) -> bool:
+        """
+        Checks the usage of a single locker against its capacity, logging every exceeded size.
+        Returns True if the locker is within its capacity.
+        """
+        usage = self.locker_usage_of(locker_id)
+        capacity = self.lockers[locker_id].compartments
+        within = True
+        for size, num in usage.items():
+            if num > capacity[size]:
+                within = False
+                logging.error(
+                f"Locker {locker_id} exceeded capacity for {size} parcels. "
+                f"Used: {num}, Capacity: {capacity[size]}"
+                )
+        return within
+
+    def most_often_used_sizes_of(self, locker_id: str) -> list[LockerComponentsSize]:
+        """
+        Returns the most frequently used parcel sizes of a single locker.
+        """
+        usage = self.locker_usage_of(locker_id)
+        most_popular_size = max(usage.values())
+        return [size for size, count in usage.items() if count == most_popular_size]
+
+    def most_often_used_size_of_parcel(self)->dict[str, list[LockerComponentsSize]]:
+        most_popular_sizes = {}
+        self._count_locker_usage()
 
-        for locker_id, dict_of_size in self.locker_usage.items():
-            most_popular_size = max(dict_of_size.values())
-            most_popular_sizes[locker_id] = [size for size, count in dict_of_size.items() if count == most_popular_size]
+        for locker_id, usage in self.locker_usage.items():
+            most_popular_size = max(usage.values())
+            most_popular_sizes[locker_id] = [size for size, count in usage.items() if count == most_popular_size]
 
         return most_popular_sizes
 
 
     def person_who_sended_and_picked_up_packages(self, how_many: int):
-        senders: Counter[str] = Counter()
-        receivers: Counter[str]  = Counter()
-
-
-        for deliver in self.delivers:
-            senders[deliver.sender_email] += 1
-            receivers[deliver.receiver_email] += 1
+        table = self.delivery_table()
+        senders = table.count_by("sender")
+        receivers = table.count_by("receiver")
 
         sorted_senders = dict(senders.most_common(how_many))
         sorted_receivers = dict(receivers.most_common(how_many))
@@ -143,22 +211,13 @@ class PurchaseSummaryService:
         return farthest_users
 
     def longest_delivery(self):
-        senders = {}
-        for deliver in self.delivers:
-            sender = deliver.sender_email
-            #logging.debug(sender)
-            delivery_duration = (deliver.expected_delivery_date - deliver.sent_date).days
-
-            if sender not in senders:
-                senders[sender] = []
-
-            senders[sender].append(delivery_duration)
-            logging.debug(senders)
-
-        longest_deliveries = {sender: max(days) for sender, days in senders.items()}
-        max_sender = max(longest_deliveries, key=lambda s: longest_deliveries[s])
-        longest_time = longest_deliveries[max_sender]
-        #logging.debug("++++")
-        #logging.debug(max_sender)
-        #logging.debug(longest_time)
-        return max_sender, longest_time
\ No newline at end of file
+        table = self.delivery_table()
+        durations = table.durations()
+        longest_time = max(durations)
+
+        # senders are encoded in order of first appearance, so the lowest code among the
+        # rows with the longest duration is the first sender reaching it
+        sender_codes = table.sender.codes
+        max_sender_code = min(sender_codes[row] for row in compress(range(len(durations)), map(longest_time.__eq__, durations)))
+        max_sender = table.sender.values[max_sender_code]
+        return max_sender, longest_time
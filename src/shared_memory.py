@@ -0,0 +1,297 @@
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Mapping
+from src.columnar import Buffer, ColumnarTable, ColumnKind, DictionaryColumn
+from src.repository import AbstractDataRepository
+import json
+import logging
+import struct
+import time
+
+logging.basicConfig(level=logging.INFO)
+
+MAGIC = b"LKRSHM01"
+HEADER = struct.Struct("<8sQQ")
+CONTROL = struct.Struct("<Q")
+ALIGNMENT = 8
+
+
+def segment_name(name: str, version: int) -> str:
+    """
+    Returns the name of the data segment holding a given version.
+
+    :param name: The name of the published data set.
+    :param version: The version of the data.
+    :return: The shared memory segment name.
+    """
+    return f"{name}-v{version}"
+
+
+def _aligned(offset: int) -> int:
+    """
+    Rounds an offset up to the alignment of the column buffers.
+    """
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _buffer(segment: SharedMemory) -> memoryview:
+    """
+    Returns the buffer of an open segment.
+
+    :raises ValueError: If the segment is closed.
+    """
+    if segment.buf is None:
+        raise ValueError(f"Shared memory segment {segment.name} is closed")
+    return segment.buf
+
+
+def _format(buffer: Buffer) -> str:
+    """
+    Returns the array type code of a column buffer.
+    """
+    return buffer.typecode if isinstance(buffer, array) else buffer.format
+
+
+def _layout(tables: Mapping[str, ColumnarTable]) -> tuple[dict[str, Any], list[tuple[int, memoryview]], int]:
+    """
+    Computes the layout of a data segment: the column descriptors, the buffers to copy and the total size.
+    Numeric columns are stored as raw buffers and string columns as their codes, with the distinct
+    values kept in the descriptors.
+    """
+    descriptors: dict[str, Any] = {}
+    buffers: list[tuple[int, memoryview]] = []
+    offset = 0
+    for table_name, table in tables.items():
+        columns: dict[str, Any] = {}
+        for column_name, kind in table.kinds.items():
+            column = table.column(column_name)
+            descriptor: dict[str, Any] = {"kind": kind.value, "offset": offset}
+            if isinstance(column, DictionaryColumn):
+                descriptor["values"] = column.values
+                data = memoryview(column.codes).cast("B")
+                descriptor["format"] = _format(column.codes)
+            else:
+                data = memoryview(column).cast("B")
+                descriptor["format"] = _format(column)
+            descriptor["length"] = len(column)
+            buffers.append((offset, data))
+            columns[column_name] = descriptor
+            offset = _aligned(offset + data.nbytes)
+        descriptors[table_name] = {"rows": len(table), "columns": columns}
+    return descriptors, buffers, offset
+
+
+class SharedRepositoryPublisher:
+    """
+    Publishes columnar repository data into shared memory, so that several worker processes
+    read one copy of it instead of each loading the same repositories.
+
+    Every publication is written to a new data segment (`<name>-v<version>`) holding a header,
+    the JSON column descriptors and the column buffers. A small control segment named `name`
+    holds the current version; it is only updated once the data segment is complete, so readers
+    never see a partial publication. The previous data segment is unlinked, which keeps it
+    mapped by the readers still attached to it until they move on.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Creates the control segment, at version 0 until the first publication.
+
+        :param name: The name of the published data set, shared with the readers.
+        :raises FileExistsError: If another publisher already uses the name.
+        """
+        self.name = name
+        self.version = 0
+        self._control = SharedMemory(name, create=True, size=CONTROL.size)
+        CONTROL.pack_into(_buffer(self._control), 0, 0)
+        self._segment: SharedMemory | None = None
+
+    def publish(self, tables: Mapping[str, ColumnarTable]) -> int:
+        """
+        Publishes a new version of the tables.
+
+        :param tables: The columnar tables by name, e.g. one per repository.
+        :return: The new version.
+        """
+        descriptors, buffers, size = _layout(tables)
+        version = self.version + 1
+        metadata = json.dumps({"tables": descriptors}).encode("utf8")
+        start = _aligned(HEADER.size + len(metadata))
+        segment = SharedMemory(segment_name(self.name, version), create=True, size=max(start + size, 1))
+        buffer = _buffer(segment)
+        HEADER.pack_into(buffer, 0, MAGIC, version, len(metadata))
+        buffer[HEADER.size:HEADER.size + len(metadata)] = metadata
+        for offset, data in buffers:
+            buffer[start + offset:start + offset + data.nbytes] = data
+
+        previous = self._segment
+        self._segment = segment
+        self.version = version
+        CONTROL.pack_into(_buffer(self._control), 0, version)
+        if previous is not None:
+            previous.close()
+            previous.unlink()
+        logging.info(f"Published version {version} of {self.name} ({start + size} B)")
+        return version
+
+    def publish_repositories(self, repositories: Mapping[str, AbstractDataRepository]) -> int:
+        """
+        Publishes the current data of repositories, converted to columnar tables by their converters.
+
+        :param repositories: The repositories by table name.
+        :return: The new version.
+        """
+        return self.publish({
+            name: repository.converter.convert_many(record.to_dict() for record in repository.get_data())
+            for name, repository in repositories.items()
+        })
+
+    def close(self) -> None:
+        """
+        Unlinks the data and control segments. Attached readers keep their current mapping.
+        """
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+            self._segment = None
+        self._control.close()
+        self._control.unlink()
+
+
+class SharedRepositoryReader:
+    """
+    A read-only view of the tables published by a `SharedRepositoryPublisher`.
+
+    Numeric and date columns are memoryviews cast to their array type code, and string columns
+    are `DictionaryColumn` instances whose codes are such memoryviews, so attaching copies
+    nothing but the distinct string values. The views stay valid until the reader moves to a
+    newer version with `refresh` or is closed.
+    """
+
+    def __init__(self, name: str, attempts: int = 10) -> None:
+        """
+        Attaches to the current version of the published tables.
+
+        :param name: The name of the published data set.
+        :param attempts: How many times to retry when a newer version is published while attaching.
+        :raises FileNotFoundError: If nothing is published under the name.
+        """
+        self.name = name
+        self.attempts = attempts
+        self.version = 0
+        self.tables: dict[str, ColumnarTable] = {}
+        self._control = SharedMemory(name, track=False)
+        self._segment: SharedMemory | None = None
+        self._views: list[memoryview] = []
+        self._retired: list[tuple[SharedMemory, list[memoryview]]] = []
+        try:
+            self.refresh()
+        except Exception:
+            self._control.close()
+            raise
+
+    def published_version(self) -> int:
+        """
+        Returns the version currently published, which may be newer than the attached one.
+        """
+        return CONTROL.unpack_from(_buffer(self._control), 0)[0]
+
+    def changed(self) -> bool:
+        """
+        Tells whether a newer version was published since the reader attached.
+        """
+        return self.published_version() != self.version
+
+    def refresh(self) -> bool:
+        """
+        Attaches to the published version if it is newer than the attached one.
+
+        :return: True if the reader moved to a new version.
+        :raises FileNotFoundError: If the published segment kept disappearing while attaching.
+        """
+        for _ in range(self.attempts):
+            version = self.published_version()
+            if version == 0:
+                raise FileNotFoundError(f"Nothing is published under {self.name} yet")
+            if version == self.version:
+                return False
+            try:
+                segment = SharedMemory(segment_name(self.name, version), track=False)
+            except FileNotFoundError:
+                time.sleep(0.001)
+                continue
+            self._attach(segment)
+            return True
+        raise FileNotFoundError(f"Could not attach to {self.name} after {self.attempts} attempts")
+
+    def _attach(self, segment: SharedMemory) -> None:
+        """
+        Builds the table views over a data segment and retires the previous one.
+        """
+        buffer = _buffer(segment).toreadonly()
+        magic, version, length = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            buffer.release()
+            segment.close()
+            raise ValueError(f"{segment.name} is not a published repository segment")
+        metadata = json.loads(bytes(buffer[HEADER.size:HEADER.size + length]))
+        start = _aligned(HEADER.size + length)
+
+        views = [buffer]
+        tables: dict[str, ColumnarTable] = {}
+        for table_name, descriptor in metadata["tables"].items():
+            kinds: dict[str, ColumnKind] = {}
+            columns: dict[str, Any] = {}
+            for column_name, column in descriptor["columns"].items():
+                size = struct.calcsize(column["format"]) * column["length"]
+                offset = start + column["offset"]
+                view = buffer[offset:offset + size].cast(column["format"])
+                views.append(view)
+                kinds[column_name] = ColumnKind(column["kind"])
+                if "values" in column:
+                    columns[column_name] = DictionaryColumn(column["values"], view)
+                else:
+                    columns[column_name] = view
+            tables[table_name] = ColumnarTable(kinds, columns)
+
+        self._retire()
+        self._segment, self._views = segment, views
+        self.tables = tables
+        self.version = version
+
+    def _retire(self) -> None:
+        """
+        Releases the views of the attached segment and closes it, along with earlier segments
+        that could not be closed yet because views derived from them were still in use.
+        """
+        if self._segment is not None:
+            self._retired.append((self._segment, self._views))
+            self._segment, self._views = None, []
+        pending = []
+        for segment, views in self._retired:
+            try:
+                for view in views:
+                    view.release()
+                segment.close()
+            except BufferError:
+                pending.append((segment, views))
+        if pending:
+            logging.warning(f"{len(pending)} segments of {self.name} are still referenced and stay mapped")
+        self._retired = pending
+
+    def table(self, name: str) -> ColumnarTable:
+        """
+        Returns a published table.
+
+        :param name: The table name.
+        :return: The read-only columnar table.
+        """
+        return self.tables[name]
+
+    def close(self) -> None:
+        """
+        Detaches from the data and control segments, invalidating the table views.
+        """
+        self.tables = {}
+        self._retire()
+        self._control.close()
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
-from src.repository import AbstractDataRepository
+from typing import Mapping
+from src.model import Delivers
+from src.repository import AbstractDataRepository, unique_index_of
 
 
 @dataclass
@@ -12,12 +14,13 @@ class SpeechRecognizerService:
 
     deliver_repo: AbstractDataRepository
 
-    def __post_init__(self):
+    @property
+    def delivers(self) -> Mapping[str, Delivers]:
         """
-        Initializes the service by loading package data from the repository and storing it in a dictionary
-        for quick lookups by parcel ID. This is called automatically after the class is instantiated.
+        The deliveries by parcel ID, taken from the current repository snapshot on every access
+        so that a long-running conversation sees reloaded data.
         """
-        self.delivers = {deliver.parcel_id: deliver for deliver in self.deliver_repo.get_data()}
+        return unique_index_of(self.deliver_repo, "parcel_id")
 
     def find_locker(self, number: str) -> str:
         """
@@ -30,10 +33,11 @@ class SpeechRecognizerService:
             str: A message indicating whether the package exists and the locker number if available.
         """
         correct_num = number.strip().upper()  # Ensures the parcel number is clean and in uppercase
-        if correct_num not in self.delivers.keys():
+        delivers = self.delivers
+        if correct_num not in delivers:
             return f"Your package does not exist"
 
-        locker_num = self.delivers[correct_num].locker_id  # Get locker id from the deliver object
+        locker_num = delivers[correct_num].locker_id  # Get locker id from the deliver object
         return f"Your package {correct_num} is in locker {locker_num}"
 
     def read_report(self):
@@ -0,0 +1,42 @@
+from array import array
+from src.columnar import ColumnarTable, ColumnKind, DictionaryColumn
+import pytest
+
+
+def test_dictionary_column_encodes_in_first_appearance_order() -> None:
+    """
+    Tests that a DictionaryColumn stores each distinct value once and assigns codes
+    in order of first appearance.
+    """
+    column = DictionaryColumn()
+    for value in ["L001", "L002", "L001", "L003"]:
+        column.append(value)
+
+    assert column.values == ["L001", "L002", "L003"]
+    assert list(column.codes) == [0, 1, 0, 2]
+    assert column.code_of("L002") == 1
+    assert column.code_of("L999") is None
+    assert column[2] == "L001"
+    assert column.decode() == ["L001", "L002", "L001", "L003"]
+
+
+def test_columnar_table_creates_typed_buffers() -> None:
+    """
+    Tests that a ColumnarTable creates a typed buffer per declared column and
+    appends rows column by column.
+    """
+    table = ColumnarTable({"id": ColumnKind.STRING, "height": ColumnKind.INT, "latitude": ColumnKind.FLOAT})
+    table.append_row(("P1", 10, 1.5))
+    table.append_row(("P2", 20, 2.5))
+
+    assert len(table) == 2
+    assert isinstance(table.column("id"), DictionaryColumn)
+    assert table.column("height") == array("q", [10, 20])
+    assert table.column("latitude") == array("d", [1.5, 2.5])
+    assert list(table.rows()) == [("P1", 10, 1.5), ("P2", 20, 2.5)]
+    assert table.strings("id").decode() == ["P1", "P2"]
+    assert table.numeric("height") is table.column("height")
+    with pytest.raises(TypeError):
+        table.numeric("id")
+    with pytest.raises(TypeError):
+        table.strings("latitude")
@@ -1,5 +1,7 @@
+from datetime import date
 from pytest import FixtureRequest
-from src.converter import UserConverter, ParcelConverter, LockerConverter, DeliversConverter
+from src.converter import Converter, DataclassConverter, UserConverter, ParcelConverter, LockerConverter, DeliversConverter
+from src.model import Users, Parcels, Lockers, Delivers, LockerComponentsSize, ParcelSizeClassifier
 
 import pytest
 
@@ -85,4 +87,130 @@ def test_delivers_converter_from_json(deliver_data_fixture_name: str, deliver_fi
     converter = DeliversConverter()
     result = converter.convert(deliver_data)
 
-    assert result.sender_email == deliver.sender_email
\ No newline at end of file
+    assert result.sender_email == deliver.sender_email
+
+def test_delivers_converter_convert_many(deliver_1_data: dict, deliver_2_data: dict) -> None:
+    """
+    Tests that a batch of delivery dictionaries is converted into a columnar table with
+    dictionary-encoded strings and date ordinals.
+
+    :param deliver_1_data: Dictionary containing the first delivery.
+    :param deliver_2_data: Dictionary containing the second delivery.
+    """
+    table = DeliversConverter().convert_many([deliver_1_data, deliver_2_data, deliver_1_data])
+
+    assert len(table) == 3
+    assert table.strings("locker_id").decode() == ["L002", "L003", "L002"]
+    assert list(table.strings("locker_id").codes) == [0, 1, 0]
+    assert list(table.numeric("sent_date")) == [
+        date(2023, 12, 2).toordinal(),
+        date(2023, 12, 3).toordinal(),
+        date(2023, 12, 2).toordinal(),
+    ]
+
+
+def test_locker_converter_convert_many_flattens_compartments(locker_1_data: dict, locker_2_data: dict) -> None:
+    """
+    Tests that locker compartments are flattened into one integer column per size.
+
+    :param locker_1_data: Dictionary containing the first locker.
+    :param locker_2_data: Dictionary containing the second locker.
+    """
+    table = LockerConverter().convert_many([locker_1_data, locker_2_data])
+
+    assert list(table.numeric("compartments_small")) == [25, 20]
+    assert list(table.numeric("compartments_large")) == [8, 5]
+    assert list(table.numeric("latitude")) == [34.052235, 47.606209]
+
+
+def test_locker_converter_row_falls_back_like_convert(locker_1_data: dict) -> None:
+    """
+    Tests that an invalid coordinate falls back to 0.0 in rows, as it does in converted lockers.
+
+    :param locker_1_data: Dictionary containing the first locker.
+    """
+    converter = LockerConverter()
+    data = {**locker_1_data, "latitude": "north", "longitude": None}
+
+    assert converter.row(data)[2:4] == (0.0, 0.0)
+    assert (converter.convert(data).latitude, converter.convert(data).longitude) == (0.0, 0.0)
+
+
+@pytest.mark.parametrize("model, converter, data_fixture_name", [
+    (Users, UserConverter(), "user_1_data"),
+    (Parcels, ParcelConverter(), "parcel_1_data"),
+    (Lockers, LockerConverter(), "locker_1_data"),
+    (Delivers, DeliversConverter(), "deliver_1_data"),
+])
+def test_dataclass_converter_matches_hand_written(model: type, converter: Converter, data_fixture_name: str,
+                                                  request: FixtureRequest) -> None:
+    """
+    Tests that the generated converter produces the same objects and rows as the hand-written one.
+
+    :param model: The dataclass the generated converter produces.
+    :param converter: The hand-written converter for the same model.
+    :param data_fixture_name: The fixture name containing the raw data.
+    :param request: Pytest request object to retrieve fixture values.
+    """
+    data = request.getfixturevalue(data_fixture_name)
+    generated: Converter = DataclassConverter(model)
+
+    assert generated.convert(data) == converter.convert(data)
+    assert generated.columns == converter.columns
+    assert generated.row(data) == converter.row(data)
+
+
+def test_dataclass_converter_parses_string_dates() -> None:
+    """
+    Tests that the generated converter parses ISO and non zero-padded date strings.
+    """
+    converter = DataclassConverter(Delivers)
+    result = converter.convert({
+        "parcel_id": "P1",
+        "locker_id": "L1",
+        "sender_email": "a@example.com",
+        "receiver_email": "b@example.com",
+        "sent_date": "2023-12-01",
+        "expected_delivery_date": "2023-12-5",
+    })
+
+    assert result.sent_date == date(2023, 12, 1)
+    assert result.expected_delivery_date == date(2023, 12, 5)
+
+
+def test_dataclass_converter_agrees_on_invalid_floats(user_1_data: dict, locker_1_data: dict) -> None:
+    """
+    Tests that the generated converters handle invalid floats like the hand-written ones: users raise,
+    while the lenient locker coordinates fall back to 0.0.
+
+    :param user_1_data: Dictionary containing the first user.
+    :param locker_1_data: Dictionary containing the first locker.
+    """
+    user = user_1_data | {"latitude": "x"}
+    for converter in (UserConverter(), DataclassConverter(Users)):
+        with pytest.raises(ValueError):
+            converter.convert(user)
+        with pytest.raises(ValueError):
+            converter.row(user)
+
+    locker = {key: value for key, value in locker_1_data.items() if key != "longitude"} | {"latitude": "north"}
+    generated = DataclassConverter(Lockers)
+    assert generated.convert(locker) == LockerConverter().convert(locker)
+    assert generated.row(locker) == LockerConverter().row(locker)
+    assert generated.row(locker)[2:4] == (0.0, 0.0)
+
+
+def test_parcel_converter_uses_classifier(parcel_1_data: dict, parcel_2_data: dict) -> None:
+    """
+    Tests that the parcel converter computes the size with its classifier, singly and in batches.
+
+    :param parcel_1_data: Dictionary containing the first parcel.
+    :param parcel_2_data: Dictionary containing the second parcel.
+    """
+    classifier = ParcelSizeClassifier(thresholds=((15, 30, LockerComponentsSize.SMALL),))
+    converter = ParcelConverter(classifier)
+
+    assert converter.convert(parcel_1_data).size == LockerComponentsSize.LARGE
+    assert converter.convert(parcel_2_data).size == LockerComponentsSize.SMALL
+    table = converter.convert_many([parcel_1_data, parcel_2_data])
+    assert list(table.numeric("size")) == [LockerComponentsSize.LARGE.ordinal, LockerComponentsSize.SMALL.ordinal]
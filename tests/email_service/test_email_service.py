@@ -157,3 +157,28 @@ def test_find_parcel_locker(email_service: EmailService, parcel_11: Parcels, cap
     assert medium is None
     assert large is None
     assert "email is incorrect" in caplog.text
+
+def test_send_email_to_receiver_notifies_every_receiver(
+        purchase_summary_service: PurchaseSummaryService,
+        mock_deliver_repo: MagicMock,
+        deliver_11,
+        deliver_22
+) -> None:
+    """
+    Tests that every receiver with a delivery to the locker is notified, not only the last one.
+    """
+    second = type(deliver_22)(
+        parcel_id="P99999",
+        locker_id="L002",
+        sender_email="alice.smith@gmail.com",
+        receiver_email="john.doe@gmail.com",
+        sent_date=deliver_22.sent_date,
+        expected_delivery_date=deliver_22.expected_delivery_date
+    )
+    mock_deliver_repo.get_data.return_value = [deliver_11, deliver_22, second]
+    email_service = EmailService(service=purchase_summary_service)
+
+    with patch.object(email_service, "send_email", new=MagicMock()) as mock_send_email:
+        email_service.send_email_to_receiver("L002", True)
+
+    assert [call.args[0] for call in mock_send_email.call_args_list] == ["jane.smith@gmail.com", "john.doe@gmail.com"]
@@ -8,7 +8,7 @@ from src.file_service import (
     LockerJsonFileWriter,
     DeliverJsonFileWriter
 )
-from src.model import UserDataDict, LockersDataDict, DeliversDataDict, ParcelsDataDict, Lockers, Delivers, Parcels
+from src.model import UserDataDict, LockersDataDict, DeliversDataDict, ParcelsDataDict, Lockers, Delivers, Parcels, Users
 
 import os
 import json
@@ -57,3 +57,27 @@ def test_writer_user(tmpdir, user_data: list[UserDataDict]) -> None:
         saved_data = json.load(file)
 
     assert saved_data == user_data
+
+def test_write_models_round_trip(tmpdir, user_1: Users, user_2: Users) -> None:
+    """
+    Test writing user models in bulk and reading them back as dictionaries.
+    """
+    file_path = os.path.join(tmpdir, 'exported_users.json')
+    writer = UserJsonFileWriter()
+
+    assert writer.write_models(file_path, [user_1, user_2]) == 2
+    assert UserJsonFileReader().read(file_path) == [user_1.to_dict(), user_2.to_dict()]
+
+
+def test_iter_read_streams_json_lines(tmp_path) -> None:
+    """
+    Tests that `iter_read` streams JSON lines files and falls back to `read` for JSON files.
+    """
+    reader = UserJsonFileReader()
+    lines_file = tmp_path / "users.jsonl"
+    lines_file.write_text('{"email": "a@gmail.com"}\n\n{"email": "b@gmail.com"}\n', encoding="utf8")
+    json_file = tmp_path / "users.json"
+    json_file.write_text('[{"email": "a@gmail.com"}]', encoding="utf8")
+
+    assert list(reader.iter_read(str(lines_file))) == [{"email": "a@gmail.com"}, {"email": "b@gmail.com"}]
+    assert list(reader.iter_read(str(json_file))) == [{"email": "a@gmail.com"}]
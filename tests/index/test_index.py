@@ -0,0 +1,94 @@
+from datetime import date
+from src.index import MultiIndex, SortedIndex, UniqueIndex
+from src.model import Delivers
+import pytest
+
+
+@pytest.fixture
+def delivers() -> list[Delivers]:
+    """
+    Returns three deliveries, two of them to the same locker.
+    """
+    return [
+        Delivers("P1", "L1", "a@gmail.com", "b@gmail.com", date(2024, 1, 1), date(2024, 1, 3)),
+        Delivers("P2", "L2", "a@gmail.com", "c@gmail.com", date(2024, 1, 2), date(2024, 1, 4)),
+        Delivers("P3", "L1", "b@gmail.com", "c@gmail.com", date(2024, 1, 3), date(2024, 1, 5)),
+    ]
+
+
+def test_unique_index_lookup_and_maintenance(delivers: list[Delivers]) -> None:
+    """
+    Tests that a unique index resolves keys and follows additions, replacements and removals.
+    """
+    index: UniqueIndex[str, Delivers] = UniqueIndex("parcel_id", delivers)
+
+    assert index["P2"] is delivers[1]
+    assert "P4" not in index
+    assert index.get("P4") is None
+    assert len(index) == 3
+
+    updated = Delivers("P2", "L3", "a@gmail.com", "c@gmail.com", date(2024, 1, 2), date(2024, 1, 4))
+    index.replace(delivers[1], updated)
+    index.remove(delivers[0])
+
+    assert index["P2"] is updated
+    assert list(index) == ["P2", "P3"]
+
+
+def test_unique_index_counts_duplicates(delivers: list[Delivers]) -> None:
+    """
+    Tests that the last record wins when records share a key and that shadowed records are counted.
+    """
+    index: UniqueIndex[str, Delivers] = UniqueIndex("locker_id", delivers)
+
+    assert index["L1"] is delivers[2]
+    assert index.duplicates == 1
+
+
+def test_multi_index_keeps_all_records(delivers: list[Delivers]) -> None:
+    """
+    Tests that a multi-valued index keeps every record of a key in order and drops empty keys.
+    """
+    index: MultiIndex[str, Delivers] = MultiIndex("locker_id", delivers)
+
+    assert index["L1"] == [delivers[0], delivers[2]]
+    assert index.lookup("L9") == []
+
+    moved = Delivers("P1", "L2", "a@gmail.com", "b@gmail.com", date(2024, 1, 1), date(2024, 1, 3))
+    index.replace(delivers[0], moved)
+    index.remove(delivers[2])
+
+    assert "L1" not in index
+    assert index["L2"] == [delivers[1], moved]
+
+
+def test_sorted_index_range(delivers: list[Delivers]) -> None:
+    """
+    Tests that a sorted index answers inclusive range queries and stays ordered on insertion.
+    """
+    index: SortedIndex[date, Delivers] = SortedIndex("sent_date", reversed(delivers))
+
+    assert index.range(date(2024, 1, 2), date(2024, 1, 3)) == delivers[1:]
+    assert index.count(end=date(2024, 1, 1)) == 1
+
+    late = Delivers("P4", "L1", "a@gmail.com", "b@gmail.com", date(2024, 1, 2), date(2024, 1, 9))
+    index.add(late)
+    index.remove(delivers[0])
+
+    assert list(index) == [delivers[1], late, delivers[2]]
+
+
+def test_copies_are_independent(delivers: list[Delivers]) -> None:
+    """
+    Tests that modifying a copy of an index leaves the original unchanged.
+    """
+    unique: UniqueIndex[str, Delivers] = UniqueIndex("parcel_id", delivers)
+    multi: MultiIndex[str, Delivers] = MultiIndex("locker_id", delivers)
+    ordered: SortedIndex[date, Delivers] = SortedIndex("sent_date", delivers)
+
+    for index in (unique.copy(), multi.copy(), ordered.copy()):
+        index.remove(delivers[0])
+
+    assert "P1" in unique
+    assert multi["L1"] == [delivers[0], delivers[2]]
+    assert list(ordered) == delivers
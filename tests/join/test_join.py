@@ -0,0 +1,87 @@
+from datetime import date
+from unittest.mock import MagicMock
+from src.converter import LockerConverter
+from src.join import JoinCondition, JoinEngine
+from src.model import City, Delivers, Lockers, LockerComponentsSize, Users
+from src.repository import LockerDataRepository
+import pytest
+
+
+@pytest.fixture
+def delivers() -> list[Delivers]:
+    """
+    Returns deliveries from a known and an unknown sender.
+    """
+    return [
+        Delivers("P1", "L1", "bob@gmail.com", "ann@gmail.com", date(2024, 1, 1), date(2024, 1, 3)),
+        Delivers("P2", "L1", "ghost@gmail.com", "ann@gmail.com", date(2024, 1, 1), date(2024, 1, 3)),
+    ]
+
+
+@pytest.fixture
+def user_repo() -> MagicMock:
+    """
+    Provides a mocked user repository with a single user.
+    """
+    repo = MagicMock()
+    repo.get_data.return_value = [Users("bob@gmail.com", "Bob", "Jones", City.NEW_YORK, 1.0, 2.0)]
+    return repo
+
+
+def test_inner_join_streams_matches_and_reports_misses(delivers: list[Delivers], user_repo: MagicMock) -> None:
+    """
+    Tests that the inner join yields matched rows and reports unmatched rows to `on_miss`.
+    """
+    missed: list[Delivers] = []
+
+    rows = JoinEngine().inner(delivers, JoinCondition("sender_email", user_repo, "email"), on_miss=missed.append)
+
+    assert [(deliver.parcel_id, user.name) for deliver, user in rows] == [("P1", "Bob")]
+    assert missed == [delivers[1]]
+
+
+def test_anti_join_returns_dangling_rows(delivers: list[Delivers], user_repo: MagicMock) -> None:
+    """
+    Tests that the anti join yields only the rows without a match.
+    """
+    assert list(JoinEngine().anti(delivers, JoinCondition("sender_email", user_repo, "email"))) == [delivers[1]]
+
+
+def test_unique_condition_keeps_the_last_record(delivers: list[Delivers], user_repo: MagicMock) -> None:
+    """
+    Tests that a unique condition matches only the last record of a duplicated key, like a dictionary.
+    """
+    renamed = Users("bob@gmail.com", "Robert", "Jones", City.NEW_YORK, 1.0, 2.0)
+    user_repo.get_data.return_value = [*user_repo.get_data.return_value, renamed]
+
+    unique_rows = JoinEngine().inner(delivers, JoinCondition("sender_email", user_repo, "email", unique=True))
+    multi_rows = JoinEngine().inner(delivers, JoinCondition("sender_email", user_repo, "email"))
+
+    assert [user.name for _, user in unique_rows] == ["Robert"]
+    assert [user.name for _, user in multi_rows] == ["Bob", "Robert"]
+
+
+def test_index_is_cached_per_repository_version() -> None:
+    """
+    Tests that an index on an undeclared attribute is built once per repository version.
+    """
+    locker = Lockers("L1", City.NEW_YORK, 1.0, 2.0, {LockerComponentsSize.SMALL: 1})
+    file_reader = MagicMock()
+    file_reader.read.return_value = [{
+        "locker_id": "L1", "city": "New York", "latitude": 1.0, "longitude": 2.0,
+        "compartments": {"small": 1, "medium": 0, "large": 0}
+    }]
+    validator = MagicMock()
+    validator.validate.return_value = True
+    repository = LockerDataRepository(file_reader, validator, LockerConverter(), "lockers.json")
+    engine = JoinEngine()
+
+    first = engine.probe(repository, "city")
+    assert engine.probe(repository, "city") == first
+    assert first(City.NEW_YORK) == [locker]
+
+    file_reader.read.return_value = []
+    repository.refresh()
+
+    assert engine.probe(repository, "city") != first
+    assert engine.probe(repository, "city")(City.NEW_YORK) == []
@@ -0,0 +1,80 @@
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+from src.converter import ParcelConverter
+from src.file_service import ParcelJsonFileReader
+from src.layered_repository import LayeredDataRepository
+import json
+import pytest
+
+
+def _write_lines(path: Path, entries: list[Any]) -> None:
+    path.write_text("".join(json.dumps(entry) + "\n" for entry in entries), encoding="utf8")
+
+
+@pytest.fixture
+def repository(tmp_path: Path) -> LayeredDataRepository:
+    """
+    Provides a layered parcel repository over a base of three parcels and a missing delta file.
+    """
+    _write_lines(tmp_path / "base.jsonl", [
+        {"parcel_id": f"P{number}", "height": 10 * number, "length": 20, "weight": 1}
+        for number in range(1, 4)
+    ])
+    validator = MagicMock()
+    validator.validate.return_value = True
+    converter = MagicMock(wraps=ParcelConverter())
+    return LayeredDataRepository(
+        file_reader=ParcelJsonFileReader(),
+        validator=validator,
+        converter=converter,
+        base_filename=str(tmp_path / "base.jsonl"),
+        delta_filenames=[str(tmp_path / "delta.jsonl")],
+        key_field="parcel_id",
+        cache_size=2
+    )
+
+
+def test_base_records_are_converted_on_access(repository: LayeredDataRepository) -> None:
+    """
+    Tests that the base is indexed without converting records until they are accessed.
+
+    Asserts:
+        - No record is converted on creation and a lookup converts only its record.
+        - All base records are listed in base order.
+    """
+    assert repository.converter.convert.call_count == 0  # type: ignore[attr-defined]
+
+    record = repository.get("P2")
+    assert record is not None and record.height == 20
+    assert repository.converter.convert.call_count == 1  # type: ignore[attr-defined]
+    assert [parcel.parcel_id for parcel in repository.get_data()] == ["P1", "P2", "P3"]
+    assert len(repository) == 3
+
+
+def test_delta_overrides_base_by_key(repository: LayeredDataRepository, tmp_path: Path) -> None:
+    """
+    Tests that a refreshed delta overrides, deletes and adds records without reading the base again.
+
+    Asserts:
+        - Overridden records keep their base position, deleted ones disappear, new ones come last.
+        - Entries that are not objects or have no key are skipped.
+        - An unchanged delta is not read again.
+    """
+    _write_lines(tmp_path / "delta.jsonl", [
+        {"parcel_id": "P2", "height": 25, "length": 20, "weight": 1},
+        {"parcel_id": "P3", "deleted": True},
+        {"parcel_id": "P4", "height": 40, "length": 20, "weight": 1},
+        {"height": 50, "length": 20, "weight": 1},
+        ["P5"],
+    ])
+
+    assert repository.refresh()
+    assert not repository.refresh()
+
+    assert [(parcel.parcel_id, parcel.height) for parcel in repository.get_data()] == [
+        ("P1", 10), ("P2", 25), ("P4", 40)
+    ]
+    assert repository.get("P3") is None and "P3" not in repository
+    assert len(repository) == 3
+    repository.close()
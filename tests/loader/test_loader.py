@@ -0,0 +1,114 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+from datetime import date
+from src.converter import DeliversConverter, LockerConverter, ParcelConverter
+from src.file_service import DeliverJsonFileReader, LockerJsonFileReader, ParcelJsonFileReader
+from src.loader import RepositoryLoader
+from src.repository import DeliverDataRepository, LoadMode, LockerDataRepository, ParcelDataRepository
+from src.validator import AbstractValidator, LockerDataDictValidator, ParcelDataDictValidator
+import json
+import pytest
+
+
+@pytest.fixture
+def repositories(tmp_path: Path) -> dict:
+    """
+    Provides a manually loaded locker and parcel repository over real files.
+    """
+    lockers = tmp_path / "lockers.json"
+    lockers.write_text(json.dumps([{
+        "locker_id": "L001",
+        "city": "New York",
+        "latitude": 40.73061,
+        "longitude": -73.935242,
+        "compartments": {"small": 20, "medium": 15, "large": 5}
+    }]), encoding="utf8")
+    parcels = tmp_path / "parcels.json"
+    parcels.write_text(json.dumps([
+        {"parcel_id": "P1", "height": 10, "length": 20, "weight": 1},
+        {"parcel_id": "P2", "height": 30, "length": 50, "weight": 2}
+    ]), encoding="utf8")
+    return {
+        "lockers": LockerDataRepository(
+            file_reader=LockerJsonFileReader(),
+            validator=LockerDataDictValidator(),
+            converter=LockerConverter(),
+            filename=str(lockers),
+            load_mode=LoadMode.MANUAL
+        ),
+        "parcels": ParcelDataRepository(
+            file_reader=ParcelJsonFileReader(),
+            validator=ParcelDataDictValidator(),
+            converter=ParcelConverter(),
+            filename=str(parcels),
+            load_mode=LoadMode.MANUAL
+        )
+    }
+
+
+def test_manual_repository_is_not_loaded(repositories: dict) -> None:
+    """
+    Tests that a repository in manual mode does not load its data on creation.
+    """
+    assert repositories["lockers"].data == []
+    assert repositories["lockers"].version == 0
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_load_all_repositories(repositories: dict, use_processes: bool) -> None:
+    """
+    Tests that the loader loads every repository, in threads or in worker processes, and reports timings.
+    """
+    report = RepositoryLoader(use_processes=use_processes).load(repositories)
+
+    assert [locker.locker_id for locker in repositories["lockers"].get_data()] == ["L001"]
+    assert list(repositories["parcels"].unique_index("parcel_id")) == ["P1", "P2"]
+    assert {name: timing.records for name, timing in report.timings.items()} == {"lockers": 1, "parcels": 2}
+    assert report.sequential_seconds >= 0
+    assert not repositories["lockers"].refresh()
+
+
+def test_load_reraises_errors_after_all_loads(repositories: dict) -> None:
+    """
+    Tests that a failing repository does not prevent the others from loading and that its error is raised.
+    """
+    failing = repositories["parcels"]
+    failing.file_reader = MagicMock()
+    failing.file_reader.read.side_effect = OSError("disk failure")
+
+    with pytest.raises(OSError, match="disk failure"):
+        RepositoryLoader().load(repositories)
+
+    assert len(repositories["lockers"].data) == 1
+
+
+def test_workers_keep_the_eviction_cutoff(tmp_path: Path) -> None:
+    """
+    Tests that deliveries evicted before a load in worker processes are not loaded again,
+    and that the source digest computed by the worker lets an unchanged source be skipped.
+    """
+    delivers = tmp_path / "delivers.json"
+    delivers.write_text(json.dumps([
+        {
+            "parcel_id": f"P{month}",
+            "locker_id": "L001",
+            "sender_email": "bob.jones@gmail.com",
+            "receiver_email": "jane.smith@gmail.com",
+            "sent_date": f"2024-{month:02d}-01",
+            "expected_delivery_date": f"2024-{month:02d}-03"
+        }
+        for month in (1, 2, 3)
+    ]), encoding="utf8")
+    repository = DeliverDataRepository(
+        file_reader=DeliverJsonFileReader(),
+        validator=AbstractValidator(),
+        converter=DeliversConverter(),
+        filename=str(delivers)
+    )
+    repository.evict_before(date(2024, 3, 15))
+
+    RepositoryLoader(use_processes=True).load({"delivers": repository})
+
+    assert [deliver.parcel_id for deliver in repository.get_data()] == ["P3"]
+    assert repository.snapshot().source is not None
+    assert not repository.refresh()
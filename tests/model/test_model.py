@@ -1,5 +1,12 @@
+from dataclasses import replace
+from datetime import date
 from src.model import (
+    CompartmentVector,
+    DEFAULT_PARCEL_SIZE_CLASSIFIER,
+    ParcelSizeClassifier,
     Delivers,
+    DeliveryTable,
+    OccupancyMatrix,
     Users,
     Parcels,
     Lockers,
@@ -55,3 +62,104 @@ def test_deliver_to_dict(deliver_1: Delivers, deliver_1_data: DeliversDataDict):
     """
     data = deliver_1.to_dict()
     assert data == deliver_1_data
+
+
+def test_models_are_slotted(user_1: Users, parcel_1: Parcels, locker_1: Lockers, deliver_1: Delivers):
+    """
+    Test that the models are slotted and carry no per-instance `__dict__`.
+    """
+    for model in (user_1, parcel_1, locker_1, deliver_1):
+        assert not hasattr(model, "__dict__")
+
+
+def test_models_hash_by_value(deliver_1: Delivers, deliver_1_data: DeliversDataDict):
+    """
+    Test that equal deliveries still hash equally, so they can be used as dictionary keys.
+    """
+    same_deliver = Delivers(**deliver_1_data)  # type: ignore[arg-type]
+    assert hash(same_deliver) == hash(deliver_1)
+    assert {deliver_1: 1}[same_deliver] == 1
+
+
+def test_delivery_table_filter_and_group(deliver_1: Delivers, deliver_2: Delivers):
+    """
+    Test that a `DeliveryTable` answers filters, group-by counts and durations over its columns.
+    """
+    table = DeliveryTable.from_delivers([deliver_1, deliver_2, deliver_1])
+
+    assert len(table) == 3
+    assert table.filter(locker_id="L002") == [0, 2]
+    assert table.filter(sender_email="alice.smith@gmail.com", sent_from=date(2023, 12, 3)) == [1]
+    assert table.filter(locker_id="L999") == []
+    assert table.count_by("sender") == {"bob.jones@gmail.com": 2, "alice.smith@gmail.com": 1}
+    assert list(table.durations()) == [4, 4, 4]
+    assert table.row(1) == deliver_2
+
+
+def test_locker_component_sizes_have_stable_ordinals():
+    """
+    Test that compartment sizes expose ordinals in declaration order and still look up by value.
+    """
+    assert [size.ordinal for size in LockerComponentsSize] == [0, 1, 2]
+    assert LockerComponentsSize("medium") is LockerComponentsSize.MEDIUM
+
+
+def test_locker_compartments_are_vectors(locker_1: Lockers):
+    """
+    Test that locker compartments given as a mapping are stored as a 3-slot vector that still
+    supports lookups by size.
+    """
+    assert isinstance(locker_1.compartments, CompartmentVector)
+    assert locker_1.compartments.values() == [25, 10, 8]
+    assert locker_1.compartments[LockerComponentsSize.MEDIUM] == 10
+    assert locker_1.compartments[2] == 8
+    assert locker_1.compartments == {LockerComponentsSize.SMALL: 25, LockerComponentsSize.MEDIUM: 10,
+                                     LockerComponentsSize.LARGE: 8}
+
+
+def test_occupancy_matrix_rows_share_one_buffer(locker_1: Lockers, locker_2: Lockers):
+    """
+    Test that an `OccupancyMatrix` keeps all lockers in one buffer and reports exceeded slots.
+    """
+    capacities = OccupancyMatrix.from_capacities([locker_1, locker_2])
+    usage = OccupancyMatrix(["L002", "L003"])
+    usage.add("L003", LockerComponentsSize.LARGE, 6)
+    row = usage.row("L002")
+    row[LockerComponentsSize.SMALL] = 3
+
+    assert list(usage.buffer) == [3, 0, 0, 0, 0, 6]
+    assert list(capacities.buffer) == [25, 10, 8, 20, 15, 5]
+    assert list(usage.exceeding(capacities)) == [("L003", LockerComponentsSize.LARGE, 6, 5)]
+
+
+def test_parcel_size_is_computed_once(parcel_1: Parcels, parcel_1_data: ParcelsDataDict):
+    """
+    Test that a parcel carries its compartment size without it affecting equality or `to_dict`,
+    and that the size follows the dimensions when they are replaced.
+    """
+    classifier = ParcelSizeClassifier(thresholds=((5, 5, LockerComponentsSize.SMALL),))
+    small = Parcels("P1", 5, 5, 1)
+
+    assert parcel_1.size == LockerComponentsSize.MEDIUM
+    assert parcel_1 == Parcels(**parcel_1_data, classifier=classifier)  # type: ignore[arg-type]
+    assert Parcels(**parcel_1_data, classifier=classifier).size == LockerComponentsSize.LARGE  # type: ignore[arg-type]
+    assert "size" not in parcel_1.to_dict()
+    assert small.size == LockerComponentsSize.SMALL
+    assert replace(small, height=100, length=100).size == LockerComponentsSize.LARGE
+
+
+def test_parcel_size_classifier_with_custom_thresholds():
+    """
+    Test that the classifier honours a configured threshold table, singly and in bulk.
+    """
+    classifier = ParcelSizeClassifier(thresholds=((5, 5, LockerComponentsSize.SMALL),))
+
+    assert classifier.classify(5, 5) == LockerComponentsSize.SMALL
+    assert classifier.classify(6, 5) == LockerComponentsSize.LARGE
+    assert classifier.classify_many([5, 6, 40], [5, 5, 10]) == [
+        LockerComponentsSize.SMALL, LockerComponentsSize.LARGE, LockerComponentsSize.LARGE
+    ]
+    assert DEFAULT_PARCEL_SIZE_CLASSIFIER.classify_many([5, 25, 35, 10], [10, 40, 60, 21]) == [
+        LockerComponentsSize.SMALL, LockerComponentsSize.MEDIUM, LockerComponentsSize.LARGE,
+        LockerComponentsSize.MEDIUM
+    ]
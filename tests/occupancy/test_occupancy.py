@@ -0,0 +1,92 @@
+from pathlib import Path
+from src.model import LockerComponentsSize, Lockers
+from src.occupancy import OccupancyEventType, OccupancyLog
+
+SMALL = LockerComponentsSize.SMALL
+LARGE = LockerComponentsSize.LARGE
+
+
+def test_events_update_occupancy_and_snapshots(locker_1: Lockers, locker_2: Lockers) -> None:
+    """
+    Tests that events update the occupancy at once and that snapshots cut the tail.
+
+    Asserts:
+        - Deposits occupy and pick ups free compartments.
+        - A snapshot is taken every `snapshot_interval` events, leaving a short tail.
+        - Rebuilding from the snapshot and the tail matches the live occupancy.
+    """
+    log = OccupancyLog([locker_1, locker_2], snapshot_interval=3)
+
+    log.deposit("L002", SMALL, "P1")
+    log.deposit("L002", SMALL, "P2")
+    log.deposit("L002", LARGE, "P3")
+    log.pick_up("L002", SMALL, "P1")
+
+    assert log.occupancy("L002")[SMALL] == 1
+    assert log.available("L002")[SMALL] == locker_1.compartments[SMALL] - 1
+    assert log.last_snapshot.sequence == 3
+    assert [event.event_type for event in log.tail] == [OccupancyEventType.PICKED_UP]
+    assert log.rebuild().row("L002") == log.occupancy("L002")
+
+
+def test_exceeding_reports_overfull_compartments(locker_1: Lockers) -> None:
+    """
+    Tests that compartments occupied beyond their capacity are reported.
+    """
+    log = OccupancyLog([locker_1])
+
+    for number in range(locker_1.compartments[LARGE] + 1):
+        log.deposit("L002", LARGE, f"P{number}")
+
+    assert list(log.exceeding()) == [("L002", LARGE, 9, 8)]
+
+
+def test_load_replays_only_events_after_snapshot(tmp_path: Path, locker_1: Lockers) -> None:
+    """
+    Tests that a persisted log is restored from its snapshot and the events written after it.
+
+    Asserts:
+        - The restored occupancy and sequence match the original log.
+        - Only the events after the snapshot are replayed into the tail.
+    """
+    path = str(tmp_path / "occupancy.jsonl")
+    log = OccupancyLog([locker_1], snapshot_interval=2, path=path)
+    log.deposit("L002", SMALL, "P1")
+    log.deposit("L002", SMALL, "P2")
+    log.free("L002", SMALL, "P1")
+    log.flush()
+
+    restored = OccupancyLog.load(path, [locker_1], snapshot_interval=2)
+
+    assert restored.sequence == 3
+    assert restored.occupancy("L002")[SMALL] == 1
+    assert [event.sequence for event in restored.tail] == [3]
+    log.close()
+    restored.close()
+
+
+def test_load_skips_events_of_untracked_lockers(tmp_path: Path, locker_1: Lockers, locker_2: Lockers) -> None:
+    """
+    Tests that a log restored without one of its lockers skips that locker's snapshot counts and events.
+
+    Asserts:
+        - Loading does not fail and the tracked locker is restored.
+        - The sequence still covers the skipped events, and they are not replayed into the tail.
+    """
+    path = str(tmp_path / "occupancy.jsonl")
+    log = OccupancyLog([locker_1, locker_2], snapshot_interval=3, path=path)
+    log.deposit("L003", SMALL, "P1")
+    log.deposit("L002", SMALL, "P2")
+    log.deposit("L002", SMALL, "P3")
+    log.deposit("L003", SMALL, "P4")
+    log.deposit("L002", SMALL, "P5")
+    log.flush()
+
+    restored = OccupancyLog.load(path, [locker_1], snapshot_interval=3)
+
+    assert restored.sequence == 5
+    assert restored.occupancy("L002")[SMALL] == 3
+    assert [event.sequence for event in restored.tail] == [5]
+    assert restored.rebuild().row("L002")[SMALL] == 3
+    log.close()
+    restored.close()
@@ -0,0 +1,161 @@
+from datetime import date
+from pathlib import Path
+from unittest.mock import MagicMock
+from src.converter import DeliversConverter
+from src.file_service import DeliverJsonFileReader
+from src.model import Delivers
+from src.paged_repository import PagedDataRepository
+from src.repository import DeliverDataRepository, LoadMode
+import gc
+import json
+import pytest
+import tempfile
+
+
+@pytest.fixture
+def delivers_file(tmp_path: Path) -> Path:
+    """
+    Writes ten deliveries as JSON lines and returns the file path.
+    """
+    path = tmp_path / "delivers.jsonl"
+    path.write_text("".join(
+        json.dumps({
+            "parcel_id": f"P{number}",
+            "locker_id": "L001",
+            "sender_email": "bob.jones@gmail.com",
+            "receiver_email": "jane.smith@gmail.com",
+            "sent_date": f"2024-01-{number + 1:02d}",
+            "expected_delivery_date": f"2024-01-{number + 3:02d}"
+        }) + "\n"
+        for number in range(10)
+    ), encoding="utf8")
+    return path
+
+
+@pytest.fixture
+def repository(delivers_file: Path, tmp_path: Path) -> PagedDataRepository:
+    """
+    Provides a paged repository of three-record pages with at most two pages in memory.
+    """
+    validator = MagicMock()
+    validator.validate.return_value = True
+    return PagedDataRepository(
+        file_reader=DeliverJsonFileReader(),
+        validator=validator,
+        converter=DeliversConverter(),
+        filename=str(delivers_file),
+        page_size=3,
+        max_pages=2,
+        store_path=str(tmp_path / "store.jsonl"),
+        key_field="parcel_id"
+    )
+
+
+def test_iterates_all_records_with_bounded_pages(repository: PagedDataRepository) -> None:
+    """
+    Tests that iterating the repository yields every record while keeping at most `max_pages` pages loaded.
+    """
+    records = list(repository.get_data())
+
+    assert len(repository) == 10
+    assert [deliver.parcel_id for deliver in records] == [f"P{number}" for number in range(10)]
+    assert records[4].sent_date == date(2024, 1, 5)
+    assert len(repository._pages) == 2
+
+
+def test_random_access_uses_lru_pages(repository: PagedDataRepository) -> None:
+    """
+    Tests that lookups hit loaded pages and fetch evicted pages again from the store.
+    """
+    assert repository[0].parcel_id == "P0"
+    assert repository.find("P1") is repository[1]
+    assert repository.hits == 2 and repository.misses == 1
+
+    repository.page(1)
+    repository.page(2)
+    assert isinstance(repository.find("P2"), Delivers)
+    assert repository.misses == 4
+    assert repository.find("missing") is None
+
+    with pytest.raises(IndexError):
+        repository[10]
+    assert [deliver.parcel_id for deliver in repository[8:]] == ["P8", "P9"]
+
+
+def test_temporary_store_is_removed_on_close(delivers_file: Path) -> None:
+    """
+    Tests that a repository without a store path spills to a temporary file deleted by `close`.
+    """
+    validator = MagicMock()
+    validator.validate.return_value = True
+    repository = PagedDataRepository(DeliverJsonFileReader(), validator, DeliversConverter(), str(delivers_file))
+    store = Path(str(repository.store_path))
+    assert store.exists()
+
+    repository.close()
+
+    assert not store.exists()
+
+
+def test_context_manager_and_finalizer_remove_the_files(delivers_file: Path) -> None:
+    """
+    Tests that the temporary store and the key index are deleted when leaving a `with` block,
+    and when a repository that was never closed is garbage collected.
+    """
+    validator = MagicMock()
+    validator.validate.return_value = True
+    with PagedDataRepository(
+            DeliverJsonFileReader(), validator, DeliversConverter(), str(delivers_file), key_field="parcel_id"
+    ) as repository:
+        files = [Path(str(repository.store_path)), Path(f"{repository.store_path}.keys")]
+        assert all(path.exists() for path in files)
+    assert not any(path.exists() for path in files)
+
+    repository = PagedDataRepository(
+        DeliverJsonFileReader(), validator, DeliversConverter(), str(delivers_file), key_field="parcel_id"
+    )
+    files = [Path(str(repository.store_path)), Path(f"{repository.store_path}.keys")]
+    del repository
+    gc.collect()
+    assert not any(path.exists() for path in files)
+
+
+def test_rejects_sources_that_cannot_be_streamed(tmp_path: Path) -> None:
+    """
+    Tests that a JSON array source is rejected instead of being loaded into memory at once,
+    and that the temporary store is not left behind.
+    """
+    path = tmp_path / "delivers.json"
+    path.write_text("[]", encoding="utf8")
+    stores = set(Path(tempfile.gettempdir()).glob("pages-*"))
+
+    with pytest.raises(ValueError):
+        PagedDataRepository(DeliverJsonFileReader(), MagicMock(), DeliversConverter(), str(path))
+    assert set(Path(tempfile.gettempdir()).glob("pages-*")) == stores
+
+
+def test_paged_load_mode(delivers_file: Path) -> None:
+    """
+    Tests that a data repository in `LoadMode.PAGED` publishes a paged store as its data,
+    replaces it on refresh without a change history and is read-only.
+    """
+    validator = MagicMock()
+    validator.validate.return_value = True
+    repository = DeliverDataRepository(
+        DeliverJsonFileReader(), validator, DeliversConverter(), str(delivers_file),
+        load_mode=LoadMode.PAGED, page_size=4, max_pages=1
+    )
+    data = repository.data
+    assert isinstance(data, PagedDataRepository)
+    assert [deliver.parcel_id for deliver in data] == [f"P{number}" for number in range(10)]
+    assert data.find("P3") == data[3]
+    assert repository.load_stats is not None and repository.load_stats.valid == 10
+
+    version = repository.version
+    repository.refresh(force=True)
+    assert repository.version == version + 1
+    assert repository.changes_since(version) is None
+    assert repository.data is not data and len(repository.data) == 10
+
+    with pytest.raises(ValueError):
+        repository.remove("P0")
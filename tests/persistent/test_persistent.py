@@ -0,0 +1,47 @@
+from src.persistent import CHUNK_SIZE, OverlayDict, PersistentList
+
+
+def test_persistent_list_shares_untouched_chunks() -> None:
+    """
+    Tests that modifying a persistent list leaves the original intact and shares the other chunks.
+
+    Asserts:
+        - set, insert, append and delete return the expected lists.
+        - The original list is unchanged and untouched chunks are the same objects.
+    """
+    items = list(range(3 * CHUNK_SIZE))
+    original = PersistentList.of(items)
+
+    changed = original.set(5, -1).insert(0, -2).append(-3).delete(len(items))
+
+    assert original == items
+    assert changed == [-2, 0, 1, 2, 3, 4, -1, *items[6:-1], -3]
+    assert any(chunk is original._chunks[1] for chunk in changed._chunks)
+    assert original[CHUNK_SIZE - 2:CHUNK_SIZE + 2] == items[CHUNK_SIZE - 2:CHUNK_SIZE + 2]
+    assert original.find(items[100]) == 100
+
+
+def test_overlay_dict_copies_are_independent() -> None:
+    """
+    Tests that copies of an overlay dictionary share the base but not the changes.
+
+    Asserts:
+        - Changes to a copy are not visible in the original, and vice versa.
+        - Changed keys keep their position, new keys come last, and compaction keeps the content.
+    """
+    base = {key: key for key in range(4)}
+    original = OverlayDict(base)
+    copy = original.copy()
+
+    copy[1] = 10
+    del copy[2]
+    copy[7] = 7
+    original[3] = 30
+
+    assert list(copy.items()) == [(0, 0), (1, 10), (3, 3), (7, 7)]
+    assert dict(original) == {0: 0, 1: 1, 2: 2, 3: 30}
+    assert base == {0: 0, 1: 1, 2: 2, 3: 3}
+    for key in range(100, 100 + 2 * CHUNK_SIZE):
+        copy[key] = key
+    assert len(copy) == 4 + 2 * CHUNK_SIZE
+    assert 2 not in copy and copy[1] == 10
@@ -9,6 +9,7 @@ from src.repository import (
     PurchaseSummaryRepository
 )
 from src.model import (
+    CompartmentVector,
     LockerComponentsSize,
     Users,
     City,
@@ -185,5 +186,5 @@ def purchase_summary_service(
         parcels={parcel_11.parcel_id: parcel_11, parcel_22.parcel_id: parcel_22},
         delivers=[deliver_11, deliver_22],
         users={user_11.email: user_11, user_22.email: user_22, user_33.email: user_33, user_44.email: user_44},
-        locker_usage={locker.locker_id: {'small': 0, 'medium': 0, 'large': 0} for locker in [locker_11, locker_22]}
+        locker_usage={locker.locker_id: CompartmentVector() for locker in [locker_11, locker_22]}
     )
@@ -0,0 +1,118 @@
+from datetime import date
+from unittest.mock import MagicMock, patch
+from src.converter import DeliversConverter
+from src.repository import DeliverDataRepository, RepositorySnapshot
+import pytest
+
+
+@pytest.fixture
+def deliver_repository() -> DeliverDataRepository:
+    """
+    Provides a DeliverDataRepository loaded with deliveries spread over two lockers and ten days.
+    """
+    file_reader = MagicMock()
+    file_reader.read.return_value = [
+        {
+            "parcel_id": f"P{day}",
+            "locker_id": "L001" if day % 2 else "L002",
+            "sender_email": "bob.jones@gmail.com" if day < 5 else "alice.smith@gmail.com",
+            "receiver_email": "jane.smith@gmail.com",
+            "sent_date": f"2024-01-{day:02d}",
+            "expected_delivery_date": f"2024-01-{day + 3:02d}"
+        }
+        for day in range(10, 0, -1)
+    ]
+    validator = MagicMock()
+    validator.validate.return_value = True
+    return DeliverDataRepository(
+        file_reader=file_reader,
+        validator=validator,
+        converter=DeliversConverter(),
+        filename="delivers.json"
+    )
+
+
+def test_query_by_locker_and_sent_range(deliver_repository: DeliverDataRepository) -> None:
+    """
+    Tests that equality and inclusive date range predicates are combined.
+    """
+    result = deliver_repository.query(locker_id="L001", sent_from=date(2024, 1, 3), sent_to=date(2024, 1, 7))
+
+    assert [deliver.parcel_id for deliver in result] == ["P3", "P5", "P7"]
+
+
+def test_query_by_expected_range_and_sender(deliver_repository: DeliverDataRepository) -> None:
+    """
+    Tests that results from a non sent-date index are ordered by sent date.
+    """
+    result = deliver_repository.query(sender_email="bob.jones@gmail.com", expected_from=date(2024, 1, 6))
+
+    assert [deliver.parcel_id for deliver in result] == ["P3", "P4"]
+
+
+def test_query_matches_full_scan(deliver_repository: DeliverDataRepository) -> None:
+    """
+    Tests that the indexed query returns the same deliveries as a linear scan.
+    """
+    expected = sorted(
+        (deliver for deliver in deliver_repository.get_data()
+         if deliver.receiver_email == "jane.smith@gmail.com" and deliver.sent_date <= date(2024, 1, 4)),
+        key=lambda deliver: deliver.sent_date
+    )
+
+    assert deliver_repository.query(receiver_email="jane.smith@gmail.com", sent_to=date(2024, 1, 4)) == expected
+    assert deliver_repository.query(locker_id="L404") == []
+    assert len(deliver_repository.query()) == 10
+
+
+def test_query_reads_a_single_snapshot(deliver_repository: DeliverDataRepository) -> None:
+    """
+    Tests that a change published while a query runs does not mix two versions in its result.
+    """
+    current = deliver_repository._current
+    calls: list[RepositorySnapshot] = []
+
+    def current_then_change() -> RepositorySnapshot:
+        snapshot = current()
+        calls.append(snapshot)
+        if len(calls) == 1:
+            deliver_repository.remove("P3")
+        return snapshot
+
+    with patch.object(deliver_repository, "_current", side_effect=current_then_change):
+        result = deliver_repository.query(locker_id="L001", sent_from=date(2024, 1, 3), sent_to=date(2024, 1, 7))
+
+    assert [deliver.parcel_id for deliver in result] == ["P3", "P5", "P7"]
+    assert "P3" not in deliver_repository.unique_index("parcel_id")
+
+
+def test_partitions_and_eviction(deliver_repository: DeliverDataRepository) -> None:
+    """
+    Tests that deliveries are partitioned by locker and month, and that old months can be evicted.
+
+    Asserts:
+        - A locker's deliveries within a date range come from its partitions.
+        - Evicting drops whole months from the data and indexes, also after a forced reload.
+    """
+    deliver_repository.add({
+        "parcel_id": "P0",
+        "locker_id": "L001",
+        "sender_email": "bob.jones@gmail.com",
+        "receiver_email": "jane.smith@gmail.com",
+        "sent_date": "2023-12-31",
+        "expected_delivery_date": "2024-01-02"
+    })
+    partitions = deliver_repository.partition_index("locker_id")
+
+    assert partitions.periods("L001") == (date(2023, 12, 1), date(2024, 1, 1))
+    assert [deliver.parcel_id for deliver in partitions.records_of("L001", date(2023, 12, 15), date(2024, 1, 3))] == [
+        "P0", "P3", "P1"
+    ]
+
+    evicted = deliver_repository.evict_before(date(2024, 1, 20))
+    deliver_repository.refresh(force=True)
+
+    assert [deliver.parcel_id for deliver in evicted] == ["P0"]
+    assert "P0" not in deliver_repository.unique_index("parcel_id")
+    assert deliver_repository.partition_index("locker_id").periods("L001") == (date(2024, 1, 1),)
+    assert len(deliver_repository.get_data()) == 10
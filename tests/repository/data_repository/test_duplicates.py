@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+from src.converter import ParcelConverter
+from src.repository import DuplicatePolicy, ParcelDataRepository
+import pytest
+
+ENTRIES = [
+    {"parcel_id": "P1", "height": 10, "length": 20, "weight": 1},
+    {"parcel_id": "P2", "height": 30, "length": 50, "weight": 2},
+    {"parcel_id": "P1", "height": 40, "length": 60, "weight": None},
+    {"parcel_id": "P2", "height": 35, "length": 50, "weight": 3},
+]
+
+
+def _repository(policy: DuplicatePolicy) -> ParcelDataRepository:
+    file_reader = MagicMock()
+    file_reader.read.return_value = [dict(entry) for entry in ENTRIES]
+    validator = MagicMock()
+    validator.validate.side_effect = lambda entry: entry["weight"] is not None
+    return ParcelDataRepository(
+        file_reader=file_reader,
+        validator=validator,
+        converter=ParcelConverter(),
+        filename="parcels.json",
+        duplicate_policy=policy
+    )
+
+
+@pytest.mark.parametrize(
+    "policy, expected, duplicates",
+    [
+        (DuplicatePolicy.FIRST_WINS, [("P1", 10, 1), ("P2", 30, 2)], 2),
+        (DuplicatePolicy.LAST_WINS, [("P1", 10, 1), ("P2", 35, 3)], 1),
+        (DuplicatePolicy.MERGE, [("P1", 40, 1), ("P2", 35, 3)], 2),
+    ]
+)
+def test_duplicates_are_resolved_by_policy(policy: DuplicatePolicy, expected: list[tuple], duplicates: int) -> None:
+    """
+    Tests that entries sharing a key are resolved according to the policy and counted.
+
+    Asserts:
+        - First wins keeps the first entry, last wins keeps the last valid entry (the invalid
+          duplicate is rejected) and merge overrides the first entry with the non-null values.
+        - The winning record takes the position of the first entry.
+    """
+    repository = _repository(policy)
+
+    assert [(parcel.parcel_id, parcel.height, parcel.weight) for parcel in repository.get_data()] == expected
+    assert repository.unique_index("parcel_id")["P1"] is repository.get_data()[0]
+    assert repository.load_stats is not None and repository.load_stats.duplicates == duplicates
+
+
+def test_duplicate_raises_with_error_policy() -> None:
+    """
+    Tests that a duplicate key fails the load under the error policy.
+    """
+    with pytest.raises(ValueError, match="Duplicate parcel_id 'P1'"):
+        _repository(DuplicatePolicy.ERROR)
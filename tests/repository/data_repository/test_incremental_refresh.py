@@ -0,0 +1,164 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+from src.converter import LockerConverter
+from src.file_service import LockerJsonFileReader
+from src.repository import LockerDataRepository
+import json
+import os
+import pytest
+import time
+
+
+@pytest.fixture
+def lockers_file(tmp_path: Path, locker_1_data: dict) -> Path:
+    """
+    Writes a lockers file with two lockers and returns its path.
+    """
+    second = {**locker_1_data, "locker_id": "L003"}
+    path = tmp_path / "lockers.json"
+    path.write_text(json.dumps([locker_1_data, second]), encoding="utf8")
+    return path
+
+
+@pytest.fixture
+def repository(lockers_file: Path) -> LockerDataRepository:
+    """
+    Provides a LockerDataRepository over a real file, with a spying reader and an accepting validator.
+    """
+    validator = MagicMock()
+    validator.validate.return_value = True
+    return LockerDataRepository(
+        file_reader=MagicMock(wraps=LockerJsonFileReader()),
+        validator=validator,
+        converter=LockerConverter(),
+        filename=str(lockers_file)
+    )
+
+
+def _rewrite(path: Path, entries: list[dict]) -> None:
+    path.write_text(json.dumps(entries), encoding="utf8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_unchanged_source_is_not_read_again(repository: LockerDataRepository, lockers_file: Path) -> None:
+    """
+    Tests that refreshing an unchanged file neither reads it nor changes the data.
+
+    Asserts:
+        - The reader is called only once.
+        - The change set is empty and the version is unchanged.
+    """
+    data = repository.get_data()
+
+    change_set = repository.refresh()
+
+    assert repository.file_reader.read.call_count == 1  # type: ignore[attr-defined]
+    assert not change_set
+    assert repository.get_data() is data
+    assert repository.version == 1
+
+
+def test_touched_source_with_same_content_is_skipped(repository: LockerDataRepository, lockers_file: Path) -> None:
+    """
+    Tests that a file with a new modification time but the same content hash is not reloaded.
+    """
+    _rewrite(lockers_file, json.loads(lockers_file.read_text(encoding="utf8")))
+
+    assert not repository.refresh()
+    assert repository.file_reader.read.call_count == 1  # type: ignore[attr-defined]
+
+
+def test_refresh_applies_only_changes(
+        repository: LockerDataRepository,
+        lockers_file: Path,
+        locker_1_data: dict
+) -> None:
+    """
+    Tests that a refresh reports added, changed and removed lockers and only processes changed entries.
+
+    Asserts:
+        - The change set lists the changed, added and removed lockers.
+        - Unchanged lockers keep their record and are not validated again.
+    """
+    unchanged, removed = repository.get_data()
+    changed = {**locker_1_data, "latitude": 1.0}
+    added = {**locker_1_data, "locker_id": "L004"}
+    repository.validator.validate.reset_mock()  # type: ignore[attr-defined]
+    _rewrite(lockers_file, [changed, added])
+
+    change_set = repository.refresh()
+
+    assert [old for old, _ in change_set.changed] == [unchanged]
+    assert [new.latitude for _, new in change_set.changed] == [1.0]
+    assert [locker.locker_id for locker in change_set.added] == ["L004"]
+    assert change_set.removed == [removed]
+    assert repository.last_change_set is change_set
+    assert repository.version == 2
+    assert repository.validator.validate.call_count == 2  # type: ignore[attr-defined]
+
+
+def test_refresh_data_honors_filename(
+        repository: LockerDataRepository,
+        tmp_path: Path,
+        locker_1_data: dict
+) -> None:
+    """
+    Tests that `refresh_data` loads the given file instead of the default one.
+    """
+    other = tmp_path / "other.json"
+    other.write_text(json.dumps([locker_1_data]), encoding="utf8")
+
+    data = repository.refresh_data(str(other))
+
+    repository.file_reader.read.assert_called_with(str(other))  # type: ignore[attr-defined]
+    assert [locker.locker_id for locker in data] == ["L002"]
+
+
+def test_indexes_follow_refresh(
+        repository: LockerDataRepository,
+        lockers_file: Path,
+        locker_1_data: dict
+) -> None:
+    """
+    Tests that the declared unique index is maintained across refreshes in a new snapshot,
+    while the previous snapshot stays unchanged.
+
+    Asserts:
+        - The index of the new snapshot reflects the changes.
+        - The index and data held from the previous snapshot are untouched.
+    """
+    previous = repository.snapshot()
+    index = repository.unique_index("locker_id")
+    assert set(index) == {"L002", "L003"}
+
+    _rewrite(lockers_file, [{**locker_1_data, "latitude": 1.0}, {**locker_1_data, "locker_id": "L004"}])
+    repository.refresh()
+
+    current = repository.unique_index("locker_id")
+    assert set(current) == {"L002", "L004"}
+    assert current["L002"].latitude == 1.0
+    assert set(index) == {"L002", "L003"}
+    assert [locker.locker_id for locker in previous.data] == ["L002", "L003"]
+    assert repository.snapshot() is not previous
+
+
+def test_auto_reload_publishes_new_snapshot(
+        repository: LockerDataRepository,
+        lockers_file: Path,
+        locker_1_data: dict
+) -> None:
+    """
+    Tests that the auto reload thread picks up a changed file and publishes it as a new version.
+    """
+    repository.start_auto_reload(interval=0.01)
+    try:
+        _rewrite(lockers_file, [{**locker_1_data, "locker_id": "L009"}])
+        deadline = time.monotonic() + 5
+        while repository.version < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        repository.stop_auto_reload()
+
+    assert [locker.locker_id for locker in repository.get_data()] == ["L009"]
+    assert list(repository.unique_index("locker_id")) == ["L009"]
@@ -0,0 +1,67 @@
+from threading import Barrier, Thread
+from unittest.mock import MagicMock
+from typing import Sequence
+from src.repository import LoadMode, UserDataRepository
+from src.model import Users, UserDataDict
+import time
+
+
+def _lazy_repository(file_reader: MagicMock, converted: Users) -> UserDataRepository:
+    validator = MagicMock()
+    validator.validate.return_value = True
+    converter = MagicMock()
+    converter.convert.return_value = converted
+    return UserDataRepository(
+        file_reader=file_reader,
+        validator=validator,
+        converter=converter,
+        filename="users.json",
+        load_mode=LoadMode.LAZY
+    )
+
+
+def test_lazy_repository_loads_on_first_access(user_1: Users, user_1_data: UserDataDict) -> None:
+    """
+    Tests that a lazy repository reads its file only when its data or indexes are first accessed.
+
+    Asserts:
+        - Nothing is read on creation.
+        - The index lookup triggers a single load that later accesses reuse.
+    """
+    file_reader = MagicMock()
+    file_reader.read.return_value = [user_1_data]
+    repository = _lazy_repository(file_reader, user_1)
+
+    file_reader.read.assert_not_called()
+
+    assert repository.unique_index("email")["bob.jones@gmail.com"] is user_1
+    assert repository.get_data() == [user_1]
+    assert file_reader.read.call_count == 1
+
+
+def test_concurrent_first_access_loads_once(user_1: Users, user_1_data: UserDataDict) -> None:
+    """
+    Tests that concurrent first callers of a lazy repository share a single load.
+    """
+    def slow_read(filename: str) -> list[UserDataDict]:
+        time.sleep(0.05)
+        return [user_1_data]
+
+    file_reader = MagicMock()
+    file_reader.read.side_effect = slow_read
+    repository = _lazy_repository(file_reader, user_1)
+    barrier = Barrier(8)
+    results: list[Sequence[Users]] = []
+
+    def first_access() -> None:
+        barrier.wait()
+        results.append(repository.get_data())
+
+    threads = [Thread(target=first_access) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert file_reader.read.call_count == 1
+    assert results == [[user_1]] * 8
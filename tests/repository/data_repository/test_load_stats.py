@@ -0,0 +1,40 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+from src.converter import LockerConverter
+from src.file_service import LockerJsonFileReader
+from src.repository import LockerDataRepository
+import json
+
+
+def test_load_records_stats(tmp_path: Path, locker_1_data: dict) -> None:
+    """
+    Tests that a load records its counters, timings and peak memory, and that they can be dumped.
+
+    Asserts:
+        - The entries read, valid and rejected and the bytes read are counted.
+        - The timings and the traced peak memory are recorded.
+        - The JSON dump holds the same statistics.
+    """
+    path = tmp_path / "lockers.json"
+    path.write_text(json.dumps([locker_1_data, {**locker_1_data, "locker_id": "INVALID"}]), encoding="utf8")
+    validator = MagicMock()
+    validator.validate.side_effect = lambda entry: entry["locker_id"] != "INVALID"
+
+    repository = LockerDataRepository(
+        file_reader=LockerJsonFileReader(),
+        validator=validator,
+        converter=LockerConverter(),
+        filename=str(path),
+        trace_memory=True
+    )
+    stats = repository.load_stats
+
+    assert stats is not None
+    assert (stats.records_in, stats.valid, stats.rejected, stats.reused) == (2, 1, 1, 0)
+    assert stats.bytes_read == path.stat().st_size
+    assert stats.total_seconds >= stats.read_seconds + stats.validate_seconds + stats.convert_seconds
+    assert stats.peak_memory_bytes is not None and stats.peak_memory_bytes > 0
+
+    dump = tmp_path / "stats.json"
+    stats.dump(str(dump))
+    assert json.loads(dump.read_text(encoding="utf8")) == stats.to_dict()
@@ -0,0 +1,152 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+from src.converter import LockerConverter
+from src.file_service import LockerJsonFileReader, LockerJsonFileWriter
+from src.repository import LockerDataRepository
+import json
+import pytest
+import time
+
+
+@pytest.fixture
+def lockers_file(tmp_path: Path, locker_1_data: dict) -> Path:
+    """
+    Writes a lockers file with a single locker and returns its path.
+    """
+    path = tmp_path / "lockers.json"
+    path.write_text(json.dumps([locker_1_data]), encoding="utf8")
+    return path
+
+
+def _repository(lockers_file: Path, **options) -> LockerDataRepository:
+    validator = MagicMock()
+    validator.validate.side_effect = lambda entry: entry["locker_id"] != "INVALID"
+    return LockerDataRepository(
+        file_reader=MagicMock(wraps=LockerJsonFileReader()),
+        validator=validator,
+        converter=LockerConverter(),
+        filename=str(lockers_file),
+        file_writer=LockerJsonFileWriter(),
+        **options
+    )
+
+
+def _stored_ids(path: Path) -> list[str]:
+    return [entry["locker_id"] for entry in json.loads(path.read_text(encoding="utf8"))]
+
+
+def test_changes_update_data_and_indexes(lockers_file: Path, locker_1_data: dict) -> None:
+    """
+    Tests that added, updated and removed records are visible in the data and the unique index at once.
+
+    Asserts:
+        - Every change publishes a new version with its change set.
+        - The index reflects the changes, and invalid entries are rejected.
+    """
+    repository = _repository(lockers_file)
+
+    repository.add({**locker_1_data, "locker_id": "L003"})
+    updated = repository.update({**locker_1_data, "city": "Chicago"})
+    removed = repository.remove("L003")
+
+    assert repository.version == 4
+    assert repository.last_change_set.removed == [removed]
+    assert [locker.locker_id for locker in repository.get_data()] == ["L002"]
+    assert repository.unique_index("locker_id")["L002"] is updated
+    assert "L003" not in repository.unique_index("locker_id")
+    with pytest.raises(ValueError):
+        repository.add({**locker_1_data, "locker_id": "INVALID"})
+    with pytest.raises(ValueError):
+        repository.add(locker_1_data)
+    with pytest.raises(KeyError):
+        repository.remove("L404")
+
+
+def test_changes_are_flushed_in_batches(lockers_file: Path, locker_1_data: dict) -> None:
+    """
+    Tests that changes are written once the batch size is reached, and not read back on refresh.
+
+    Asserts:
+        - The file is unchanged until the batch is full.
+        - The flushed file holds all records and refreshing does not read it again.
+    """
+    repository = _repository(lockers_file, flush_size=2)
+
+    repository.add({**locker_1_data, "locker_id": "L003"})
+    assert _stored_ids(lockers_file) == ["L002"]
+
+    repository.add({**locker_1_data, "locker_id": "L004"})
+    assert _stored_ids(lockers_file) == ["L002", "L003", "L004"]
+
+    reads = repository.file_reader.read.call_count  # type: ignore[attr-defined]
+    repository.refresh()
+    assert repository.file_reader.read.call_count == reads  # type: ignore[attr-defined]
+
+
+def test_flush_keeps_entries_rejected_on_load(lockers_file: Path, locker_1_data: dict) -> None:
+    """
+    Tests that flushing only writes the changed keys through and keeps the entries rejected on load.
+
+    Asserts:
+        - The rejected entry stays in the file, in its position and unchanged.
+        - Updated entries are replaced in place, removed ones dropped and added ones appended.
+    """
+    invalid = {**locker_1_data, "locker_id": "INVALID"}
+    lockers_file.write_text(json.dumps([invalid, locker_1_data, {**locker_1_data, "locker_id": "L003"}]), encoding="utf8")
+    repository = _repository(lockers_file)
+    assert repository.load_stats is not None and repository.load_stats.rejected == 1
+
+    repository.update({**locker_1_data, "city": "Chicago"})
+    repository.remove("L003")
+    repository.add({**locker_1_data, "locker_id": "L004"})
+    repository.flush()
+
+    stored = json.loads(lockers_file.read_text(encoding="utf8"))
+    assert [entry["locker_id"] for entry in stored] == ["INVALID", "L002", "L004"]
+    assert stored[0] == invalid
+    assert stored[1]["city"] == "Chicago"
+
+
+def test_changes_are_flushed_after_interval(lockers_file: Path, locker_1_data: dict) -> None:
+    """
+    Tests that pending changes are flushed once the oldest is older than the flush interval,
+    even when no further change or refresh happens.
+
+    Asserts:
+        - Nothing is due right after the change, and the change is written after the interval.
+    """
+    repository = _repository(lockers_file, flush_interval=0.05)
+
+    repository.add({**locker_1_data, "locker_id": "L003"})
+    source = repository.snapshot().source
+    assert not repository.flush_if_due()
+    assert _stored_ids(lockers_file) == ["L002"]
+
+    deadline = time.monotonic() + 2
+    while repository.snapshot().source == source and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _stored_ids(lockers_file) == ["L002", "L003"]
+    assert not repository.flush_if_due()
+
+
+def test_pinned_snapshot_is_unaffected_by_changes(lockers_file: Path, locker_1_data: dict) -> None:
+    """
+    Tests that a reader holding a snapshot keeps its version while new versions share unchanged data.
+
+    Asserts:
+        - The pinned snapshot keeps its data and index, and can be looked up by version.
+        - The new snapshot shares the unchanged record objects.
+        - A version nobody holds any more cannot be looked up.
+    """
+    repository = _repository(lockers_file)
+    pinned = repository.snapshot()
+
+    repository.add({**locker_1_data, "locker_id": "L003"})
+    repository.update({**locker_1_data, "locker_id": "L003", "city": "Chicago"})
+
+    assert [locker.locker_id for locker in pinned.data] == ["L002"]
+    assert "L003" not in pinned.unique["locker_id"]
+    assert repository.snapshot(pinned.version) is pinned
+    assert repository.get_data()[0] is pinned.data[0]
+    with pytest.raises(KeyError):
+        repository.snapshot(2)
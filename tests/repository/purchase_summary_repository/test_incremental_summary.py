@@ -0,0 +1,183 @@
+from unittest.mock import MagicMock, patch
+from src.converter import DeliversConverter, LockerConverter, ParcelConverter, UserConverter
+from src.repository import (
+    AbstractDataRepository,
+    DeliverDataRepository,
+    LockerDataRepository,
+    ParcelDataRepository,
+    PurchaseSummary,
+    PurchaseSummaryRepository,
+    UserDataRepository
+)
+import pytest
+
+
+def _user(email: str, name: str = "Bob") -> dict:
+    return {"email": email, "name": name, "surname": "Jones", "city": "New York", "latitude": 1.0, "longitude": 2.0}
+
+
+def _deliver(parcel_id: str, sender_email: str, locker_id: str = "L001") -> dict:
+    return {
+        "parcel_id": parcel_id,
+        "locker_id": locker_id,
+        "sender_email": sender_email,
+        "receiver_email": "jane.smith@gmail.com",
+        "sent_date": "2024-01-01",
+        "expected_delivery_date": "2024-01-03"
+    }
+
+
+def _repository(repository_type: type[AbstractDataRepository], converter, entries: list[dict]) -> AbstractDataRepository:
+    file_reader = MagicMock()
+    file_reader.read.return_value = entries
+    validator = MagicMock()
+    validator.validate.return_value = True
+    return repository_type(file_reader=file_reader, validator=validator, converter=converter, filename="data.json")
+
+
+def _reload(repository: AbstractDataRepository, entries: list[dict]) -> None:
+    repository.file_reader.read.return_value = entries  # type: ignore[attr-defined]
+    repository.refresh()
+
+
+@pytest.fixture
+def summary_repo() -> PurchaseSummaryRepository:
+    """
+    Provides a purchase summary over real repositories with two users, one locker and three parcels.
+    """
+    return PurchaseSummaryRepository(
+        user_repo=_repository(UserDataRepository, UserConverter(), [_user("bob@gmail.com"), _user("ann@gmail.com")]),
+        parcel_repo=_repository(ParcelDataRepository, ParcelConverter(), [
+            {"parcel_id": f"P{number}", "height": 10, "length": 20, "weight": 1} for number in range(1, 4)
+        ]),
+        locker_repo=_repository(LockerDataRepository, LockerConverter(), [{
+            "locker_id": "L001",
+            "city": "New York",
+            "latitude": 1.0,
+            "longitude": 2.0,
+            "compartments": {"small": 1, "medium": 1, "large": 1}
+        }]),
+        deliver_repo=_repository(DeliverDataRepository, DeliversConverter(), [
+            _deliver("P1", "bob@gmail.com"),
+            _deliver("P2", "ann@gmail.com"),
+            _deliver("P3", "ghost@gmail.com")
+        ])
+    )
+
+
+def _counts(summary_repo: PurchaseSummaryRepository) -> dict[str, list[str]]:
+    return {
+        user.email: sorted(deliver.parcel_id for deliver in deliveries)
+        for user, deliveries in summary_repo.purchase_summary().items()
+    }
+
+
+def test_refresh_applies_changes_without_rebuild(summary_repo: PurchaseSummaryRepository) -> None:
+    """
+    Tests that repository changes are applied to the cached summary without rebuilding it.
+
+    Asserts:
+        - Removed deliveries disappear and new ones are added.
+        - Deliveries with a dangling sender are resolved once the user appears.
+        - A renamed user replaces the previous user object.
+    """
+    assert _counts(summary_repo) == {"bob@gmail.com": ["P1"], "ann@gmail.com": ["P2"]}
+
+    _reload(summary_repo.deliver_repo, [
+        _deliver("P2", "ann@gmail.com"),
+        _deliver("P3", "ghost@gmail.com"),
+        _deliver("P1", "ann@gmail.com")
+    ])
+    _reload(summary_repo.user_repo, [
+        _user("bob@gmail.com"),
+        _user("ann@gmail.com", name="Anna"),
+        _user("ghost@gmail.com")
+    ])
+    with patch.object(summary_repo, "_build_purchase_summary", side_effect=AssertionError("rebuilt")):
+        summary = summary_repo.purchase_summary(force_refresh=True)
+
+    assert _counts(summary_repo) == {"ann@gmail.com": ["P1", "P2"], "ghost@gmail.com": ["P3"]}
+    anna = summary_repo.user_repo.unique_index("email")["ann@gmail.com"]
+    assert anna.name == "Anna"
+    assert anna in summary
+
+
+def test_removed_reference_drops_deliveries(summary_repo: PurchaseSummaryRepository) -> None:
+    """
+    Tests that deliveries to a removed locker are dropped from the summary.
+    """
+    summary_repo.purchase_summary()
+
+    _reload(summary_repo.locker_repo, [])
+    summary_repo.purchase_summary(force_refresh=True)
+
+    assert len(summary_repo.purchase_summary()) == 0
+
+
+def test_incremental_summary_matches_rebuild(summary_repo: PurchaseSummaryRepository) -> None:
+    """
+    Tests that an incrementally maintained summary equals a summary rebuilt from scratch.
+    """
+    summary_repo.purchase_summary()
+    _reload(summary_repo.deliver_repo, [_deliver("P2", "bob@gmail.com"), _deliver("P3", "ann@gmail.com")])
+    _reload(summary_repo.parcel_repo, [{"parcel_id": "P2", "height": 10, "length": 20, "weight": 1}])
+
+    summary_repo.purchase_summary(force_refresh=True)
+    incremental = _counts(summary_repo)
+    summary_repo._versions = None
+    summary_repo.purchase_summary(force_refresh=True)
+
+    assert incremental == _counts(summary_repo) == {"bob@gmail.com": ["P2"]}
+
+
+def test_dangling_deliveries(summary_repo: PurchaseSummaryRepository) -> None:
+    """
+    Tests that deliveries with a dangling sender reference are reported by the anti join.
+    """
+    assert [deliver.parcel_id for deliver in summary_repo.dangling_deliveries()] == ["P3"]
+
+
+def test_discarded_slots_are_compacted(summary_repo: PurchaseSummaryRepository) -> None:
+    """
+    Tests that repeated changes do not grow the summary without bound.
+
+    Asserts:
+        - The empty slots never exceed half of the stored deliveries.
+        - Compaction keeps the deliveries of every user, in order.
+    """
+    senders = ("bob@gmail.com", "ann@gmail.com")
+    summary = summary_repo.summary()
+    for round_number in range(10):
+        _reload(summary_repo.deliver_repo, [
+            _deliver("P1", senders[round_number % 2]),
+            _deliver("P2", "bob@gmail.com"),
+            _deliver("P3", "ann@gmail.com")
+        ])
+        assert summary_repo.summary(force_refresh=True) is summary
+        assert summary.free_slots * 2 <= len(summary.deliveries)
+
+    assert len(summary.deliveries) <= 6
+    assert [deliver.parcel_id for deliver in summary.deliveries_of("bob@gmail.com")] == ["P2"]
+    assert sorted(deliver.parcel_id for deliver in summary.deliveries_of("ann@gmail.com")) == ["P1", "P3"]
+
+
+def test_compact_remaps_indexes() -> None:
+    """
+    Tests that compacting keeps the deliveries reachable by user and by parcel.
+    """
+    users = _repository(UserDataRepository, UserConverter(), [_user("bob@gmail.com")]).get_data()
+    delivers = _repository(
+        DeliverDataRepository, DeliversConverter(), [_deliver(f"P{number}", "bob@gmail.com") for number in range(4)]
+    ).get_data()
+    summary = PurchaseSummary()
+    for deliver in delivers:
+        summary.add(users[0], deliver)
+
+    summary.discard(delivers[0])
+    summary.discard(delivers[2])
+    summary.compact()
+
+    assert summary.deliveries == [delivers[1], delivers[3]]
+    assert summary.deliveries_of("bob@gmail.com") == [delivers[1], delivers[3]]
+    assert summary.parcel_slots == {"P1": [0], "P3": [1]}
+    assert summary.discard(delivers[3]) and summary.deliveries_of("bob@gmail.com") == [delivers[1]]
@@ -176,3 +176,38 @@ def test_invalid_entry_logs_warning(
             "invalid user or locker or parcel reference" in record.message
             for record in caplog.records
         )
+
+def test_summary_is_keyed_by_email(
+    purchase_summary_repo: PurchaseSummaryRepository,
+    user_1: Users,
+    deliver_1: Delivers
+) -> None:
+    """
+    Test that the compact summary resolves deliveries by email and that the view matches users by value.
+
+    Args:
+        purchase_summary_repo (PurchaseSummaryRepository): The repository instance.
+        user_1 (Users): First user instance.
+        deliver_1 (Delivers): First delivery instance.
+
+    Assertions:
+        - Deliveries are found by the sender email.
+        - The view rejects a different user sharing the same email.
+    """
+    summary = purchase_summary_repo.summary()
+
+    assert summary.deliveries_of(user_1.email) == [deliver_1]
+    assert summary.deliveries_of("unknown@gmail.com") == []
+
+    impostor = Users(
+        email=user_1.email,
+        name="Other",
+        surname=user_1.surname,
+        city=user_1.city,
+        latitude=user_1.latitude,
+        longitude=user_1.longitude
+    )
+    view = purchase_summary_repo.purchase_summary()
+    assert user_1 in view
+    assert impostor not in view
+    assert view.get(impostor) is None
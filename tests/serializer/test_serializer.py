@@ -0,0 +1,55 @@
+from datetime import date
+from src.model import Users, Parcels, Lockers, Delivers
+from src.serializer import ModelSerializer, write_models
+import io
+import json
+import pytest
+
+
+@pytest.mark.parametrize("model_fixture_name", ["user_1", "parcel_1", "locker_1"])
+def test_encode_matches_to_dict(model_fixture_name: str, request: pytest.FixtureRequest) -> None:
+    """
+    Tests that the generated encoder writes the same JSON object as `to_dict`.
+    """
+    model = request.getfixturevalue(model_fixture_name)
+    serializer = ModelSerializer(type(model))
+
+    assert json.loads(serializer.encode(model)) == model.to_dict()
+
+
+def test_encode_writes_dates_as_iso_strings(deliver_1: Delivers) -> None:
+    """
+    Tests that delivery dates are written as ISO strings readable by the delivery converter.
+    """
+    data = json.loads(ModelSerializer(Delivers).encode(deliver_1))
+
+    assert data["sent_date"] == "2023-12-02"
+    assert data["expected_delivery_date"] == "2023-12-06"
+
+
+def test_write_json_and_jsonl(parcel_1: Parcels, parcel_2: Parcels) -> None:
+    """
+    Tests writing a JSON array and JSON lines to a stream.
+    """
+    serializer = ModelSerializer(Parcels)
+
+    array_stream = io.StringIO()
+    assert serializer.write_json(array_stream, [parcel_1, parcel_2]) == 2
+    assert json.loads(array_stream.getvalue()) == [parcel_1.to_dict(), parcel_2.to_dict()]
+
+    lines_stream = io.StringIO()
+    assert serializer.write_jsonl(lines_stream, iter([parcel_1, parcel_2])) == 2
+    assert [json.loads(line) for line in lines_stream.getvalue().splitlines()] == [
+        parcel_1.to_dict(), parcel_2.to_dict()
+    ]
+
+
+def test_write_models_empty_sequence(tmp_path) -> None:
+    """
+    Tests that writing no models produces an empty JSON array.
+    """
+    filename = str(tmp_path / "empty.json")
+
+    assert write_models(filename, []) == 0
+    with open(filename, encoding="utf8") as file:
+        assert json.load(file) == []
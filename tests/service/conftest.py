@@ -10,6 +10,7 @@ from src.repository import (
 from src.service import PurchaseSummaryService
 from tests.conftest import user_1
 from src.model import (
+    CompartmentVector,
     LockerComponentsSize,
     Users,
     City,
@@ -279,5 +280,5 @@ def purchase_summary_service(
         parcels = {parcel_11.parcel_id: parcel_11, parcel_22.parcel_id: parcel_22},
         delivers = [deliver_11, deliver_22, deliver_33],
         users = {user_1.email: user_1, user_2.email: user_2},
-        locker_usage={locker.locker_id: {'small': 0, 'medium': 0, 'large': 0} for locker in [locker_11, locker_22]}
+        locker_usage={locker.locker_id: CompartmentVector() for locker in [locker_11, locker_22]}
     )
@@ -1,5 +1,10 @@
+from dataclasses import replace
+from datetime import date
 from unittest.mock import MagicMock, patch
+from src.converter import DeliversConverter
 from src.model import Delivers, Users, Parcels, Lockers, LockerComponentsSize, City
+from src.repository import DeliverDataRepository, RepositorySnapshot
+from src.service import PurchaseSummaryService
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
@@ -162,3 +167,130 @@ def test_longest_delivery(purchase_summary_service, deliver_11, deliver_22, deli
         f"Expected 'alice.smith@gmail.com' as sender with the longest delivery, but got {max_sender}"
     assert longest_time == 10, \
         f"Expected 10 days as the longest delivery time, but got {longest_time}"
+
+
+def test_longest_delivery_prefers_first_sender_on_tie(purchase_summary_service, deliver_11, deliver_22,
+                                                      deliver_33) -> None:
+    """
+    Test that on equal longest durations the sender appearing first in the deliveries is returned.
+
+    Args:
+        purchase_summary_service (PurchaseSummaryService): The service being tested.
+        deliver_11 (Delivers): A delivery object sent by bob.jones@gmail.com.
+        deliver_22 (Delivers): A delivery object sent by alice.smith@gmail.com.
+        deliver_33 (Delivers): A delivery object sent by alice.smith@gmail.com.
+
+    Asserts:
+        Verifies that the earlier sender wins a tie even if a later row reaches the duration first.
+    """
+    late_bob = Delivers(
+        parcel_id="4",
+        locker_id="2",
+        sender_email="bob.jones@gmail.com",
+        receiver_email="john.doe@example.com",
+        sent_date=deliver_33.sent_date,
+        expected_delivery_date=deliver_33.expected_delivery_date
+    )
+    purchase_summary_service.delivers = [deliver_11, deliver_33, late_bob]
+
+    assert purchase_summary_service.longest_delivery() == ("bob.jones@gmail.com", 10)
+
+
+def test_per_locker_usage_reads_locker_partitions(purchase_summary_service, locker_11, deliver_11, deliver_22) -> None:
+    """
+    Test that per-locker usage, capacity checks and popular sizes only count that locker's deliveries.
+
+    Asserts:
+        - Locker '1' has two small parcels, one of them sent on 2023-12-02.
+        - An exceeded capacity is logged and reported, and small is the most popular size.
+    """
+    locker_11.compartments[LockerComponentsSize.SMALL] = 1
+
+    assert purchase_summary_service.locker_usage_of("1")[LockerComponentsSize.SMALL] == 2
+    assert purchase_summary_service.locker_usage_of("1", sent_from=date(2023, 12, 2))[LockerComponentsSize.SMALL] == 1
+    with patch("logging.error") as mock_logging_error:
+        assert not purchase_summary_service.check_capacity_of("1")
+        mock_logging_error.assert_called_once()
+    assert purchase_summary_service.most_often_used_sizes_of("1") == [LockerComponentsSize.SMALL]
+
+
+def test_delivery_table_is_rebuilt_per_repository_version(purchase_summary_service, deliver_11, deliver_22) -> None:
+    """
+    Test that the delivery table is cached per snapshot version of the delivery repository.
+
+    Args:
+        purchase_summary_service (PurchaseSummaryService): The service being tested.
+        deliver_11 (Delivers): A delivery object.
+        deliver_22 (Delivers): A delivery object.
+
+    Asserts:
+        Verifies that the table is reused within a version and rebuilt when the version changes
+        or `delivers` is replaced, even by a sequence of the same length.
+    """
+    purchase_summary_service.deliver_repo.version = 1
+    table = purchase_summary_service.delivery_table()
+    assert purchase_summary_service.delivery_table() is table
+
+    purchase_summary_service.deliver_repo.version = 2
+    rebuilt = purchase_summary_service.delivery_table()
+    assert rebuilt is not table
+
+    purchase_summary_service.delivers = [deliver_22, deliver_11, deliver_11]
+    assert purchase_summary_service.delivery_table().parcel.decode() == [
+        deliver_22.parcel_id, deliver_11.parcel_id, deliver_11.parcel_id
+    ]
+
+
+def test_deliveries_and_partitions_come_from_one_snapshot(mock_user_repo, mock_parcel_repo, mock_locker_repo,
+                                                          deliver_11, deliver_22, deliver_33) -> None:
+    """
+    Test that the service reads the deliveries and their partition index from a single snapshot.
+
+    Args:
+        mock_user_repo (MagicMock): The user repository.
+        mock_parcel_repo (MagicMock): The parcel repository.
+        mock_locker_repo (MagicMock): The locker repository.
+        deliver_11 (Delivers): A delivery object.
+        deliver_22 (Delivers): A delivery object.
+        deliver_33 (Delivers): A delivery object.
+
+    Asserts:
+        Verifies that a change published while the service is created is seen by neither the
+        deliveries nor the partitions, and that a pinned copy sees it in both.
+    """
+    file_reader = MagicMock()
+    file_reader.read.return_value = [
+        replace(deliver, parcel_id=f"P{number}").to_dict()
+        for number, deliver in enumerate((deliver_11, deliver_22, deliver_33), start=1)
+    ]
+    validator = MagicMock()
+    validator.validate.return_value = True
+    deliver_repo = DeliverDataRepository(file_reader, validator, DeliversConverter(), "delivers.json")
+    current = deliver_repo._current
+    calls: list[RepositorySnapshot] = []
+
+    def current_then_change() -> RepositorySnapshot:
+        snapshot = current()
+        calls.append(snapshot)
+        if len(calls) == 1:
+            deliver_repo.remove("P1")
+        return snapshot
+
+    with patch.object(deliver_repo, "_current", side_effect=current_then_change):
+        service = PurchaseSummaryService(
+            user_repo=mock_user_repo,
+            parcel_repo=mock_parcel_repo,
+            locker_repo=mock_locker_repo,
+            deliver_repo=deliver_repo,
+            lockers={}, parcels={}, delivers=[], users={}, locker_usage={}
+        )
+
+    def partitioned(service: PurchaseSummaryService) -> set[str]:
+        partitions = service.partitions
+        return {
+            deliver.parcel_id for locker_id in partitions.values_partitioned() for deliver in partitions.records_of(locker_id)
+        }
+
+    assert {deliver.parcel_id for deliver in service.delivers} == partitioned(service) == {"P1", "P2", "P3"}
+    pinned = service.pinned()
+    assert {deliver.parcel_id for deliver in pinned.delivers} == partitioned(pinned) == {"P2", "P3"}
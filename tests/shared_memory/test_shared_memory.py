@@ -0,0 +1,98 @@
+from typing import Iterator
+from unittest.mock import MagicMock
+from src.converter import DeliversConverter, LockerConverter
+from src.model import Delivers, DeliveryTable, Lockers
+from src.shared_memory import SharedRepositoryPublisher, SharedRepositoryReader
+import pytest
+import uuid
+
+
+def _repository(converter, records: list) -> MagicMock:
+    repository = MagicMock()
+    repository.converter = converter
+    repository.get_data.return_value = records
+    return repository
+
+
+@pytest.fixture
+def publisher() -> Iterator[SharedRepositoryPublisher]:
+    """
+    Provides a publisher under a unique name, unlinking its segments afterwards.
+    """
+    publisher = SharedRepositoryPublisher(f"lockers-test-{uuid.uuid4().hex[:12]}")
+    yield publisher
+    publisher.close()
+
+
+def test_reader_attaches_published_tables_without_copying(
+        publisher: SharedRepositoryPublisher,
+        locker_1: Lockers,
+        deliver_1: Delivers,
+        deliver_2: Delivers
+) -> None:
+    """
+    Tests that a reader sees the published repositories as read-only views of the shared segment.
+
+    Asserts:
+        - Numeric, date and string columns hold the published values.
+        - The columns are read-only memoryviews.
+        - A DeliveryTable can be built on top of the shared columns, and cannot be appended to.
+    """
+    publisher.publish_repositories({
+        "lockers": _repository(LockerConverter(), [locker_1]),
+        "delivers": _repository(DeliversConverter(), [deliver_1, deliver_2]),
+    })
+    reader = SharedRepositoryReader(publisher.name)
+
+    lockers = reader.table("lockers")
+    assert reader.version == 1
+    assert lockers.column("locker_id")[0] == "L002"
+    assert lockers.column("compartments_small")[0] == 25
+    latitude = lockers.numeric("latitude")
+    assert isinstance(latitude, memoryview)
+    assert latitude.readonly
+    table = DeliveryTable.from_columnar(reader.table("delivers"))
+    assert list(table.durations()) == [
+        (deliver.expected_delivery_date - deliver.sent_date).days for deliver in (deliver_1, deliver_2)
+    ]
+    with pytest.raises(TypeError):
+        latitude[0] = 0.0  # type: ignore[call-overload]
+    with pytest.raises(TypeError):
+        table.append(deliver_1)
+    reader.close()
+
+
+def test_reader_detects_and_follows_new_versions(
+        publisher: SharedRepositoryPublisher,
+        locker_1: Lockers,
+        locker_2: Lockers
+) -> None:
+    """
+    Tests that the version counter lets a reader detect and pick up a new publication.
+
+    Asserts:
+        - `changed` is false until a new version is published.
+        - `refresh` moves the reader to the new version and its data.
+        - A reader attached to an unlinked version keeps reading it until it refreshes.
+    """
+    publisher.publish_repositories({"lockers": _repository(LockerConverter(), [locker_1])})
+    reader = SharedRepositoryReader(publisher.name)
+    assert not reader.changed()
+    assert not reader.refresh()
+
+    publisher.publish_repositories({"lockers": _repository(LockerConverter(), [locker_1, locker_2])})
+
+    assert reader.changed()
+    assert len(reader.table("lockers")) == 1
+    assert reader.refresh()
+    assert reader.version == 2
+    assert list(reader.table("lockers").strings("locker_id").decode()) == [locker_1.locker_id, locker_2.locker_id]
+    reader.close()
+
+
+def test_reader_requires_a_publication(publisher: SharedRepositoryPublisher) -> None:
+    """
+    Tests that attaching before anything was published fails.
+    """
+    with pytest.raises(FileNotFoundError):
+        SharedRepositoryReader(publisher.name)
@@ -51,3 +51,20 @@ def test_read_report(mock_deliver_repo) -> None:
     mock_file.assert_called_once_with(
         r"C:\Users\User\Desktop\proj\projects_python\projectt\data\report.txt", "r"
     )
+
+
+def test_find_locker_sees_reloaded_data(mock_deliver_repo, deliver_11) -> None:
+    """
+    Test that `find_locker` looks deliveries up on every call, so data reloaded after the service
+    was created is visible.
+
+    Args:
+        mock_deliver_repo (MagicMock): A mocked repository that returns predefined delivery data.
+        deliver_11 (Delivers): The delivery of parcel 'P12345'.
+    """
+    service = SpeechRecognizerService(mock_deliver_repo)
+    assert service.find_locker("P12345") == "Your package P12345 is in locker 12345"
+
+    mock_deliver_repo.get_data.return_value = []
+
+    assert service.find_locker("P12345") == "Your package does not exist"